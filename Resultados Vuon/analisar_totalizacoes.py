@@ -6,26 +6,13 @@ Script temporário para analisar linhas de totalização na planilha
 
 import os
 import re
-import win32com.client
+import sys
 
-def extract_agent_info(cell_value):
-    """Extrai informações do agente de uma célula"""
-    if not cell_value:
-        return None, None
-    
-    cell_str = str(cell_value).strip()
-    pattern = r'Agente\s+(\d+)\s*[-–]\s*(.+)'
-    match = re.search(pattern, cell_str, re.IGNORECASE)
-    
-    if match:
-        agent_id = match.group(1).strip()
-        agent_name = match.group(2).strip()
-        return agent_id, agent_name
-    
-    return None, None
+from excel_readers import read_sheet_rows, resolve_backend
+from grelat06 import segment_agent_blocks
 
-# Caminho da planilha
-file_path = r'K:\RPA VUON\recebimento por cobrador\2025-12-02\grelat06 (2).xls'
+# Caminho da planilha (pode ser informado como argumento)
+file_path = sys.argv[1] if len(sys.argv) > 1 else r'K:\RPA VUON\recebimento por cobrador\2025-12-02\grelat06 (2).xls'
 
 if not os.path.exists(file_path):
     print(f"❌ Arquivo não encontrado: {file_path}")
@@ -33,18 +20,13 @@ if not os.path.exists(file_path):
 
 print("🔍 Analisando planilha para identificar linhas de totalização...\n")
 
-excel = win32com.client.Dispatch("Excel.Application")
-excel.Visible = False
-excel.DisplayAlerts = False
-
-workbook = None
 try:
-    workbook = excel.Workbooks.Open(os.path.abspath(file_path), ReadOnly=True)
-    worksheet = workbook.Worksheets(1)
-    used_range = worksheet.UsedRange
+    # Planilha inteira em memória (leitor definido em EXCEL_READER)
+    print(f"Leitor de Excel: {resolve_backend(file_path)}")
+    rows = read_sheet_rows(file_path)
     
-    row_count = used_range.Rows.Count
-    col_count = used_range.Columns.Count
+    row_count = len(rows)
+    col_count = len(rows[0]) if rows else 0
     
     print(f"Total de linhas: {row_count}")
     print(f"Total de colunas: {col_count}\n")
@@ -61,37 +43,8 @@ try:
     
     totalizacoes_encontradas = []
     
-    # Encontrar todos os agentes primeiro
-    agent_positions = []
-    for row in range(1, row_count + 1):
-        try:
-            first_cell = used_range.Cells(row, 1).Value
-            if first_cell:
-                cell_str = str(first_cell).strip()
-                pattern = r'Agente\s+(\d+)\s*[-–]\s*(.+)'
-                match = re.search(pattern, cell_str, re.IGNORECASE)
-                if match:
-                    agent_id = match.group(1).strip()
-                    agent_name = match.group(2).strip()
-                    
-                    # Encontrar próxima linha de agente
-                    next_agent_row = row_count + 1
-                    for next_row in range(row + 1, row_count + 1):
-                        next_cell = used_range.Cells(next_row, 1).Value
-                        if next_cell:
-                            next_id, next_name = extract_agent_info(next_cell)
-                            if next_id:
-                                next_agent_row = next_row
-                                break
-                    
-                    agent_positions.append({
-                        'row': row,
-                        'id': agent_id,
-                        'name': agent_name,
-                        'next_row': next_agent_row
-                    })
-        except:
-            continue
+    # Encontrar todos os agentes primeiro (uma única passada pela planilha)
+    agent_positions = segment_agent_blocks(rows)
     
     print(f"Agentes encontrados: {len(agent_positions)}\n")
     
@@ -100,14 +53,13 @@ try:
         agent_row = agent['row']
         agent_id = agent['id']
         agent_name = agent['name']
-        next_agent_row = agent['next_row']
         
         # Linha de cabeçalho (após o agente)
         header_row = agent_row + 1
         
         # Linhas de dados começam após o cabeçalho
-        data_start_row = agent_row + 2
-        data_end_row = next_agent_row - 1
+        data_start_row = agent['data_start']
+        data_end_row = agent['data_end']
         
         print(f"\n{'='*80}")
         print(f"Agente {agent_id} - {agent_name}")
@@ -120,7 +72,7 @@ try:
         for row in range(data_start_row, data_end_row + 1):
             try:
                 # Ler primeira coluna (Nome do Cliente)
-                nome_cell = used_range.Cells(row, 1).Value
+                nome_cell = rows[row - 1][0]
                 if nome_cell:
                     nome_str = str(nome_cell).strip()
                     
@@ -139,7 +91,7 @@ try:
                         row_data = []
                         for col in range(1, min(col_count + 1, 15)):  # Ler até coluna M
                             try:
-                                cell_value = used_range.Cells(row, col).Value
+                                cell_value = rows[row - 1][col - 1]
                                 row_data.append(str(cell_value) if cell_value else "")
                             except:
                                 row_data.append("")
@@ -184,20 +136,8 @@ try:
         if len(ocorrencias) > 3:
             print(f"    ... e mais {len(ocorrencias) - 3} ocorrência(s)")
     
-    workbook.Close(SaveChanges=False)
-    excel.Quit()
-    
 except Exception as e:
     print(f"❌ Erro: {e}")
     import traceback
     traceback.print_exc()
-    if workbook:
-        try:
-            workbook.Close(SaveChanges=False)
-        except:
-            pass
-    try:
-        excel.Quit()
-    except:
-        pass
 
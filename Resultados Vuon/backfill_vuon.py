@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backfill do VUON: importa um intervalo de pastas em paralelo (mês novo, recuperação após queda)
+- Leitura e conversão dos CSVs em um pool de processos (BACKFILL_WORKERS), fora do GIL
+- Gravação por BACKFILL_WRITERS conexões do pool compartilhado, uma pasta por vez em cada,
+  com o mesmo process_folder do importador (staging, diferença de linhas, upsert)
+- vuon_importacoes atualizada pasta a pasta (processando -> sucesso/erro), como no importador
+- Memória limitada a cerca de BACKFILL_WORKERS + 2 x BACKFILL_WRITERS pastas lidas: se os
+  gravadores ficam para trás, a leitura espera
+- bloco_summary, bloco_spins_diario e o DDA por agente (vuon_dda_agente_dia) são atualizados
+  uma vez, no final
+Pare o importador do VUON durante o backfill, para que as duas execuções não gravem a mesma pasta.
+Uso:
+    python backfill_vuon.py 2025-01-01 2025-01-31
+    python backfill_vuon.py 2025-01-01 2025-01-31 --workers 6 --writers 3 --force
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+
+from import_vuon_automated import IMPORTER as importer
+from db_pool import DB_POOL_MAX_SIZE, close_pool, get_pool
+from file_fingerprint import fingerprint_file
+from partitions import maintain_partitions
+from vuon_logging import get_logger
+
+log = get_logger('backfill')
+
+# Processos lendo/convertendo CSVs e conexões gravando no banco
+BACKFILL_WORKERS = int(os.getenv('BACKFILL_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+BACKFILL_WRITERS = int(os.getenv('BACKFILL_WRITERS', 2))
+
+# Pasta lida pelo pool de processos (error preenchido se a leitura falhou)
+ParsedFolder = namedtuple('ParsedFolder', 'folder_date csv_file fingerprint chunks parse_seconds error')
+
+
+def parse_folder(folder_date, csv_file):
+    """Lê, converte e prepara todos os blocos do CSV de uma pasta (executa em outro processo)"""
+    start = time.perf_counter()
+    fingerprint = fingerprint_file(csv_file)
+    chunks = list(importer.iter_chunks(csv_file, folder_date))
+    return ParsedFolder(folder_date, csv_file, fingerprint, chunks, time.perf_counter() - start, None)
+
+
+class BackfillStats:
+    """Totais do backfill, atualizados pelos gravadores"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.processed = 0
+        self.errors = 0
+        self.records = 0
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self.write_seconds = 0.0
+        self.days = set()
+
+    def folder_done(self, parsed, records, days, write_seconds):
+        with self._lock:
+            self.processed += 1
+            self.records += records
+            self.bytes += parsed.fingerprint.tamanho
+            self.parse_seconds += parsed.parse_seconds
+            self.write_seconds += write_seconds
+            self.days.update(days)
+
+    def folder_failed(self):
+        with self._lock:
+            self.errors += 1
+
+    def report(self, skipped, missing):
+        elapsed = time.perf_counter() - self.start
+        log.info(f"📊 Backfill: {self.processed} pastas importadas, {self.errors} erros, "
+                 f"{skipped} já importadas, {missing} sem CSV",
+                 processadas=self.processed, erros=self.errors, puladas=skipped, sem_arquivo=missing,
+                 registros=self.records, segundos=round(elapsed, 1))
+        log.info(f"   {self.records:,} registros, {self.bytes / 1024 / 1024:,.1f} MB em {elapsed:.1f}s")
+        if elapsed > 0:
+            log.info(f"   Vazão: {self.records / elapsed:,.0f} registros/s, "
+                     f"{self.bytes / 1024 / 1024 / elapsed:,.2f} MB/s")
+        log.info(f"   Tempo somado: leitura {self.parse_seconds:.1f}s (processos), "
+                 f"gravação {self.write_seconds:.1f}s (conexões)")
+
+
+def write_folder(connection, parsed, stats):
+    """Aplica uma pasta lida no banco, mantendo vuon_importacoes em dia"""
+    folder_date = parsed.folder_date
+    try:
+        importer.mark_as_processing(connection, folder_date, os.path.basename(parsed.csv_file))
+        if parsed.error is not None:
+            raise parsed.error
+
+        log.info(f"🔄 [{folder_date}] Gravando ({parsed.parse_seconds:.1f}s de leitura)", pasta=folder_date)
+        start = time.perf_counter()
+        records, days = importer.process_folder(connection, folder_date, parsed.chunks)
+        importer.mark_as_success(connection, folder_date, records, parsed.fingerprint)
+        write_seconds = time.perf_counter() - start
+
+        stats.folder_done(parsed, records, days, write_seconds)
+        log.info(f"✅ [{folder_date}] {records:,} registros em {write_seconds:.1f}s",
+                 pasta=folder_date, registros=records)
+    except Exception as e:
+        stats.folder_failed()
+        log.error(f"❌ [{folder_date}] Erro: {str(e)}", pasta=folder_date)
+        try:
+            importer.mark_as_error(connection, folder_date, str(e))
+        except Exception as mark_error:
+            log.warning(f"⚠️  [{folder_date}] Não foi possível registrar o erro: {mark_error}", pasta=folder_date)
+
+
+def writer_loop(work, stats):
+    """Gravador: uma conexão do pool por pasta, até receber None"""
+    pool = get_pool()
+    while True:
+        parsed = work.get()
+        if parsed is None:
+            return
+        try:
+            with pool.connection() as connection:
+                write_folder(connection, parsed, stats)
+        except Exception as e:
+            stats.folder_failed()
+            log.error(f"❌ [{parsed.folder_date}] Sem conexão com o banco: {str(e)}", pasta=parsed.folder_date)
+
+
+def select_folders(connection, inicio, fim, force):
+    """Pastas do intervalo a importar: [(pasta, csv)], já importadas e sem CSV"""
+    importer.load_processed_folders(connection)
+    pending = []
+    skipped = 0
+    missing = 0
+    for folder_date in importer.get_folders_to_process():
+        if not inicio <= date.fromisoformat(folder_date) <= fim:
+            continue
+        if folder_date in importer.processed and not force:
+            skipped += 1
+            continue
+        csv_file = importer.find_file(folder_date)
+        if not csv_file:
+            log.warning(f"⚠️  [{folder_date}] Arquivo CSV não encontrado - pulando", pasta=folder_date)
+            missing += 1
+            continue
+        pending.append((folder_date, csv_file))
+    return pending, skipped, missing
+
+
+def run_backfill(inicio, fim, workers, writers, force):
+    pool = get_pool()
+    with pool.connection() as connection:
+        importer.create_tables(connection)
+        maintain_partitions(connection, importer.spec.target_table)
+        pending, skipped, missing = select_folders(connection, inicio, fim, force)
+
+    log.info(f"📁 {len(pending)} pasta(s) a importar entre {inicio} e {fim} "
+             f"({workers} processo(s) de leitura, {writers} conexão(ões) de gravação)",
+             pastas=len(pending), processos=workers, conexoes=writers)
+    stats = BackfillStats()
+    if not pending:
+        stats.report(skipped, missing)
+        return
+
+    # Pastas lidas esperando um gravador; put() bloqueia quando os gravadores estão ocupados
+    work = queue.Queue(maxsize=writers)
+    threads = [threading.Thread(target=writer_loop, args=(work, stats), name=f'backfill-writer-{i + 1}')
+               for i in range(writers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            folders = iter(pending)
+            in_flight = {}
+
+            def submit_next():
+                item = next(folders, None)
+                if item is not None:
+                    in_flight[executor.submit(parse_folder, *item)] = item
+
+            for _ in range(workers):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_date, csv_file = in_flight.pop(future)
+                    try:
+                        parsed = future.result()
+                    except Exception as e:
+                        log.error(f"❌ [{folder_date}] Erro na leitura: {str(e)}", pasta=folder_date)
+                        parsed = ParsedFolder(folder_date, csv_file, None, None, 0.0, e)
+                    work.put(parsed)
+                    submit_next()
+    finally:
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+
+    if stats.days:
+        with pool.connection() as connection:
+            importer.refresh_derived(connection, stats.days)
+
+    stats.report(skipped, missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa em paralelo as pastas do VUON de um intervalo de datas')
+    parser.add_argument('inicio', type=date.fromisoformat, help='Primeira pasta (YYYY-MM-DD)')
+    parser.add_argument('fim', type=date.fromisoformat, help='Última pasta (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS,
+                        help='Processos lendo e convertendo CSVs')
+    parser.add_argument('--writers', type=int, default=BACKFILL_WRITERS,
+                        help='Conexões gravando no banco ao mesmo tempo')
+    parser.add_argument('--force', action='store_true',
+                        help='Reaplica também as pastas já importadas (só a diferença é gravada)')
+    args = parser.parse_args()
+
+    if args.fim < args.inicio:
+        parser.error('fim anterior ao início')
+    if args.workers < 1 or args.writers < 1:
+        parser.error('--workers e --writers precisam ser pelo menos 1')
+
+    writers = args.writers
+    if writers > DB_POOL_MAX_SIZE:
+        log.warning(f"⚠️  --writers {writers} maior que DB_POOL_MAX_SIZE ({DB_POOL_MAX_SIZE}) - usando {DB_POOL_MAX_SIZE}")
+        writers = DB_POOL_MAX_SIZE
+
+    try:
+        run_backfill(args.inicio, args.fim, args.workers, writers, args.force)
+    except KeyboardInterrupt:
+        log.warning("⚠️  Interrompido pelo usuário (Ctrl+C) - pastas em andamento ficam como 'processando'")
+    finally:
+        close_pool()
+
+
+if __name__ == '__main__':
+    main()
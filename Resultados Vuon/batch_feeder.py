@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alimentador de lotes para os insert_*_batch dos importadores do VUON
+Converte o DataFrame já tratado em colunas prontas para o banco (NaN/NaT/NA -> None) uma única vez
+e monta as tuplas de cada lote a partir de fatias dessas colunas, sem iterrows()
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def column_to_db_values(series):
+    """Converte uma coluna para array de objetos Python, com None no lugar de NaN/NaT/NA"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = np.asarray(series.dt.to_pydatetime(), dtype=object)
+    else:
+        values = series.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    return values
+
+
+class BatchFeeder:
+    """Gera lotes de tuplas (uma por linha) a partir de colunas já convertidas para o banco"""
+
+    def __init__(self, df, columns, batch_size):
+        start = time.perf_counter()
+        self.columns = [column_to_db_values(df[col]) for col in columns]
+        self.total = len(df)
+        self.batch_size = batch_size
+        self.build_seconds = time.perf_counter() - start
+        self.started_at = start
+        self.finished_at = None
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        """Percorre os lotes; cada fatia de coluna é uma view do array, só as tuplas são criadas"""
+        for i in range(0, self.total, self.batch_size):
+            start = time.perf_counter()
+            batch = list(zip(*(values[i:i + self.batch_size] for values in self.columns)))
+            self.build_seconds += time.perf_counter() - start
+            yield batch
+        self.finished_at = time.perf_counter()
+
+    def rows_per_second(self):
+        """Taxa de montagem de tuplas (registros/s)"""
+        if self.build_seconds <= 0:
+            return float(self.total)
+        return self.total / self.build_seconds
+
+    def report(self):
+        """Resumo de desempenho para o log do importador"""
+        message = (f"Tuplas montadas: {self.total:,} registros em {self.build_seconds:.2f}s "
+                   f"({self.rows_per_second():,.0f} registros/s)")
+        if self.finished_at is not None and self.total:
+            elapsed = self.finished_at - self.started_at
+            message += f" | inserção total: {elapsed:.2f}s ({self.total / elapsed:,.0f} registros/s)"
+        return message
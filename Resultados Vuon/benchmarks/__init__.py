@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos importadores do VUON
+Execute a partir da pasta 'Resultados Vuon', ex.: python -m benchmarks.insert_modes
+"""
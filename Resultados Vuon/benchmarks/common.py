@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Utilitários compartilhados pelos benchmarks: conexão com o MariaDB local e carga dos importadores
+
+MariaDB local de benchmark (container descartável):
+    docker run -d --name vuon-bench -p 3307:3306 \\
+        -e MARIADB_ROOT_PASSWORD=bench -e MARIADB_DATABASE=vuon_bench \\
+        mariadb:11 --local-infile=1
+"""
+
+import importlib
+import os
+import sys
+
+import pymysql
+
+BENCH_DB_HOST = os.getenv('BENCH_DB_HOST', '127.0.0.1')
+BENCH_DB_PORT = int(os.getenv('BENCH_DB_PORT', 3307))
+BENCH_DB_USER = os.getenv('BENCH_DB_USER', 'root')
+BENCH_DB_PASSWORD = os.getenv('BENCH_DB_PASSWORD', 'bench')
+BENCH_DB_NAME = os.getenv('BENCH_DB_NAME', 'vuon_bench')
+
+# Pasta 'Resultados Vuon', onde ficam os importadores
+IMPORTERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def connect_bench_db(local_infile=True):
+    """Conecta diretamente (sem túnel SSH) ao MariaDB local de benchmark"""
+    return pymysql.connect(
+        host=BENCH_DB_HOST,
+        port=BENCH_DB_PORT,
+        user=BENCH_DB_USER,
+        password=BENCH_DB_PASSWORD,
+        database=BENCH_DB_NAME,
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor,
+        local_infile=local_infile
+    )
+
+
+def load_importer(module_name):
+    """Importa um importador sem exigir o .env de produção
+
+    Os importadores validam as variáveis SSH/DB ao serem importados; aqui elas recebem valores
+    de benchmark, já que a conexão é aberta por connect_bench_db() e passada às funções.
+    """
+    for var in ('SSH_HOST', 'SSH_USER', 'SSH_PASSWORD'):
+        os.environ.setdefault(var, 'benchmark')
+    os.environ.setdefault('DB_NAME', BENCH_DB_NAME)
+    os.environ.setdefault('DB_USER', BENCH_DB_USER)
+    os.environ.setdefault('DB_PASSWORD', BENCH_DB_PASSWORD)
+    if IMPORTERS_DIR not in sys.path:
+        sys.path.insert(0, IMPORTERS_DIR)
+    return importlib.import_module(module_name)
+
+
+class FakeCursor:
+    """Cursor que aceita os comandos dos importadores e só conta as linhas recebidas"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, args=None):
+        self.connection.statements += 1
+        self.rowcount = 0
+        return 0
+
+    def executemany(self, sql, args):
+        rows = len(args)
+        self.connection.statements += 1
+        self.connection.rows += rows
+        self.rowcount = rows
+        return rows
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Conexão em memória para medir o lado Python da inserção (montagem das tuplas), sem banco"""
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
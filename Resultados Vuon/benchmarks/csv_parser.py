@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos motores de leitura do CSV VUON: parser C (com reparo posterior) x divisão manual
+
+Uso (a partir da pasta 'Resultados Vuon'):
+    python -m benchmarks.csv_parser --rows 1000000 --malformed 0.03
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import generators
+from benchmarks.common import IMPORTERS_DIR  # noqa: F401 (garante os importadores no sys.path)
+from vuon_csv_reader import iter_raw_chunks
+
+
+def read_all(path, engine, chunk_rows):
+    """Lê o arquivo inteiro pelo motor indicado e devolve (linhas, segundos, blocos)"""
+    start = time.perf_counter()
+    chunks = list(iter_raw_chunks(path, chunk_rows, engine))
+    return chunks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos motores de leitura do CSV VUON')
+    parser.add_argument('--rows', type=int, default=1000000, help='Linhas do arquivo gerado')
+    parser.add_argument('--malformed', type=float, default=0.03, help='Fração de linhas com ; extra')
+    parser.add_argument('--chunk-rows', type=int, default=0, help='Linhas por bloco (0 = arquivo inteiro)')
+    args = parser.parse_args()
+    chunk_rows = args.chunk_rows or None
+
+    with tempfile.TemporaryDirectory(prefix='vuon_bench_') as workdir:
+        path = generators.write_vuon_csv(os.path.join(workdir, 'vuon_20250501.csv'), args.rows,
+                                         malformed_ratio=args.malformed)
+        size_mb = os.path.getsize(path) / 1e6
+
+        python_chunks, python_seconds = read_all(path, 'python', chunk_rows)
+        c_chunks, c_seconds = read_all(path, 'c', chunk_rows)
+
+        python_rows = [row for df in python_chunks for row in df.values.tolist()]
+        c_rows = [row for df in c_chunks for row in df.values.tolist()]
+        if python_rows != c_rows:
+            raise Exception("Motor C produziu saída diferente do motor Python")
+
+    print(f"Arquivo: {args.rows:,} linhas ({size_mb:.1f} MB), {args.malformed:.1%} com ';' extra no Histórico")
+    print(f"{'Motor':<8} {'Tempo (s)':>10} {'Linhas/s':>12}")
+    for engine, seconds in (('python', python_seconds), ('c', c_seconds)):
+        print(f"{engine:<8} {seconds:>10.2f} {len(python_rows) / seconds:>12,.0f}")
+    print(f"Saídas idênticas; ganho: {python_seconds / c_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
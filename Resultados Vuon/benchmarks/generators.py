@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Geradores determinísticos de arquivos no formato das entradas do VUON
+Mesma semente -> mesmo arquivo, para comparar execuções de benchmark
+"""
+
+import random
+from datetime import datetime, timedelta
+
+VUON_HEADER = ('Nome;Cód;CPF / CNPJ;Agente;;Ação;Data;Hora;Histórico;Fone Discado;'
+               'Credor;Atraso;Valor;Inclusão;CDEC;Fase')
+
+BORDERO_HEADER = ('Credor;Filial;CPF / CNPJ;Nome;Tipo;Título;Parcela;Plano;Vencimento;Atraso;'
+                  'Data Pagamento;Valor Recebido;Encargos;Descontos;Comissão;Repasse;Agente;'
+                  'Matrícula;Vcto REAL;Atraso REAL')
+
+NOVACOES_HEADER = ('Credor;Filial;Tipo;Título / Contrato;Valor Total;Plano;Vencimento Entrada;'
+                   'Valor Entrada;Data de Emissão;Fase;CPF / CNPJ;Nome;Agente;Atraso Real')
+
+GRELAT06_HEADER = ['Nome', 'CPF / CNPJ', 'Credor', 'Tipo', 'Título / Contrato', 'Parc', 'Data Vcto',
+                   'Data Pgto', 'Vcto REAL', 'Valor Recebido', 'Dias', 'Atraso REAL']
+
+ACOES = ['DDA', 'CSA', 'EIO', 'ACD', 'SCP', 'APH', 'DEF', 'SRP', 'APC', 'JUR', 'NAT', '']
+
+
+def _brl(rng, prefix=''):
+    """Valor monetário no formato brasileiro ('1.411,75')"""
+    inteiro = rng.randint(0, 99999)
+    texto = f'{inteiro:,}'.replace(',', '.')
+    return f'{prefix}{texto},{rng.randint(0, 99):02d}'
+
+
+def _cpf(rng):
+    return str(rng.randint(10 ** 10, 10 ** 11 - 1))
+
+
+def write_vuon_csv(path, rows, malformed_ratio=0.03, seed=42, day=1):
+    """Gera um vuon_YYYYMMDD.csv com linhas de 16 campos e uma fração com ';' extra no Histórico"""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(VUON_HEADER + '\n')
+        for i in range(rows):
+            if rng.random() < malformed_ratio:
+                historico = 'Cliente informou; promessa de pagamento'
+            else:
+                historico = 'Cliente informou promessa de pagamento'
+            fields = [
+                f'CLIENTE {i}', str(100000 + i), _cpf(rng), str(rng.randint(0, 300)), '',
+                rng.choice(ACOES), f'{day:02d}/05/2025',
+                f'{rng.randint(8, 20):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}',
+                historico, f'119{rng.randint(10 ** 7, 10 ** 8 - 1)}', 'VUONC',
+                str(rng.randint(0, 2000)), _brl(rng) if rng.random() < 0.2 else '',
+                '01/01/2025', 'CDEC', 'F1',
+            ]
+            f.write(';'.join(fields) + '\n')
+    return path
+
+
+def write_bordero_csv(path, rows, seed=42):
+    """Gera um CSV de bordero de pagamento com valores 'R$' e '-' como vazio"""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(BORDERO_HEADER + '\n')
+        for i in range(rows):
+            fields = [
+                'VUONC', '1', _cpf(rng), f'CLIENTE {i}', 'NOV', str(rng.randint(10 ** 15, 10 ** 19)),
+                str(rng.randint(1, 12)), str(rng.randint(1, 24)), '05/05/2025', str(rng.randint(-10, 400)),
+                '06/05/2025', _brl(rng, 'R$'), 'R$0,00', '-', _brl(rng, 'R$'), _brl(rng, 'R$'),
+                str(rng.randint(1, 300)), rng.choice([str(rng.randint(1, 9999)), '-']), '05/05/2025',
+                str(rng.randint(0, 400)),
+            ]
+            f.write(';'.join(fields) + '\n')
+    return path
+
+
+def write_novacoes_csv(path, rows, seed=42):
+    """Gera um CSV de novações com emissão no formato 'dd/mm/yyyy HH:MM:SS'"""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(NOVACOES_HEADER + '\n')
+        for i in range(rows):
+            fields = [
+                'VUONC', '1', 'NOV', str(rng.randint(10 ** 15, 10 ** 19)), _brl(rng, 'R$ '),
+                str(rng.randint(1, 24)), '10/06/2025', _brl(rng, 'R$ '),
+                f'02/06/2025 {rng.randint(8, 20):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}',
+                'F2', _cpf(rng), f'CLIENTE {i}', f'{rng.randint(1, 300)} - AGENTE', str(rng.randint(0, 900)),
+            ]
+            f.write(';'.join(fields) + '\n')
+    return path
+
+
+def grelat06_rows(rows, seed=42, rows_per_agent=40):
+    """Monta a matriz de valores de um grelat06 (como o UsedRange.Value, ver excel_readers.py)
+
+    Blocos "Agente N - Nome" + cabeçalho + linhas de dados, fechados por '- Soma' e
+    '- Contagem', e 'Total Geral' no fim; rows conta só as linhas de dados.
+    Números vêm como float e datas como datetime, como o Excel devolve.
+    """
+    rng = random.Random(seed)
+    blank = [None] * (len(GRELAT06_HEADER) - 1)
+    matrix = []
+    agent = 0
+    written = 0
+    while written < rows:
+        agent += 1
+        block_rows = min(rows - written, rng.randint(rows_per_agent // 2, rows_per_agent * 3 // 2))
+        matrix.append([f'Agente {agent} - AGENTE {agent}'] + blank)
+        matrix.append(list(GRELAT06_HEADER))
+        soma = 0.0
+        for _ in range(block_rows):
+            vencimento = datetime(2025, 5, 5) - timedelta(days=rng.randint(0, 400))
+            pagamento = datetime(2025, 5, 6)
+            valor = rng.randint(0, 999999) / 100
+            soma += valor
+            matrix.append([
+                f'CLIENTE {written}', _cpf(rng), 'VUONC', 'NOV', str(rng.randint(10 ** 15, 10 ** 19)),
+                float(rng.randint(1, 24)), vencimento, pagamento, vencimento.strftime('%d/%m/%Y'),
+                valor, float((pagamento - vencimento).days), float(rng.randint(0, 400)),
+            ])
+            written += 1
+        matrix.append(['- Soma'] + [None] * 8 + [round(soma, 2), None, None])
+        matrix.append(['- Contagem'] + [None] * 8 + [float(block_rows), None, None])
+    matrix.append(['Total Geral - Soma'] + blank)
+    return matrix
+
+
+def write_grelat06_xlsx(path, rows, seed=42):
+    """Gera um grelat06 .xlsx (o .xls do RPA não comporta mais de 65.536 linhas)"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('grelat06')
+    for row in grelat06_rows(rows, seed):
+        sheet.append(row)
+    workbook.save(path)
+    return path
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Vazão dos importadores do VUON: leitura, conversão e inserção de arquivos sintéticos
+
+Para cada fonte e tamanho, gera o arquivo (benchmarks/generators.py, fora da medição) e mede:
+- leitura: texto/planilha -> DataFrame ou matriz de valores, como veio do arquivo
+- conversão: renomeação e conversão das colunas (no VUON, também data_pasta e linha_hash)
+- inserção: insert_batch do importador (importer_engine.py), no MariaDB local (--target mariadb,
+  ver benchmarks/common.py) ou em uma conexão falsa em memória (--target fake), que mede só o
+  lado Python (montagem das tuplas)
+O resultado vai para um JSON (--output), para acompanhar a evolução entre versões.
+
+Uso (a partir da pasta 'Resultados Vuon'):
+    python -m benchmarks.import_throughput --target fake
+    python -m benchmarks.import_throughput --target mariadb --sizes 10000,100000 --sources vuon,bordero
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks import generators
+from benchmarks.common import FakeConnection, connect_bench_db, load_importer
+from bulk_load import MODE_EXECUTEMANY
+
+SIZES = [10000, 100000, 1000000]
+TARGETS = ['fake', 'mariadb']
+
+# Relatórios gravados por padrão em benchmarks/resultados/
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+
+
+# Pasta dos arquivos gerados (data_pasta nas fontes com diferença de linhas)
+FOLDER_DATE = '2025-05-01'
+
+
+def _read_file(importer, path):
+    return importer.SPEC.reader(path, 0)
+
+
+def _convert(importer, df):
+    return importer.IMPORTER.prepare(df, FOLDER_DATE)
+
+
+# fonte -> (módulo do importador, gerador, arquivo, leitura, conversão, tabela)
+SOURCES = {
+    'vuon': ('import_vuon_automated', generators.write_vuon_csv, 'vuon_20250501.csv',
+             _read_file, _convert, 'vuon_resultados'),
+    'bordero': ('import_bordero_automated', generators.write_bordero_csv, 'bordero.csv',
+                _read_file, _convert, 'vuon_bordero_pagamento'),
+    'novacoes': ('import_novacoes_automated', generators.write_novacoes_csv, 'novacoes.csv',
+                 _read_file, _convert, 'vuon_novacoes'),
+    'recebimentos': ('import_recebimentos_por_cobrador_automated', generators.write_grelat06_xlsx,
+                     'grelat06.xlsx',
+                     lambda importer, path: importer.read_sheet_rows(path, 'openpyxl'),
+                     lambda importer, rows: _convert(importer, importer.extract_data_from_rows(rows)),
+                     'recebimentos_por_cobrador'),
+}
+
+
+def count_rows(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS total FROM {table}")
+        return cursor.fetchone()['total']
+
+
+def timed(function, *args):
+    """Executa function(*args) e devolve (resultado, segundos)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def open_target(target, importer, table):
+    """Conexão do alvo, com a tabela criada e vazia no MariaDB"""
+    if target == 'fake':
+        # LOAD DATA precisa de um servidor; na conexão falsa só o executemany faz sentido
+        load_importer('importer_engine').INSERT_MODE = MODE_EXECUTEMANY
+        return FakeConnection()
+
+    connection = connect_bench_db()
+    importer.IMPORTER.create_tables(connection)
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+    connection.commit()
+    return connection
+
+
+def run_scenario(name, rows, target, workdir):
+    """Gera o arquivo de uma fonte e mede leitura, conversão e inserção"""
+    module_name, generator, filename, read, convert, table = SOURCES[name]
+    importer = load_importer(module_name)
+
+    path = generator(os.path.join(workdir, f'{rows}_{filename}'), rows)
+    size = os.path.getsize(path)
+
+    raw, parse_seconds = timed(read, importer, path)
+    df, convert_seconds = timed(convert, importer, raw)
+    del raw
+    if len(df) != rows:
+        raise Exception(f"{name}: {len(df)} registros convertidos, esperado {rows}")
+
+    connection = open_target(target, importer, table)
+    try:
+        (inserted, errors), insert_seconds = timed(importer.IMPORTER.insert_batch, connection, df)
+        if target == 'mariadb':
+            stored = count_rows(connection, table)
+            if stored != inserted:
+                raise Exception(f"{name}: {stored} registros na tabela, esperado {inserted}")
+    finally:
+        connection.close()
+    os.remove(path)
+
+    total_seconds = parse_seconds + convert_seconds + insert_seconds
+    return {
+        'fonte': name,
+        'linhas': rows,
+        'bytes': size,
+        'alvo': target,
+        'modo_insercao': load_importer('importer_engine').INSERT_MODE,
+        'inseridos': inserted,
+        'erros': errors,
+        'leitura_s': round(parse_seconds, 4),
+        'conversao_s': round(convert_seconds, 4),
+        'insercao_s': round(insert_seconds, 4),
+        'total_s': round(total_seconds, 4),
+        'linhas_por_s': round(rows / total_seconds) if total_seconds > 0 else None,
+        'mb_por_s': round(size / 1024 / 1024 / total_seconds, 2) if total_seconds > 0 else None,
+    }
+
+
+def environment():
+    """Dados da máquina, para comparar relatórios de execuções diferentes"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vazão dos importadores (leitura, conversão e inserção)')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SIZES),
+                        help='Registros por arquivo, separados por vírgula')
+    parser.add_argument('--sources', default=','.join(SOURCES), help='Fontes separadas por vírgula')
+    parser.add_argument('--target', choices=TARGETS, default='fake',
+                        help='fake (conexão em memória) ou mariadb (MariaDB local de benchmark)')
+    parser.add_argument('--output', help='Arquivo JSON do relatório (padrão: benchmarks/resultados/)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    sources = [name.strip() for name in args.sources.split(',')]
+    unknown = [name for name in sources if name not in SOURCES]
+    if unknown:
+        parser.error(f"fonte(s) desconhecida(s): {', '.join(unknown)} (use {', '.join(SOURCES)})")
+
+    started_at = datetime.now()
+    results = []
+    with tempfile.TemporaryDirectory(prefix='vuon_bench_') as workdir:
+        for rows in sizes:
+            for name in sources:
+                print(f"🔄 {name}: {rows:,} registros ({args.target})")
+                results.append(run_scenario(name, rows, args.target, workdir))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"import_throughput_{started_at.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        'executado_em': started_at.isoformat(timespec='seconds'),
+        'alvo': args.target,
+        'ambiente': environment(),
+        'resultados': results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'Fonte':<13} {'Registros':>10} {'Leitura':>9} {'Conversão':>10} {'Inserção':>9} {'Registros/s':>12}")
+    for result in results:
+        print(f"{result['fonte']:<13} {result['linhas']:>10,} {result['leitura_s']:>8.2f}s "
+              f"{result['conversao_s']:>9.2f}s {result['insercao_s']:>8.2f}s {result['linhas_por_s'] or 0:>12,}")
+    print(f"\n📄 Relatório: {output}")
+
+
+if __name__ == '__main__':
+    main()
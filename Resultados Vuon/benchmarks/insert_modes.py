@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark executemany x LOAD DATA LOCAL INFILE contra um MariaDB local
+
+Uso (a partir da pasta 'Resultados Vuon', com o container descrito em benchmarks/common.py):
+    python -m benchmarks.insert_modes --rows 200000
+    python -m benchmarks.insert_modes --rows 50000 --sources vuon,bordero
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import generators
+from benchmarks.common import connect_bench_db, load_importer
+
+# fonte -> (módulo do importador, gerador, tabela)
+SOURCES = {
+    'vuon': ('import_vuon_automated', generators.write_vuon_csv, 'vuon_resultados'),
+    'bordero': ('import_bordero_automated', generators.write_bordero_csv, 'vuon_bordero_pagamento'),
+    'novacoes': ('import_novacoes_automated', generators.write_novacoes_csv, 'vuon_novacoes'),
+}
+
+MODES = ['executemany', 'load_data']
+
+
+def count_rows(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS total FROM {table}")
+        return cursor.fetchone()['total']
+
+
+def run_source(name, rows, workdir):
+    """Gera o arquivo da fonte, lê uma vez e mede a inserção em cada modo"""
+    module_name, generator, table = SOURCES[name]
+    importer = load_importer(module_name).IMPORTER
+    engine = load_importer('importer_engine')
+
+    csv_path = generator(os.path.join(workdir, f'{name}.csv'), rows)
+    df = importer.read_file(csv_path, '2025-05-01')
+
+    results = []
+    connection = connect_bench_db()
+    try:
+        importer.create_tables(connection)
+        for mode in MODES:
+            with connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE TABLE {table}")
+            connection.commit()
+
+            engine.INSERT_MODE = mode
+            start = time.perf_counter()
+            inserted, _ = importer.insert_batch(connection, df)
+            elapsed = time.perf_counter() - start
+
+            stored = count_rows(connection, table)
+            if stored != len(df):
+                raise Exception(f"{name}/{mode}: {stored} registros na tabela, esperado {len(df)}")
+            results.append((name, mode, inserted, elapsed))
+    finally:
+        connection.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark executemany x LOAD DATA LOCAL INFILE')
+    parser.add_argument('--rows', type=int, default=100000, help='Registros por arquivo gerado')
+    parser.add_argument('--sources', default=','.join(SOURCES), help='Fontes separadas por vírgula')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='vuon_bench_') as workdir:
+        for name in args.sources.split(','):
+            results.extend(run_source(name.strip(), args.rows, workdir))
+
+    print(f"\n{'Fonte':<10} {'Modo':<12} {'Registros':>10} {'Tempo (s)':>10} {'Registros/s':>12}")
+    for name, mode, inserted, elapsed in results:
+        print(f"{name:<10} {mode:<12} {inserted:>10,} {elapsed:>10.2f} {inserted / elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
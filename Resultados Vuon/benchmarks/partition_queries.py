@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de consultas por faixa de meses: tabela particionada x sem partições
+
+Compara as consultas típicas dos dashboards (filtro por faixa de data e de atraso) na tabela
+particionada e na mesma tabela sem partições, medindo o tempo (mediana de --repeat execuções)
+e listando as partições lidas (EXPLAIN PARTITIONS).
+
+Uso (a partir da pasta 'Resultados Vuon', com o container descrito em benchmarks/common.py):
+    # gera as duas versões de cada tabela com dados sintéticos espalhados por 24 meses
+    python -m benchmarks.partition_queries --generate 1000000
+    # depois de migrate_partitions.py, compara a tabela migrada com a <tabela>_sem_particao
+    python -m benchmarks.partition_queries --table vuon_resultados
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+from benchmarks.common import connect_bench_db, load_importer
+from partitions import add_months
+
+# Tabela -> (importador que a cria, consultas típicas com {table}, {inicio} e {fim})
+QUERIES = {
+    'vuon_resultados': ('import_vuon_automated', [
+        ('acionamentos por bloco', """
+            SELECT COUNT(*) AS total, COUNT(DISTINCT cpf_cnpj) AS clientes
+            FROM {table}
+            WHERE data BETWEEN '{inicio}' AND '{fim}' AND atraso BETWEEN 61 AND 90"""),
+        ('DDA por agente/dia', """
+            SELECT data, agente, COUNT(DISTINCT cpf_cnpj) AS total
+            FROM {table}
+            WHERE data BETWEEN '{inicio}' AND '{fim}' AND acao = 'DDA'
+            GROUP BY data, agente"""),
+        ('spins por dia', """
+            SELECT data, COUNT(*) AS total
+            FROM {table}
+            WHERE data BETWEEN '{inicio}' AND '{fim}' AND atraso BETWEEN 91 AND 180
+            GROUP BY data"""),
+    ]),
+    'vuon_bordero_pagamento': ('import_bordero_automated', [
+        ('recebido no período', """
+            SELECT COUNT(*) AS total, SUM(valor_recebido) AS valor
+            FROM {table}
+            WHERE data_pagamento BETWEEN '{inicio}' AND '{fim}'"""),
+        ('recebido por agente', """
+            SELECT agente, SUM(valor_recebido) AS valor
+            FROM {table}
+            WHERE data_pagamento BETWEEN '{inicio}' AND '{fim}' AND atraso_real BETWEEN 61 AND 360
+            GROUP BY agente"""),
+    ]),
+    'vuon_novacoes': ('import_novacoes_automated', [
+        ('acordos no período', """
+            SELECT COUNT(*) AS total, SUM(valor_total) AS valor
+            FROM {table}
+            WHERE data_emissao BETWEEN '{inicio} 00:00:00' AND '{fim} 23:59:59'"""),
+    ]),
+}
+
+# Expressões para gerar as linhas sintéticas a partir de seq (0..N-1), espalhadas por 24 meses
+GENERATED_COLUMNS = {
+    'vuon_resultados': """
+        (nome, codigo, cpf_cnpj, agente, acao, data, hora, atraso, valor)
+        SELECT CONCAT('Cliente ', seq % 50000), seq % 80000, LPAD(seq % 50000, 11, '0'), seq % 120,
+               ELT(1 + seq % 4, 'DDA', 'ACD', 'ALO', 'NAT'),
+               '{inicio}' + INTERVAL (seq % {dias}) DAY, SEC_TO_TIME(seq % 86400),
+               61 + seq % 600, (seq % 100000) / 100""",
+    'vuon_bordero_pagamento': """
+        (credor, cpf_cnpj, titulo, parcela, data_pagamento, valor_recebido, agente, atraso_real)
+        SELECT 'VUONC', LPAD(seq % 50000, 11, '0'), seq, 1 + seq % 12,
+               '{inicio}' + INTERVAL (seq % {dias}) DAY, (seq % 100000) / 100, seq % 120, seq % 720""",
+    'vuon_novacoes': """
+        (credor, cpf_cnpj, titulo_contrato, plano, valor_total, data_emissao)
+        SELECT 'VUONC', LPAD(seq % 50000, 11, '0'), seq, 1 + seq % 24, (seq % 100000) / 100,
+               '{inicio}' + INTERVAL (seq % {dias}) DAY + INTERVAL (seq % 86400) SECOND""",
+}
+
+GENERATED_MONTHS = 24
+
+
+def month_bounds(months):
+    """Início e fim da faixa com os últimos `months` meses completos"""
+    today = date.today()
+    first = add_months(today.year, today.month, -months)
+    last = add_months(today.year, today.month, -1)
+    end = add_months(last[0], last[1], 1)
+    end_day = date(end[0], end[1], 1).toordinal() - 1
+    return date(first[0], first[1], 1).isoformat(), date.fromordinal(end_day).isoformat()
+
+
+def generate(connection, table, rows):
+    """Cria <tabela> (particionada, pelo importador) e <tabela>_sem_particao com as mesmas linhas"""
+    module_name, _ = QUERIES[table]
+    importer = load_importer(module_name)
+    baseline = f'{table}_sem_particao'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"DROP TABLE IF EXISTS {baseline}")
+    importer.IMPORTER.create_tables(connection)
+
+    inicio, _ = month_bounds(GENERATED_MONTHS)
+    fim = date.today().replace(day=1).toordinal() - 1
+    dias = fim - date.fromisoformat(inicio).toordinal() + 1
+    insert_sql = f"INSERT INTO {table} " + GENERATED_COLUMNS[table].format(inicio=inicio, dias=dias) + \
+        f" FROM seq_0_to_{rows - 1}"
+
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute(insert_sql)
+        connection.commit()
+        cursor.execute(f"CREATE TABLE {baseline} LIKE {table}")
+        cursor.execute(f"ALTER TABLE {baseline} REMOVE PARTITIONING")
+        cursor.execute(f"INSERT INTO {baseline} SELECT * FROM {table}")
+        connection.commit()
+        cursor.execute(f"ANALYZE TABLE {table}, {baseline}")
+        cursor.fetchall()
+    print(f"📦 {table}: {rows:,} registros gerados nas duas versões ({time.perf_counter() - start:.1f}s)")
+
+
+def partitions_read(connection, sql):
+    """Partições lidas pela consulta, segundo o EXPLAIN PARTITIONS"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN PARTITIONS {sql}")
+        plan = cursor.fetchall()
+    names = set()
+    for row in plan:
+        if row.get('partitions'):
+            names.update(row['partitions'].split(','))
+    return len(names)
+
+
+def time_query(connection, sql, repeat):
+    timings = []
+    with connection.cursor() as cursor:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql)
+            cursor.fetchall()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_table(connection, table, months_list, repeat):
+    baseline = f'{table}_sem_particao'
+    _, queries = QUERIES[table]
+    results = []
+    for months in months_list:
+        inicio, fim = month_bounds(months)
+        for name, template in queries:
+            part_sql = template.format(table=table, inicio=inicio, fim=fim)
+            base_sql = template.format(table=baseline, inicio=inicio, fim=fim)
+            results.append((
+                table, name, months,
+                time_query(connection, base_sql, repeat),
+                time_query(connection, part_sql, repeat),
+                partitions_read(connection, part_sql),
+            ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de consultas por mês: particionada x sem partições')
+    parser.add_argument('--table', action='append', choices=list(QUERIES),
+                        help='Tabela a comparar (pode repetir; padrão: todas)')
+    parser.add_argument('--generate', type=int, default=0,
+                        help='Gera N registros sintéticos nas duas versões antes de medir (banco de benchmark)')
+    parser.add_argument('--months', default='1,3', help='Tamanhos de faixa em meses, separados por vírgula')
+    parser.add_argument('--repeat', type=int, default=5, help='Execuções por consulta (vale a mediana)')
+    args = parser.parse_args()
+
+    tables = args.table or list(QUERIES)
+    months_list = [int(value) for value in args.months.split(',')]
+
+    results = []
+    connection = connect_bench_db()
+    try:
+        for table in tables:
+            if args.generate:
+                generate(connection, table, args.generate)
+            results.extend(run_table(connection, table, months_list, args.repeat))
+    finally:
+        connection.close()
+
+    print(f"\n{'Tabela':<24} {'Consulta':<24} {'Meses':>5} {'Sem part. (s)':>14} {'Particion. (s)':>14} "
+          f"{'Ganho':>7} {'Partições':>9}")
+    for table, name, months, base, part, read in results:
+        gain = base / part if part > 0 else float('inf')
+        print(f"{table:<24} {name:<24} {months:>5} {base:>14.4f} {part:>14.4f} {gain:>6.1f}x {read:>9}")
+
+
+if __name__ == '__main__':
+    main()
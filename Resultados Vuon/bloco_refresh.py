@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Atualização incremental de bloco_summary e bloco_spins_diario logo após uma importação
+Mesmos cálculos de backend/utils/updateBlocoSummary.js e updateBlocoSpinsDaily.js, mas só
+para os (bloco, ano, mês) e dias que a importação tocou, em vez de recalcular os meses
+corrente e anterior inteiros a cada hora. Blocos por faixa de atraso:
+1 = 61-90, 2 = 91-180, 3 = 181-360, wo = 361-9999
+"""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from vuon_logging import get_logger
+
+log = get_logger('blocos')
+
+# Bloco -> (atraso mínimo, atraso máximo)
+BLOCOS = {
+    '1': (61, 90),
+    '2': (91, 180),
+    '3': (181, 360),
+    'wo': (361, 9999),
+}
+
+CREATE_BLOCO_SUMMARY_SQL = """
+CREATE TABLE IF NOT EXISTS bloco_summary (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    bloco VARCHAR(10) NOT NULL,
+    ano INT NOT NULL,
+    mes INT NOT NULL,
+    date_formatted VARCHAR(10) NOT NULL,
+    carteira INT NOT NULL DEFAULT 0,
+    acionados INT NOT NULL DEFAULT 0,
+    alo INT NOT NULL DEFAULT 0,
+    cpc INT NOT NULL DEFAULT 0,
+    cpca INT NOT NULL DEFAULT 0,
+    acordos_resultados INT NOT NULL DEFAULT 0,
+    pgto_resultados INT NOT NULL DEFAULT 0,
+    spins INT NOT NULL DEFAULT 0,
+    recebimento DECIMAL(15,2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_bloco_month (bloco, ano, mes),
+    INDEX idx_bloco_date (bloco, ano, mes),
+    INDEX idx_date_formatted (date_formatted)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+CREATE_BLOCO_SPINS_DIARIO_SQL = """
+CREATE TABLE IF NOT EXISTS bloco_spins_diario (
+    bloco VARCHAR(10) NOT NULL,
+    data DATE NOT NULL,
+    spins INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (bloco, data),
+    INDEX idx_data (data)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Dias importados depois de "ontem": bloco_spins_diario só os recebe quando viram passado
+# (na próxima importação ou varredura completa - refresh_pending_spins)
+CREATE_BLOCO_SPINS_PENDENTES_SQL = """
+CREATE TABLE IF NOT EXISTS bloco_spins_pendentes (
+    data DATE NOT NULL PRIMARY KEY,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Mesma agregação do updateBlocoSummary.js; o mês é filtrado por faixa de data (poda de partições)
+INSERT_BLOCO_SUMMARY_SQL = """
+INSERT INTO bloco_summary (
+    bloco, ano, mes, date_formatted,
+    carteira, acionados, alo, cpc, cpca,
+    acordos_resultados, pgto_resultados, spins, recebimento
+)
+SELECT
+    %(bloco)s as bloco,
+    %(ano)s as ano,
+    %(mes)s as mes,
+    %(date_formatted)s as date_formatted,
+    COUNT(DISTINCT CASE WHEN cpf_cnpj IS NOT NULL AND cpf_cnpj != '' THEN cpf_cnpj END) as carteira,
+    COUNT(DISTINCT CASE WHEN acao IS NOT NULL AND acao != '' AND cpf_cnpj IS NOT NULL AND cpf_cnpj != '' THEN cpf_cnpj END) as acionados,
+    COUNT(CASE WHEN agente != '0' AND agente IS NOT NULL AND agente != '' AND cpf_cnpj IS NOT NULL AND cpf_cnpj != '' THEN 1 END) as alo,
+    COALESCE(SUM(CASE
+        WHEN agente != '0' AND agente IS NOT NULL AND agente != ''
+        AND acao IN ('EIO', 'CSA', 'ACD', 'SCP', 'APH', 'DEF', 'SRP', 'APC', 'JUR', 'DDA')
+        THEN 1 ELSE 0 END
+    ), 0) as cpc,
+    COALESCE(SUM(CASE
+        WHEN agente != '0' AND agente IS NOT NULL AND agente != ''
+        AND acao IN ('CSA', 'ACD', 'SCP', 'APH', 'DEF', 'SRP', 'JUR', 'DDA')
+        THEN 1 ELSE 0 END
+    ), 0) as cpca,
+    COALESCE(SUM(CASE
+        WHEN agente != '0' AND agente IS NOT NULL AND agente != ''
+        AND acao = 'DDA'
+        THEN 1 ELSE 0 END
+    ), 0) as acordos_resultados,
+    COALESCE(SUM(CASE
+        WHEN agente != '0' AND agente IS NOT NULL AND agente != ''
+        AND valor > 0
+        THEN 1 ELSE 0 END
+    ), 0) as pgto_resultados,
+    COUNT(1) as spins,
+    COALESCE(SUM(CASE WHEN valor > 0 THEN valor ELSE 0 END), 0) as recebimento
+FROM vuon_resultados
+WHERE atraso >= %(atraso_min)s AND atraso <= %(atraso_max)s
+    AND data >= %(inicio)s AND data < %(fim)s
+"""
+
+# Mesma contagem do updateBlocoSpinsDaily.js, só para os dias informados
+INSERT_BLOCO_SPINS_SQL = """
+INSERT INTO bloco_spins_diario (bloco, data, spins)
+SELECT
+    %s as bloco,
+    data,
+    COUNT(1) as spins
+FROM vuon_resultados
+WHERE data IN ({days})
+    AND atraso >= %s AND atraso <= %s
+GROUP BY data
+ON DUPLICATE KEY UPDATE spins = VALUES(spins)
+"""
+
+
+def normalize_days(values):
+    """Converte datas/Timestamps/strings em um conjunto de date (ignora vazios e inválidos)"""
+    days = pd.to_datetime(pd.Series(list(values), dtype=object), errors='coerce').dropna()
+    return set(days.dt.date)
+
+
+def month_bounds(ano, mes):
+    """Primeiro dia do mês e primeiro dia do mês seguinte"""
+    inicio = date(ano, mes, 1)
+    fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return inicio, fim
+
+
+def refresh_bloco_summary(connection, months):
+    """Recalcula bloco_summary para cada (ano, mês) informado, nos quatro blocos, em uma transação"""
+    with connection.cursor() as cursor:
+        for ano, mes in sorted(months):
+            inicio, fim = month_bounds(ano, mes)
+            for bloco, (atraso_min, atraso_max) in BLOCOS.items():
+                cursor.execute(
+                    "DELETE FROM bloco_summary WHERE bloco = %s AND ano = %s AND mes = %s",
+                    (bloco, ano, mes)
+                )
+                cursor.execute(INSERT_BLOCO_SUMMARY_SQL, {
+                    'bloco': bloco,
+                    'ano': ano,
+                    'mes': mes,
+                    'date_formatted': f'{mes:02d}/{ano}',
+                    'atraso_min': atraso_min,
+                    'atraso_max': atraso_max,
+                    'inicio': inicio,
+                    'fim': fim,
+                })
+    connection.commit()
+
+
+def refresh_bloco_spins(connection, days):
+    """Recalcula bloco_spins_diario para os dias informados (como o job do backend, só até ontem)
+
+    Dias de hoje em diante ficam em bloco_spins_pendentes e entram no primeiro recálculo depois
+    que viram passado, junto com os dias informados.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    days = set(days)
+    future = sorted(day for day in days if day > yesterday)
+    with connection.cursor() as cursor:
+        if future:
+            cursor.executemany(
+                "INSERT IGNORE INTO bloco_spins_pendentes (data) VALUES (%s)",
+                [(day,) for day in future]
+            )
+        cursor.execute("SELECT data FROM bloco_spins_pendentes WHERE data <= %s", (yesterday,))
+        pending = {row['data'] for row in cursor.fetchall()}
+
+    days = sorted({day for day in days if day <= yesterday} | pending)
+    if not days:
+        connection.commit()
+        return 0
+
+    placeholders = ', '.join(['%s'] * len(days))
+    with connection.cursor() as cursor:
+        for bloco, (atraso_min, atraso_max) in BLOCOS.items():
+            # Dias que ficaram sem acionamentos no bloco também precisam sair da tabela
+            cursor.execute(
+                f"DELETE FROM bloco_spins_diario WHERE bloco = %s AND data IN ({placeholders})",
+                [bloco] + days
+            )
+            cursor.execute(
+                INSERT_BLOCO_SPINS_SQL.format(days=placeholders),
+                [bloco] + days + [atraso_min, atraso_max]
+            )
+        cursor.execute(f"DELETE FROM bloco_spins_pendentes WHERE data IN ({placeholders})", days)
+    connection.commit()
+    return len(days)
+
+
+def create_bloco_tables(connection):
+    """Cria as tabelas dos blocos se não existirem"""
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_BLOCO_SUMMARY_SQL)
+        cursor.execute(CREATE_BLOCO_SPINS_DIARIO_SQL)
+        cursor.execute(CREATE_BLOCO_SPINS_PENDENTES_SQL)
+
+
+def refresh_pending_spins(connection):
+    """Leva para bloco_spins_diario os dias pendentes que já viraram passado (a cada varredura
+    completa do VUON, para não depender de um arquivo novo no dia seguinte)"""
+    create_bloco_tables(connection)
+    refreshed_days = refresh_bloco_spins(connection, ())
+    if refreshed_days:
+        log.info(f"📈 bloco_spins_diario: {refreshed_days} dia(s) pendente(s) atualizado(s)")
+
+
+def refresh_after_import(connection, days):
+    """Atualiza as tabelas materializadas dos blocos para os dias de vuon_resultados que mudaram"""
+    days = normalize_days(days)
+    if not days:
+        return
+
+    start = datetime.now()
+    create_bloco_tables(connection)
+
+    months = {(day.year, day.month) for day in days}
+    refresh_bloco_summary(connection, months)
+    refreshed_days = refresh_bloco_spins(connection, days)
+
+    elapsed = (datetime.now() - start).total_seconds()
+    months_text = ', '.join(f'{mes:02d}/{ano}' for ano, mes in sorted(months))
+    log.info(f"📈 Blocos atualizados: bloco_summary ({months_text}), "
+             f"bloco_spins_diario ({refreshed_days} dia(s)) em {elapsed:.1f}s")
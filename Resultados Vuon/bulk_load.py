@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carga em massa via LOAD DATA LOCAL INFILE para os importadores do VUON
+Grava o DataFrame já convertido em um TSV temporário e envia o arquivo inteiro ao MariaDB
+em um único comando, em vez de INSERTs multi-linha via executemany
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+import pymysql
+
+from batch_feeder import column_to_db_values
+from vuon_logging import get_logger
+
+log = get_logger('bulk_load')
+
+# Modos de inserção aceitos em INSERT_MODE
+MODE_EXECUTEMANY = 'executemany'
+MODE_LOAD_DATA = 'load_data'
+
+# Linhas convertidas para texto por vez ao gravar o TSV (limita o uso de memória)
+TSV_CHUNK_ROWS = int(os.getenv('TSV_CHUNK_ROWS', 50000))
+
+# Erros do servidor/cliente que indicam LOAD DATA LOCAL desabilitado
+LOCAL_INFILE_DISABLED_ERRORS = (1148, 2068, 3948, 4166)
+
+# Escapes do formato padrão do LOAD DATA (ESCAPED BY '\\')
+TSV_ESCAPES = [('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'), ('\0', '\\0')]
+TSV_NULL = '\\N'
+
+
+class BulkLoadUnavailable(Exception):
+    """LOAD DATA LOCAL INFILE não é permitido no servidor ou na conexão"""
+
+
+def get_insert_mode(value):
+    """Normaliza o valor de INSERT_MODE, voltando para executemany se for desconhecido"""
+    mode = (value or MODE_EXECUTEMANY).strip().lower()
+    if mode not in (MODE_EXECUTEMANY, MODE_LOAD_DATA):
+        log.warning(f"⚠️  INSERT_MODE '{value}' desconhecido - usando {MODE_EXECUTEMANY}")
+        return MODE_EXECUTEMANY
+    return mode
+
+
+def _tsv_column(values):
+    """Converte um array de valores prontos para o banco em texto no formato do LOAD DATA"""
+    series = pd.Series(values, dtype=object)
+    nulls = series.isna()
+    text = series.map(str)
+    for char, escaped in TSV_ESCAPES:
+        text = text.str.replace(char, escaped, regex=False)
+    text[nulls] = TSV_NULL
+    return text
+
+
+def write_tsv(df, columns, path):
+    """Grava as colunas do DataFrame em um TSV compatível com LOAD DATA; retorna o total de linhas"""
+    db_columns = [column_to_db_values(df[col]) for col in columns]
+    total = len(df)
+
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for start in range(0, total, TSV_CHUNK_ROWS):
+            end = start + TSV_CHUNK_ROWS
+            parts = [_tsv_column(values[start:end]) for values in db_columns]
+            lines = parts[0].str.cat(parts[1:], sep='\t') if len(parts) > 1 else parts[0]
+            f.write('\n'.join(lines))
+            f.write('\n')
+
+    return total
+
+
+def load_data_infile(connection, table, df, columns, duplicates=None):
+    """Carrega o DataFrame na tabela via LOAD DATA LOCAL INFILE em uma única transação
+
+    Retorna a quantidade de registros inseridos. Se o servidor ignorar alguma linha
+    (o LOCAL transforma erros em avisos), a carga é desfeita e uma exceção é lançada.
+    Com duplicates='IGNORE' ou 'REPLACE' (carga idempotente, ver upsert.py) linhas com
+    chave duplicada são esperadas e a contagem não é conferida.
+    """
+    if df.empty:
+        return 0
+
+    fd, path = tempfile.mkstemp(prefix=f'{table}_', suffix='.tsv')
+    os.close(fd)
+
+    load_sql = f"""
+    LOAD DATA LOCAL INFILE %s
+    {duplicates or ''} INTO TABLE {table}
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+    LINES TERMINATED BY '\\n'
+    ({', '.join(columns)})
+    """
+
+    try:
+        expected = write_tsv(df, columns, path)
+
+        with connection.cursor() as cursor:
+            try:
+                inserted = cursor.execute(load_sql, (path,))
+            except (pymysql.err.OperationalError, pymysql.err.InternalError,
+                    pymysql.err.ProgrammingError) as e:
+                connection.rollback()
+                if e.args and e.args[0] in LOCAL_INFILE_DISABLED_ERRORS:
+                    raise BulkLoadUnavailable(str(e))
+                raise
+
+            if duplicates is None and inserted != expected:
+                connection.rollback()
+                raise Exception(
+                    f"LOAD DATA inseriu {inserted} de {expected} registros em {table} - carga desfeita"
+                )
+
+            connection.commit()
+            return inserted
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conversores vetorizados de colunas para os importadores do VUON
+Substituem os conversores célula a célula (Series.apply) por operações sobre a coluna inteira,
+retornando os mesmos valores (inclusive a regra de '-' / '' como NULL)
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Valores tratados como NULL pelos conversores
+NULL_TOKENS = ('', '-')
+
+# Inteiros com até 18 dígitos cabem em int64 sem perda; maiores vão para o fallback
+INT_PATTERN = r'[+-]?[0-9]{1,18}'
+
+# Números decimais simples (após trocar ',' por '.'), convertidos em bloco
+DECIMAL_PATTERN = r'\s*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)\s*'
+
+
+def _null_mask(series, tokens=NULL_TOKENS):
+    """Retorna máscara booleana das células nulas (NaN/None ou um dos tokens)"""
+    mask = series.isna()
+    for token in tokens:
+        mask |= series == token
+    return mask
+
+
+def _none_series(index):
+    """Série object só com None (pd.Series(None, dtype=object) preencheria com NaN)"""
+    return pd.Series(np.full(len(index), None, dtype=object), index=index, dtype=object)
+
+
+def _apply_fallback(series, result, pending, scalar_fn):
+    """Converte célula a célula apenas as entradas que o caminho vetorizado não resolveu"""
+    if pending.any():
+        for idx in series.index[pending]:
+            result[idx] = scalar_fn(series[idx])
+    return result
+
+
+def _monetary_scalar(value, currency):
+    """Conversão monetária de uma única célula (mesma regra dos importadores)"""
+    try:
+        cleaned = str(value)
+        if currency:
+            cleaned = cleaned.replace('R$', '').strip()
+        return float(cleaned.replace('.', '').replace(',', '.'))
+    except (ValueError, AttributeError):
+        return np.nan
+
+
+def _date_scalar(value, fmt):
+    """Conversão de data/hora de uma única célula via strptime"""
+    try:
+        return datetime.strptime(str(value), fmt)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _int_scalar(value):
+    """Conversão de inteiro de uma única célula"""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return pd.NA
+
+
+def convert_monetary_column(series, currency=True):
+    """Converte coluna monetária ('1.411,75' ou 'R$213,46') para float64 (NaN para NULL)
+
+    currency=False reproduz o conversor do CSV de resultados, que não remove o prefixo 'R$'
+    """
+    nulls = _null_mask(series)
+    values = series[~nulls].astype(str)
+    if currency:
+        values = values.str.replace('R$', '', regex=False).str.strip()
+    values = values.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+
+    simple = values.str.fullmatch(DECIMAL_PATTERN)
+
+    # astype(float64) usa o mesmo parser do float() do Python, então o arredondamento é idêntico
+    result = pd.Series(np.nan, index=series.index, dtype='float64')
+    result[simple[simple].index] = values[simple].astype('float64')
+
+    pending = pd.Series(False, index=series.index)
+    pending[simple[~simple].index] = True
+    return _apply_fallback(series, result, pending, lambda v: _monetary_scalar(v, currency))
+
+
+def _convert_datetime_values(series, fmt):
+    """Converte a coluna com to_datetime(format=fmt), retornando (timestamps, nulos, pendentes)"""
+    nulls = _null_mask(series)
+    parsed = pd.to_datetime(series.where(~nulls), format=fmt, errors='coerce')
+    if fmt.endswith('%S'):
+        # to_datetime aceita segundos 60/61 e avança o minuto; o strptime rejeita: fallback
+        seconds = series.where(~nulls).astype(str).str.extract(r':(\d+)$', expand=False)
+        parsed = parsed.mask(pd.to_numeric(seconds, errors='coerce') > 59)
+    pending = ~nulls & parsed.isna()
+    return parsed, nulls, pending
+
+
+def convert_date_column(series, fmt='%d/%m/%Y'):
+    """Converte coluna de datas ('01/05/2025') para objetos date (None para NULL)"""
+    parsed, nulls, pending = _convert_datetime_values(series, fmt)
+    result = _none_series(series.index)
+    ok = parsed.notna()
+    result[ok] = parsed[ok].dt.date
+
+    def scalar(value):
+        dt = _date_scalar(value, fmt)
+        return dt.date() if dt is not None else None
+
+    return _apply_fallback(series, result, pending, scalar)
+
+
+def convert_datetime_column(series, fmt='%d/%m/%Y %H:%M:%S'):
+    """Converte coluna de data/hora ('02/06/2025 10:09:02') para objetos datetime (None para NULL)"""
+    parsed, nulls, pending = _convert_datetime_values(series, fmt)
+    ok = parsed.notna().to_numpy()
+    values = np.full(len(series), None, dtype=object)
+    # datetime64[us] -> object dá datetime do Python (o .dt.to_pydatetime() está obsoleto)
+    values[ok] = parsed[ok].to_numpy(dtype='datetime64[us]').astype(object)
+    result = pd.Series(values, index=series.index, dtype=object)
+    return _apply_fallback(series, result, pending, lambda v: _date_scalar(v, fmt))
+
+
+def convert_int_column(series):
+    """Converte coluna para inteiro anulável (Int64), com '-', '' e valores inválidos como NULL"""
+    nulls = _null_mask(series)
+    values = series[~nulls].astype(str).str.strip()
+    simple = values.str.fullmatch(INT_PATTERN)
+
+    result = pd.Series(pd.NA, index=series.index, dtype='Int64')
+    if simple.any():
+        result[simple[simple].index] = pd.to_numeric(values[simple]).astype('int64')
+
+    pending = pd.Series(False, index=series.index)
+    pending[simple[~simple].index] = True
+    if pending.any():
+        # Valores fora do caminho rápido (ex.: '1_000', dígitos não ASCII ou lixo)
+        try:
+            result = _apply_fallback(series, result, pending, _int_scalar)
+        except (TypeError, OverflowError):
+            # Inteiros acima do int64 mantêm o int do Python, como no conversor original
+            result = _apply_fallback(series, result.astype(object), pending, _int_scalar)
+    return result
+
+
+def convert_string_column(series):
+    """Converte coluna para string sem espaços nas pontas, com '-' e '' como None"""
+    nulls = _null_mask(series)
+    result = _none_series(series.index)
+    if (~nulls).any():
+        result[~nulls] = series[~nulls].astype(str).str.strip()
+    return result
+
+
+def convert_time_column(series):
+    """Mantém a hora como string ('08:15:00'), com apenas '' como None"""
+    nulls = _null_mask(series, tokens=('',))
+    result = _none_series(series.index)
+    if (~nulls).any():
+        result[~nulls] = series[~nulls].astype(str)
+    return result
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Túnel SSH e pool de conexões compartilhados pelos importadores do VUON
+Um único túnel por processo (recriado automaticamente se cair) e um pool thread-safe de
+conexões pymysql, com verificação de saúde (ping) ao emprestar e limite de conexões abertas
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+from dotenv import load_dotenv
+from sshtunnel import SSHTunnelForwarder
+
+from bulk_load import MODE_LOAD_DATA, get_insert_mode
+from vuon_logging import get_logger
+
+# Carregar variáveis de ambiente do arquivo .env
+load_dotenv()
+
+log = get_logger('db')
+
+# Configurações de conexão (lidas do arquivo .env)
+SSH_HOST = os.getenv('SSH_HOST')
+SSH_PORT = int(os.getenv('SSH_PORT', 22))
+SSH_USER = os.getenv('SSH_USER')
+SSH_PASSWORD = os.getenv('SSH_PASSWORD')
+
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = int(os.getenv('DB_PORT', 3306))
+DB_NAME = os.getenv('DB_NAME', 'vuon')
+DB_USER = os.getenv('DB_USER')
+DB_PASSWORD = os.getenv('DB_PASSWORD')
+
+# Limites do pool
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 4))  # Conexões abertas ao mesmo tempo
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 600))  # Segundos esperando uma conexão livre
+
+# LOAD DATA LOCAL INFILE só é habilitado na conexão quando INSERT_MODE=load_data
+LOCAL_INFILE = get_insert_mode(os.getenv('INSERT_MODE')) == MODE_LOAD_DATA
+
+# Erros que indicam conexão perdida (a conexão é descartada em vez de voltar ao pool)
+CONNECTION_LOST_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+
+class PoolTimeout(Exception):
+    """Nenhuma conexão ficou livre dentro do DB_POOL_TIMEOUT"""
+
+
+class TunnelManager:
+    """Mantém um único túnel SSH até o MariaDB, recriando-o quando cai"""
+
+    def __init__(self):
+        self._tunnel = None
+        self._lock = threading.Lock()
+        self.reconnects = 0
+
+    def _start(self):
+        tunnel = SSHTunnelForwarder(
+            (SSH_HOST, SSH_PORT),
+            ssh_username=SSH_USER,
+            ssh_password=SSH_PASSWORD,
+            remote_bind_address=(DB_HOST, DB_PORT),
+            local_bind_address=('127.0.0.1', 0)
+        )
+        tunnel.start()
+        log.info(f"✅ Túnel SSH estabelecido (porta local: {tunnel.local_bind_port})")
+        return tunnel
+
+    def _stop(self):
+        if self._tunnel is not None:
+            try:
+                self._tunnel.stop()
+            except Exception:
+                pass
+            self._tunnel = None
+
+    def local_port(self):
+        """Porta local do túnel, abrindo o túnel (ou reabrindo, se o transporte SSH caiu)"""
+        with self._lock:
+            if self._tunnel is not None and not self._tunnel.is_active:
+                log.warning("⚠️  Túnel SSH caiu - reconectando...")
+                self._stop()
+                self.reconnects += 1
+            if self._tunnel is None:
+                log.info("🔐 Estabelecendo túnel SSH...")
+                self._tunnel = self._start()
+            return self._tunnel.local_bind_port
+
+    def restart(self):
+        """Força a recriação do túnel (ex.: conexão recusada com o transporte ainda ativo)"""
+        with self._lock:
+            log.warning("⚠️  Recriando túnel SSH...")
+            self._stop()
+            self.reconnects += 1
+            self._tunnel = self._start()
+            return self._tunnel.local_bind_port
+
+    def stop(self):
+        with self._lock:
+            if self._tunnel is not None:
+                self._stop()
+                log.info("🔌 Túnel SSH fechado")
+
+
+class ConnectionPool:
+    """Pool thread-safe de conexões pymysql através do TunnelManager
+
+    acquire() devolve uma conexão ociosa que responda ao ping, ou abre uma nova enquanto
+    houver espaço (max_size); acima do limite espera uma conexão ser devolvida.
+    """
+
+    def __init__(self, tunnel, max_size=DB_POOL_MAX_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.tunnel = tunnel
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _connect(self):
+        """Abre uma conexão nova; se falhar, recria o túnel e tenta mais uma vez"""
+        try:
+            return self._open(self.tunnel.local_port())
+        except CONNECTION_LOST_ERRORS as e:
+            log.warning(f"⚠️  Falha ao conectar ao MariaDB ({e}) - recriando o túnel")
+            return self._open(self.tunnel.restart())
+
+    def _open(self, port):
+        return pymysql.connect(
+            host='127.0.0.1',
+            port=port,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME,
+            charset='utf8mb4',
+            cursorclass=pymysql.cursors.DictCursor,
+            local_infile=LOCAL_INFILE
+        )
+
+    @staticmethod
+    def _is_healthy(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Empresta uma conexão saudável do pool"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"Nenhuma conexão livre em {self.timeout}s (máximo {self.max_size})")
+                self._cond.wait(remaining)
+
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = None
+                self._size += 1
+
+        if connection is not None:
+            if self._is_healthy(connection):
+                return connection
+            # Conexão ociosa perdida (timeout do servidor ou túnel recriado): abrir outra no lugar
+            self._close_quietly(connection)
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, connection, discard=False):
+        """Devolve a conexão ao pool (discard=True, ou pool já fechado, fecha e libera a vaga)"""
+        if self._closed:
+            # Devolvida depois do close() (fonte ainda importando no encerramento)
+            discard = True
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._close_quietly(connection)
+                self._size -= 1
+            else:
+                self._idle.append(connection)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão durante o bloco with (descartada se a conexão cair)"""
+        connection = self.acquire()
+        try:
+            yield connection
+        except CONNECTION_LOST_ERRORS:
+            self.release(connection, discard=True)
+            raise
+        except BaseException:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+    def close(self):
+        """Fecha as conexões ociosas (as emprestadas são fechadas ao serem devolvidas)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for connection in idle:
+            self._close_quietly(connection)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool compartilhado do processo (criado na primeira chamada)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(TunnelManager())
+        return _pool
+
+
+def close_pool():
+    """Fecha as conexões ociosas e o túnel do pool compartilhado"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool.tunnel.stop()
+            log.info("🔌 Conexões com MariaDB fechadas")
+            _pool = None
+
+
+def tunnel_reconnects():
+    """Reconexões do túnel SSH do pool compartilhado desde o início do processo"""
+    pool = _pool
+    return pool.tunnel.reconnects if pool is not None else 0
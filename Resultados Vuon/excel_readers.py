@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leitores de planilha (.xls/.xlsx) para o relatório grelat06
+Todos os backends devolvem a primeira aba como matriz de valores no formato do
+UsedRange.Value do Excel (rows[r][c], linhas com a mesma quantidade de colunas):
+- 'com': Excel via win32com (apenas Windows com Excel instalado)
+- 'xlrd': .xls em Python puro
+- 'openpyxl': .xlsx em Python puro
+- 'auto' (padrão): Excel via COM quando disponível; senão, xlrd/openpyxl pela extensão
+"""
+
+import os
+from datetime import date, datetime, time, timedelta
+
+# Backend de leitura: 'auto', 'com', 'xlrd' ou 'openpyxl'
+EXCEL_READER = os.getenv('EXCEL_READER', 'auto').strip().lower()
+
+# Data base das datas OLE devolvidas pelo Excel via COM
+OLE_EPOCH = datetime(1899, 12, 30)
+
+# Dias entre o sistema de datas 1900 e o 1904 (planilhas antigas de Mac)
+DATEMODE_1904_OFFSET = 1462
+
+# Erros de célula como o COM os devolve (CVErr: -2146826288 + código BIFF)
+COM_ERROR_BASE = -2146826288
+CELL_ERRORS = {
+    '#NULL!': 0x00,
+    '#DIV/0!': 0x07,
+    '#VALUE!': 0x0F,
+    '#REF!': 0x17,
+    '#NAME?': 0x1D,
+    '#NUM!': 0x24,
+    '#N/A': 0x2A,
+}
+
+
+def _com_available():
+    """Indica se o Excel via win32com pode ser usado nesta máquina"""
+    if os.name != 'nt':
+        return False
+    try:
+        import win32com.client  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _pad_rows(values, col_count):
+    """Converte a matriz em lista de listas, completando as linhas até col_count colunas"""
+    rows = []
+    for row in values:
+        row = list(row)
+        if len(row) < col_count:
+            row.extend([None] * (col_count - len(row)))
+        rows.append(row)
+    return rows
+
+
+def _trim_leading_empty(rows):
+    """Remove linhas e colunas vazias do início, como o UsedRange (que começa na primeira célula usada)"""
+    first_row = 0
+    while first_row < len(rows) and all(value is None for value in rows[first_row]):
+        first_row += 1
+    rows = rows[first_row:]
+    if not rows:
+        return rows
+
+    first_col = min(
+        next((i for i, value in enumerate(row) if value is not None), len(row))
+        for row in rows
+    )
+    if first_col:
+        rows = [row[first_col:] for row in rows]
+    return rows
+
+
+def _ole_datetime(serial):
+    """Converte número de série OLE em datetime (arredondado ao milissegundo, como o xlrd)"""
+    milliseconds = int(round(serial * 86400000))
+    return OLE_EPOCH + timedelta(milliseconds=milliseconds)
+
+
+def read_used_range(worksheet):
+    """Lê o UsedRange da planilha em uma única chamada COM (UsedRange.Value)
+
+    Retorna uma matriz em memória (lista de linhas, todas com col_count valores) em que
+    rows[r][c] equivale a used_range.Cells(r + 1, c + 1).Value, sem uma ida ao Excel por célula
+    """
+    used_range = worksheet.UsedRange
+
+    if not used_range:
+        raise Exception("Range usado não encontrado")
+
+    col_count = used_range.Columns.Count
+    values = used_range.Value
+
+    # Range de uma única célula: o COM devolve o valor em vez de uma matriz
+    if not isinstance(values, (tuple, list)):
+        values = ((values,),)
+
+    return _pad_rows(values, col_count)
+
+
+def read_rows_com(file_path):
+    """Abre o arquivo no Excel via COM e devolve a primeira aba como matriz de valores"""
+    try:
+        import win32com.client
+    except ImportError:
+        raise Exception("win32com não está instalado. Instale com: pip install pywin32")
+
+    excel = win32com.client.Dispatch("Excel.Application")
+    excel.Visible = False
+    excel.DisplayAlerts = False
+
+    workbook = None
+    try:
+        workbook = excel.Workbooks.Open(os.path.abspath(file_path), ReadOnly=True)
+
+        if not workbook:
+            raise Exception("Não foi possível abrir o workbook")
+
+        # Processar primeira aba
+        worksheet = workbook.Worksheets(1)
+        return read_used_range(worksheet)
+    finally:
+        if workbook:
+            try:
+                workbook.Close(SaveChanges=False)
+            except:
+                pass
+        try:
+            excel.Quit()
+        except:
+            pass
+
+
+def read_rows_xlrd(file_path):
+    """Lê a primeira aba de um .xls com xlrd, convertendo os valores como o COM faria"""
+    try:
+        import xlrd
+    except ImportError:
+        raise Exception("xlrd não está instalado. Instale com: pip install xlrd")
+
+    workbook = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        date_offset = DATEMODE_1904_OFFSET if workbook.datemode else 0
+
+        rows = []
+        for r in range(sheet.nrows):
+            row = []
+            for ctype, value in zip(sheet.row_types(r), sheet.row_values(r)):
+                if ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                    value = None
+                elif ctype == xlrd.XL_CELL_DATE:
+                    value = _ole_datetime(value + date_offset)
+                elif ctype == xlrd.XL_CELL_BOOLEAN:
+                    value = bool(value)
+                elif ctype == xlrd.XL_CELL_ERROR:
+                    value = COM_ERROR_BASE + value
+                row.append(value)
+            rows.append(row)
+    finally:
+        workbook.release_resources()
+
+    return _trim_leading_empty(_pad_rows(rows, sheet.ncols))
+
+
+def _openpyxl_value(value):
+    """Normaliza um valor do openpyxl para o tipo que o COM devolveria"""
+    if value is None or isinstance(value, (bool, float)):
+        return value
+    if isinstance(value, int):
+        # O Excel guarda todos os números como ponto flutuante
+        return float(value)
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, time):
+        return datetime.combine(OLE_EPOCH.date(), value)
+    if isinstance(value, timedelta):
+        return OLE_EPOCH + value
+    if isinstance(value, str) and value in CELL_ERRORS:
+        return COM_ERROR_BASE + CELL_ERRORS[value]
+    return value
+
+
+def read_rows_openpyxl(file_path):
+    """Lê a primeira aba de um .xlsx com openpyxl (somente valores), convertendo como o COM faria"""
+    try:
+        import openpyxl
+    except ImportError:
+        raise Exception("openpyxl não está instalado. Instale com: pip install openpyxl")
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = [[_openpyxl_value(value) for value in row] for row in sheet.iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+    col_count = max((len(row) for row in rows), default=0)
+    return _trim_leading_empty(_pad_rows(rows, col_count))
+
+
+READERS = {
+    'com': read_rows_com,
+    'xlrd': read_rows_xlrd,
+    'openpyxl': read_rows_openpyxl,
+}
+
+
+def resolve_backend(file_path, backend=None):
+    """Escolhe o backend para o arquivo ('auto' usa COM quando disponível, senão a extensão)"""
+    backend = (backend or EXCEL_READER).strip().lower()
+    if backend in READERS:
+        return backend
+    if backend != 'auto':
+        raise Exception(f"Leitor de Excel desconhecido: '{backend}' (use auto, {', '.join(READERS)})")
+
+    if _com_available():
+        return 'com'
+    if file_path.lower().endswith('.xls'):
+        return 'xlrd'
+    return 'openpyxl'
+
+
+def read_sheet_rows(file_path, backend=None):
+    """Lê a primeira aba do arquivo como matriz de valores usando o backend configurado"""
+    return READERS[resolve_backend(file_path, backend)](file_path)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Impressão digital de arquivos e de linhas para os importadores do VUON
+- Arquivo: tamanho, mtime e SHA-256 do conteúdo (lido em blocos, sem carregar o arquivo na memória).
+  Tamanho e mtime iguais aos gravados na tabela de controle dispensam a leitura do arquivo.
+- Linhas: hash de 64 bits de cada linha já convertida, usado para comparar uma nova entrega
+  do arquivo com as linhas que já estão no banco e aplicar só a diferença
+"""
+
+import hashlib
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+# Bytes lidos por vez ao calcular o hash do arquivo
+FINGERPRINT_CHUNK_BYTES = int(os.getenv('FINGERPRINT_CHUNK_BYTES', 1024 * 1024))
+
+# Tolerância na comparação do mtime (o banco guarda DOUBLE; compartilhamentos arredondam)
+MTIME_TOLERANCE = 0.001
+
+FileFingerprint = namedtuple('FileFingerprint', ['tamanho', 'mtime', 'hash'])
+
+
+def hash_file(file_path, chunk_bytes=None):
+    """SHA-256 (hex) do conteúdo do arquivo, lido em blocos de chunk_bytes"""
+    chunk_bytes = chunk_bytes or FINGERPRINT_CHUNK_BYTES
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_bytes), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stat_file(file_path):
+    """Tamanho e mtime do arquivo (o hash fica None até ser necessário)"""
+    stat = os.stat(file_path)
+    return FileFingerprint(stat.st_size, stat.st_mtime, None)
+
+
+def fingerprint_file(file_path):
+    """Tamanho, mtime e hash do arquivo"""
+    stat = stat_file(file_path)
+    return stat._replace(hash=hash_file(file_path))
+
+
+def same_stat(stored, current):
+    """Tamanho e mtime iguais (o conteúdo é considerado o mesmo sem recalcular o hash)"""
+    if stored is None or stored.tamanho is None or stored.mtime is None:
+        return False
+    return (int(stored.tamanho) == current.tamanho
+            and abs(float(stored.mtime) - current.mtime) <= MTIME_TOLERANCE)
+
+
+def row_hashes(df, columns):
+    """Hash de 64 bits (sem sinal) de cada linha, calculado sobre as colunas informadas
+
+    Depende só dos valores (não do índice nem da posição da linha no arquivo), então a
+    mesma linha tem o mesmo hash em qualquer entrega do arquivo.
+    """
+    if df.empty:
+        return pd.Series([], dtype='uint64', index=df.index)
+    return pd.util.hash_pandas_object(df[columns], index=False)
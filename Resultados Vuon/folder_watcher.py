@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Observador de pastas para os importadores do VUON
+Acompanha as pastas YYYY-MM-DD de um BASE_PATH e avisa quando um arquivo novo (ou alterado)
+está pronto, isto é, quando o tamanho e a data de modificação ficaram estáveis por
+FILE_SETTLE_SECONDS. Dois modos:
+- 'inotify': eventos do kernel (Linux, disco local)
+- 'polling': varredura leve a cada WATCH_POLL_INTERVAL segundos (Windows e compartilhamentos
+  de rede como K:\\, onde o inotify não enxerga alterações feitas por outras máquinas)
+A varredura completa de cada importador (CHECK_INTERVAL) continua como rede de segurança.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import queue
+import re
+import select
+import struct
+import threading
+import time
+
+from vuon_logging import get_logger
+
+log = get_logger('observador')
+
+# Modo do observador: 'auto' (padrão), 'inotify' ou 'polling'
+WATCHER_MODE = os.getenv('WATCHER_MODE', 'auto').strip().lower()
+WATCH_POLL_INTERVAL = int(os.getenv('WATCH_POLL_INTERVAL', 15))  # Segundos entre varreduras no modo polling
+FILE_SETTLE_SECONDS = int(os.getenv('FILE_SETTLE_SECONDS', 10))  # Tamanho/mtime estáveis por esse tempo = pronto
+
+FOLDER_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Sistemas de arquivos de rede: o inotify só vê alterações feitas pela própria máquina
+NETWORK_FILESYSTEMS = ('cifs', 'smb3', 'smbfs', 'nfs', 'nfs4', 'fuse.sshfs', '9p')
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+INOTIFY_EVENT = struct.Struct('iIII')
+
+BASE_MASK = IN_CREATE | IN_MOVED_TO
+FOLDER_MASK = IN_CREATE | IN_MOVED_TO | IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB | IN_DELETE_SELF
+
+
+def _mount_fstype(path):
+    """Tipo do sistema de arquivos onde o caminho está montado (Linux), ou None"""
+    try:
+        with open('/proc/mounts', 'r') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return None
+
+    path = os.path.realpath(path)
+    best, fstype = '', None
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) and len(mount_point) > len(best):
+            best, fstype = mount_point, mount_type
+    return fstype
+
+
+def resolve_mode(base_path, mode=None):
+    """Escolhe o modo do observador ('auto' usa inotify só em disco local no Linux)"""
+    mode = (mode or WATCHER_MODE).strip().lower()
+    if mode not in ('auto', 'inotify', 'polling'):
+        log.warning(f"⚠️  WATCHER_MODE '{mode}' desconhecido - usando polling")
+        return 'polling'
+    if mode != 'auto':
+        return mode
+    if not hasattr(os, 'uname') or os.uname().sysname != 'Linux':
+        return 'polling'
+    if _mount_fstype(base_path) in NETWORK_FILESYSTEMS:
+        return 'polling'
+    return 'inotify'
+
+
+class _Inotify:
+    """Acesso mínimo ao inotify via libc (sem dependências externas)"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+        self.paths = {}
+
+    def add_watch(self, path, mask):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch falhou: {path}')
+        self.paths[wd] = path
+        return wd
+
+    def read(self, timeout):
+        """Eventos pendentes como (diretório, nome, máscara); espera até timeout segundos"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if wd in self.paths:
+                events.append((self.paths[wd], name, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """Observa BASE_PATH/YYYY-MM-DD/<arquivo> e enfileira as pastas com arquivos prontos
+
+    patterns são padrões glob dos arquivos de interesse (ex.: ['vuon_*.csv']).
+    wait_for_ready() devolve as pastas com arquivos prontos desde a última chamada.
+    """
+
+    def __init__(self, base_path, patterns, mode=None, settle_seconds=FILE_SETTLE_SECONDS,
+                 poll_interval=WATCH_POLL_INTERVAL):
+        self.base_path = base_path
+        self.patterns = [pattern.lower() for pattern in patterns]
+        self.mode = resolve_mode(base_path, mode)
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+
+        self._events = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Arquivos ainda mudando: caminho -> (assinatura, instante em que ficou estável)
+        self._candidates = {}
+        # Última assinatura já avisada por arquivo (evita avisar duas vezes o mesmo conteúdo)
+        self._emitted = {}
+        # Modo polling: mtime de cada pasta na última varredura
+        self._folder_mtimes = {}
+
+    def _matches(self, filename):
+        name = filename.lower()
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _observe(self, path):
+        """Registra um arquivo como candidato (chamado quando algo indica que ele mudou)"""
+        signature = self._signature(path)
+        if signature is None or self._emitted.get(path) == signature:
+            self._candidates.pop(path, None)
+            return
+        previous = self._candidates.get(path)
+        if previous is None or previous[0] != signature:
+            self._candidates[path] = (signature, time.monotonic())
+
+    def _check_settled(self):
+        """Avisa os candidatos cujo tamanho e mtime não mudaram por settle_seconds"""
+        now = time.monotonic()
+        for path, (signature, stable_since) in list(self._candidates.items()):
+            current = self._signature(path)
+            if current is None:
+                del self._candidates[path]
+            elif current != signature:
+                self._candidates[path] = (current, now)
+            elif now - stable_since >= self.settle_seconds:
+                del self._candidates[path]
+                self._emitted[path] = signature
+                folder = os.path.basename(os.path.dirname(path))
+                self._events.put(folder)
+
+    def _scan_folder(self, folder_path):
+        try:
+            names = os.listdir(folder_path)
+        except OSError:
+            return
+        for name in names:
+            if self._matches(name):
+                self._observe(os.path.join(folder_path, name))
+
+    def _list_date_folders(self):
+        try:
+            return [item for item in os.listdir(self.base_path) if FOLDER_PATTERN.match(item)]
+        except OSError:
+            return []
+
+    def _prime(self):
+        """Registra o estado atual como já visto (arquivos existentes ficam com a varredura completa)"""
+        for folder in self._list_date_folders():
+            folder_path = os.path.join(self.base_path, folder)
+            try:
+                self._folder_mtimes[folder] = os.stat(folder_path).st_mtime_ns
+                names = os.listdir(folder_path)
+            except OSError:
+                continue
+            for name in names:
+                if self._matches(name):
+                    path = os.path.join(folder_path, name)
+                    signature = self._signature(path)
+                    if signature is not None:
+                        self._emitted[path] = signature
+
+    def _run_polling(self):
+        while not self._stop.is_set():
+            for folder in self._list_date_folders():
+                folder_path = os.path.join(self.base_path, folder)
+                try:
+                    mtime = os.stat(folder_path).st_mtime_ns
+                except OSError:
+                    continue
+                # Só lista pastas novas ou cujo conteúdo mudou (arquivo criado/renomeado/removido)
+                if self._folder_mtimes.get(folder) != mtime:
+                    self._folder_mtimes[folder] = mtime
+                    self._scan_folder(folder_path)
+
+            # Arquivos já conhecidos que foram regravados no lugar também são reavaliados
+            for path, signature in list(self._emitted.items()):
+                current = self._signature(path)
+                if current is not None and current != signature:
+                    self._observe(path)
+
+            self._check_settled()
+            wait = self.poll_interval if not self._candidates else min(self.poll_interval, 1)
+            self._stop.wait(wait)
+
+    def _run_inotify(self, inotify):
+        while not self._stop.is_set():
+            for directory, name, mask in inotify.read(1.0):
+                if directory == self.base_path:
+                    if mask & IN_ISDIR and FOLDER_PATTERN.match(name):
+                        folder_path = os.path.join(self.base_path, name)
+                        try:
+                            inotify.add_watch(folder_path, FOLDER_MASK)
+                        except OSError as e:
+                            log.warning(f"⚠️  Observador: não foi possível acompanhar {folder_path}: {e}")
+                        # Arquivos criados antes do watch ser registrado
+                        self._scan_folder(folder_path)
+                elif name and self._matches(name):
+                    self._observe(os.path.join(directory, name))
+            self._check_settled()
+
+    def _run(self):
+        try:
+            if self.mode == 'inotify':
+                inotify = _Inotify()
+                try:
+                    inotify.add_watch(self.base_path, BASE_MASK)
+                    for folder in self._list_date_folders():
+                        inotify.add_watch(os.path.join(self.base_path, folder), FOLDER_MASK)
+                    self._run_inotify(inotify)
+                finally:
+                    inotify.close()
+            else:
+                self._run_polling()
+        except Exception as e:
+            if self.mode == 'polling':
+                log.error(f"❌ Observador de pastas parou: {e} (a varredura completa continua)")
+                return
+            log.warning(f"⚠️  inotify indisponível ({e}) - usando polling")
+            self.mode = 'polling'
+            self._run_polling()
+
+    def start(self):
+        """Inicia o observador em uma thread daemon"""
+        if not os.path.isdir(self.base_path):
+            log.warning(f"⚠️  Observador não iniciado: caminho não encontrado ({self.base_path})")
+            return self
+        self._prime()
+        self._thread = threading.Thread(
+            target=self._run, name=f"watcher-{os.path.basename(self.base_path)}", daemon=True
+        )
+        self._thread.start()
+        log.info(f"👀 Observando {self.base_path} ({self.mode}, arquivo pronto após {self.settle_seconds}s estável)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def wait_for_ready(self, timeout):
+        """Espera até timeout segundos por arquivos prontos; devolve as pastas (ordenadas) ou []"""
+        deadline = time.monotonic() + max(0, timeout)
+        try:
+            folders = {self._events.get(timeout=max(0, deadline - time.monotonic()))}
+        except queue.Empty:
+            return []
+        # Juntar os avisos que chegaram em seguida (vários arquivos da mesma leva)
+        while True:
+            try:
+                folders.add(self._events.get_nowait())
+            except queue.Empty:
+                break
+        return sorted(folders)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leitura do relatório grelat06 (recebimentos por cobrador)
+Funções compartilhadas pelo importador e pelo analisar_totalizacoes.py: segmentação dos
+blocos de agente ("Agente N - Nome", cabeçalho, linhas de dados) sobre a matriz de valores
+da planilha (ver excel_readers.py)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Linha de agente: "Agente 123 - Nome do Agente"
+AGENT_PATTERN = re.compile(r'Agente\s+(\d+)\s*[-–]\s*(.+)', re.IGNORECASE)
+
+# Padrões de totalização encontrados na planilha (primeira coluna = Nome do Cliente)
+TOTALIZATION_PATTERNS = [
+    r'^-\s*Soma$',
+    r'^-\s*Contagem$',
+    r'^Total\s+Geral',
+    r'^Total\s+',
+    r'Total\s+Geral\(.+\)\s*-\s*Soma',
+    r'Total\s+Geral\(.+\)\s*-\s*Contagem',
+]
+
+# Todos os padrões em uma única alternação, compilada uma vez
+TOTALIZATION_REGEX = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in TOTALIZATION_PATTERNS),
+    re.IGNORECASE
+)
+
+# Cada padrão compilado separadamente, só para a contagem do log
+TOTALIZATION_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in TOTALIZATION_PATTERNS]
+
+
+def extract_agent_info(cell_value):
+    """Extrai ID e nome do agente de uma célula"""
+    if not cell_value:
+        return None, None
+
+    cell_str = str(cell_value).strip()
+    match = AGENT_PATTERN.search(cell_str)
+
+    if match:
+        agent_id = match.group(1).strip()
+        agent_name = match.group(2).strip()
+        return agent_id, agent_name
+
+    return None, None
+
+
+def segment_agent_blocks(rows):
+    """Divide a planilha em blocos de agente em uma única passada pelas linhas
+
+    Cada linha "Agente N - Nome" abre um bloco; o bloco termina antes da próxima linha
+    com ID de agente (mesmo sem nome) ou no fim da planilha. As posições seguem a
+    numeração do Excel (a partir de 1):
+    - row / id / name: linha do agente, ID e nome
+    - header_row: linha do cabeçalho (logo após o agente; None se não houver)
+    - data_start / data_end: primeira e última linha de dados (faixa vazia se data_start > data_end)
+    - next_row: linha do próximo agente (ou row_count + 1)
+    """
+    row_count = len(rows)
+    blocks = []
+    current = None
+
+    for row in range(1, row_count + 1):
+        first_cell = rows[row - 1][0] if rows[row - 1] else None
+        if not first_cell:
+            continue
+
+        agent_id, agent_name = extract_agent_info(first_cell)
+        if not agent_id:
+            continue
+
+        # Linha com ID de agente: fecha o bloco aberto
+        if current is not None:
+            current['next_row'] = row
+            current['data_end'] = row - 1
+            current = None
+
+        if agent_name:
+            current = {
+                'row': row,
+                'id': agent_id,
+                'name': agent_name,
+                'header_row': row + 1 if row + 1 <= row_count else None,
+                'data_start': row + 2,
+                'data_end': row_count,
+                'next_row': row_count + 1
+            }
+            blocks.append(current)
+
+    return blocks
+
+
+def is_totalization_row(nome_cliente):
+    """Verifica se uma linha é de totalização e deve ser ignorada"""
+    if not nome_cliente or pd.isna(nome_cliente):
+        return False
+
+    return TOTALIZATION_REGEX.search(str(nome_cliente).strip()) is not None
+
+
+def classify_totalization_rows(values):
+    """Classifica uma coluna inteira (Nome do Cliente) de uma vez
+
+    Retorna (máscara numpy de linhas de totalização, contagem por padrão). Cada linha
+    é contada no primeiro padrão de TOTALIZATION_PATTERNS que a reconhece.
+    """
+    series = pd.Series(values, dtype=object)
+    counts = {pattern: 0 for pattern in TOTALIZATION_PATTERNS}
+    if series.empty:
+        return np.zeros(0, dtype=bool), counts
+
+    # Mesmo filtro do is_totalization_row: valores vazios/falsos e NaN não são totalização
+    valid = series.astype(bool) & series.notna()
+    text = series[valid].astype(str).str.strip()
+    matched = text.str.contains(TOTALIZATION_REGEX, regex=True)
+
+    mask = np.zeros(len(series), dtype=bool)
+    mask[np.flatnonzero(valid.to_numpy())[matched.to_numpy()]] = True
+
+    pending = text[matched]
+    for pattern, regex in zip(TOTALIZATION_PATTERNS, TOTALIZATION_REGEXES):
+        if pending.empty:
+            break
+        hits = pending.str.contains(regex, regex=True)
+        counts[pattern] = int(hits.sum())
+        pending = pending[~hits]
+
+    return mask, counts
@@ -4,82 +4,53 @@
 Script automatizado para importar dados de CSV do VUON para MariaDB via SSH tunnel
 Processa automaticamente todas as pastas em K:\RPA VUON\planilhas_por_dia\
 Executa continuamente verificando novas pastas a cada 5 minutos
+A importação é feita pelo motor comum (importer_engine.py); aqui ficam a descrição da fonte e a
+leitura do CSV (linhas com ';' extra no Histórico). Arquivos alterados depois da importação são
+reimportados aplicando só a diferença de linhas, e os blocos e o DDA por agente
+(página Quartis) são atualizados a cada pasta.
 """
 
-import sys
-import os
-import time
-import glob
-import csv
-import pymysql
-from sshtunnel import SSHTunnelForwarder
 import pandas as pd
-from datetime import datetime, date
-from dotenv import load_dotenv
-import re
 
-# Carregar variáveis de ambiente do arquivo .env
-load_dotenv()
-
-# Configurações de conexão (lidas do arquivo .env)
-SSH_HOST = os.getenv('SSH_HOST')
-SSH_PORT = int(os.getenv('SSH_PORT', 22))
-SSH_USER = os.getenv('SSH_USER')
-SSH_PASSWORD = os.getenv('SSH_PASSWORD')
-
-DB_HOST = os.getenv('DB_HOST', 'localhost')
-DB_PORT = int(os.getenv('DB_PORT', 3306))
-DB_NAME = os.getenv('DB_NAME', 'vuon')
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-
-# Configurações de processamento
-BASE_PATH = r'K:\RPA VUON\planilhas_por_dia'
-CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', 300))  # 5 minutos em segundos
-BATCH_SIZE = int(os.getenv('BATCH_SIZE', 1000))  # Inserir dados em lotes
-
-# Validar variáveis obrigatórias
-required_vars = ['SSH_HOST', 'SSH_USER', 'SSH_PASSWORD', 'DB_NAME', 'DB_USER', 'DB_PASSWORD']
-missing_vars = [var for var in required_vars if not os.getenv(var)]
-if missing_vars:
-    print(f"❌ ERRO: Variáveis de ambiente faltando no arquivo .env: {', '.join(missing_vars)}")
-    print("Por favor, configure o arquivo .env corretamente.")
-    sys.exit(1)
-
-
-def create_ssh_tunnel():
-    """Cria e retorna o túnel SSH"""
-    tunnel = SSHTunnelForwarder(
-        (SSH_HOST, SSH_PORT),
-        ssh_username=SSH_USER,
-        ssh_password=SSH_PASSWORD,
-        remote_bind_address=(DB_HOST, DB_PORT),
-        local_bind_address=('127.0.0.1', 0)
-    )
-    tunnel.start()
-    return tunnel
-
-
-def connect_to_db(tunnel):
-    """Conecta ao MariaDB através do túnel SSH"""
-    connection = pymysql.connect(
-        host='127.0.0.1',
-        port=tunnel.local_bind_port,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
-    return connection
-
-
-def create_tables(connection):
-    """Cria as tabelas necessárias se não existirem"""
-    # Tabela de resultados
-    create_resultados_sql = """
+from bloco_refresh import refresh_after_import, refresh_pending_spins
+from converters import (
+    convert_monetary_column,
+    convert_date_column,
+    convert_time_column,
+    convert_int_column,
+)
+from db_pool import close_pool
+from importer_engine import Importer, SourceSpec
+from partitions import partition_clause
+from quartis_snapshot import refresh_dda_snapshot
+from vuon_csv_reader import iter_raw_chunks, read_raw_csv
+from vuon_logging import get_logger
+
+log = get_logger('vuon')
+
+# Colunas do CSV gravadas em vuon_resultados (também usadas no hash de cada linha)
+COLUMN_MAP = {
+    'Nome': 'nome',
+    'Cód': 'codigo',
+    'CPF / CNPJ': 'cpf_cnpj',
+    'Agente': 'agente',
+    'Ação': 'acao',
+    'Data': 'data',
+    'Hora': 'hora',
+    'Histórico': 'historico',
+    'Fone Discado': 'fone_discado',
+    'Credor': 'credor',
+    'Atraso': 'atraso',
+    'Valor': 'valor',
+    'Inclusão': 'inclusao',
+    'CDEC': 'cdec'
+}
+RESULT_COLUMNS = list(COLUMN_MAP.values())
+
+# Tabela de resultados
+CREATE_RESULTADOS_SQL = f"""
     CREATE TABLE IF NOT EXISTS vuon_resultados (
-        id INT AUTO_INCREMENT PRIMARY KEY,
+        id INT AUTO_INCREMENT,
         nome VARCHAR(255),
         codigo VARCHAR(50),
         cpf_cnpj VARCHAR(20),
@@ -94,488 +65,132 @@ def create_tables(connection):
         valor DECIMAL(15, 2),
         inclusao DATE,
         cdec VARCHAR(50),
+        data_pasta DATE,
+        linha_hash BIGINT UNSIGNED,
+        chave_hash CHAR(32) CHARACTER SET ascii,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         INDEX idx_cpf_cnpj (cpf_cnpj),
         INDEX idx_data (data),
-        INDEX idx_codigo (codigo)
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        INDEX idx_codigo (codigo),
+        INDEX idx_pasta_linha (data_pasta, linha_hash),
+        INDEX idx_id (id),
+        UNIQUE KEY uk_chave_hash (chave_hash, data)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    {partition_clause('data')};
     """
-    
-    # Tabela de controle de importações
-    create_importacoes_sql = """
-    CREATE TABLE IF NOT EXISTS vuon_importacoes (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        data_pasta DATE NOT NULL UNIQUE,
-        arquivo_processado VARCHAR(255) NOT NULL,
-        status ENUM('processando', 'sucesso', 'erro') NOT NULL DEFAULT 'processando',
-        registros_inseridos INT DEFAULT 0,
-        data_importacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        erro_mensagem TEXT,
-        tentativas INT DEFAULT 1,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-        INDEX idx_data_pasta (data_pasta),
-        INDEX idx_status (status),
-        INDEX idx_data_importacao (data_importacao)
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-    """
-    
-    with connection.cursor() as cursor:
-        cursor.execute(create_resultados_sql)
-        cursor.execute(create_importacoes_sql)
-        connection.commit()
-
 
-def check_already_processed(connection, data_pasta):
-    """Verifica se uma pasta já foi processada com sucesso"""
-    with connection.cursor() as cursor:
-        cursor.execute(
-            "SELECT status FROM vuon_importacoes WHERE data_pasta = %s",
-            (data_pasta,)
-        )
-        result = cursor.fetchone()
-        if result:
-            return result['status'] == 'sucesso'
-        return False
+# Tabelas criadas antes da detecção de alterações e do upsert: colunas novas (só linhas
+# importadas a partir daqui recebem data_pasta/linha_hash/chave_hash)
+ALTER_RESULTADOS_SQL = """
+    ALTER TABLE vuon_resultados
+        ADD COLUMN IF NOT EXISTS data_pasta DATE,
+        ADD COLUMN IF NOT EXISTS linha_hash BIGINT UNSIGNED,
+        ADD COLUMN IF NOT EXISTS chave_hash CHAR(32) CHARACTER SET ascii,
+        ADD INDEX IF NOT EXISTS idx_pasta_linha (data_pasta, linha_hash),
+        ADD UNIQUE INDEX IF NOT EXISTS uk_chave_hash (chave_hash)
+    """
 
 
-def mark_as_processing(connection, data_pasta, arquivo):
-    """Marca uma importação como processando"""
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """INSERT INTO vuon_importacoes (data_pasta, arquivo_processado, status, tentativas)
-               VALUES (%s, %s, 'processando', 1)
-               ON DUPLICATE KEY UPDATE 
-               status = 'processando', 
-               tentativas = tentativas + 1,
-               updated_at = CURRENT_TIMESTAMP""",
-            (data_pasta, arquivo)
+def read_csv_fallback(csv_file):
+    """Leitura pelo pandas, ignorando as linhas que não puderam ser interpretadas"""
+    try:
+        return pd.read_csv(
+            csv_file,
+            sep=';',
+            encoding='utf-8',
+            dtype=str,
+            engine='python',
+            on_bad_lines='skip',
+            warn_bad_lines=False
         )
-        connection.commit()
-
-
-def mark_as_success(connection, data_pasta, registros_inseridos):
-    """Marca uma importação como sucesso"""
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """UPDATE vuon_importacoes 
-               SET status = 'sucesso', 
-                   registros_inseridos = %s,
-                   data_importacao = CURRENT_TIMESTAMP,
-                   erro_mensagem = NULL,
-                   updated_at = CURRENT_TIMESTAMP
-               WHERE data_pasta = %s""",
-            (registros_inseridos, data_pasta)
+    except TypeError:
+        return pd.read_csv(
+            csv_file,
+            sep=';',
+            encoding='utf-8',
+            dtype=str,
+            engine='python',
+            error_bad_lines=False,
+            warn_bad_lines=False
         )
-        connection.commit()
-
-
-def mark_as_error(connection, data_pasta, erro_mensagem):
-    """Marca uma importação como erro"""
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """UPDATE vuon_importacoes 
-               SET status = 'erro', 
-                   erro_mensagem = %s,
-                   updated_at = CURRENT_TIMESTAMP
-               WHERE data_pasta = %s""",
-            (str(erro_mensagem)[:500], data_pasta)  # Limitar tamanho da mensagem
-        )
-        connection.commit()
-
-
-def get_folders_to_process():
-    """Retorna lista de pastas no formato YYYY-MM-DD que precisam ser processadas"""
-    if not os.path.exists(BASE_PATH):
-        print(f"⚠️  Caminho não encontrado: {BASE_PATH}")
-        return []
-    
-    folders = []
-    pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
-    
-    for item in os.listdir(BASE_PATH):
-        folder_path = os.path.join(BASE_PATH, item)
-        if os.path.isdir(folder_path) and pattern.match(item):
-            folders.append(item)
-    
-    return sorted(folders)
-
-
-def find_csv_file(folder_path, folder_date):
-    """Encontra o arquivo CSV na pasta baseado no padrão vuon_YYYYMMDD.csv"""
-    # Converter YYYY-MM-DD para YYYYMMDD
-    date_str = folder_date.replace('-', '')
-    filename = f'vuon_{date_str}.csv'
-    file_path = os.path.join(folder_path, filename)
-    
-    if os.path.exists(file_path):
-        return file_path
-    return None
-
 
-def convert_monetary_value(value_str):
-    """Converte valor monetário de '1.411,75' para 1411.75"""
-    if pd.isna(value_str) or value_str == '':
-        return None
-    try:
-        cleaned = str(value_str).replace('.', '').replace(',', '.')
-        return float(cleaned)
-    except (ValueError, AttributeError):
-        return None
-
-
-def convert_date(date_str):
-    """Converte data de '01/05/2025' para formato DATE"""
-    if pd.isna(date_str) or date_str == '':
-        return None
-    try:
-        return datetime.strptime(str(date_str), '%d/%m/%Y').date()
-    except (ValueError, AttributeError):
-        return None
-
-
-def convert_time(time_str):
-    """Converte hora mantendo o formato TIME"""
-    if pd.isna(time_str) or time_str == '':
-        return None
-    try:
-        return str(time_str)
-    except AttributeError:
-        return None
 
-
-def convert_int(value):
-    """Converte valor para inteiro"""
-    if pd.isna(value) or value == '':
-        return None
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def read_and_process_csv(csv_file):
-    """Lê o arquivo CSV e processa os dados"""
+def read_vuon_whole(csv_file):
+    """Lê o arquivo CSV inteiro (colunas originais, como texto)"""
     # Ler CSV manualmente linha por linha para tratar campos extras
     # Esperamos 16 colunas, mas algumas linhas podem ter 17 (ponto e vírgula extra no Histórico)
-    
-    expected_columns = 16  # Nome;Cód;CPF/CNPJ;Agente;;Ação;Data;Hora;Histórico;Fone;Credor;Atraso;Valor;Inclusão;CDEC;Fase
-    
-    rows = []
-    skipped_lines = 0
-    
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            # Ler cabeçalho
-            header = f.readline().strip()
-            
-            for line_num, line in enumerate(f, start=2):  # Começa em 2 (após cabeçalho)
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Dividir por ponto e vírgula
-                fields = line.split(';')
-                
-                # Se tiver exatamente 16 campos, usar direto
-                if len(fields) == expected_columns:
-                    rows.append(fields)
-                
-                # Se tiver mais de 16 campos, tratar: juntar campos extras no Histórico
-                elif len(fields) > expected_columns:
-                    # Estrutura esperada (16 campos):
-                    # 0=Nome, 1=Cód, 2=CPF, 3=Agente, 4=Vazio, 5=Ação, 6=Data, 7=Hora,
-                    # 8=Histórico, 9=Fone, 10=Credor, 11=Atraso, 12=Valor, 13=Inclusão, 14=CDEC, 15=Fase
-                    # Se tiver 17 campos, o Histórico (índice 8) foi dividido em 2 (8 e 9)
-                    
-                    processed_fields = []
-                    # Primeiros 8 campos (0-7): Nome até Hora
-                    processed_fields.extend(fields[:8])
-                    
-                    # Campo Histórico: juntar campos extras
-                    # Se 17 campos: juntar campos 8 e 9
-                    num_extra = len(fields) - expected_columns
-                    historico_parts = fields[8:8+num_extra+1]  # +1 porque queremos incluir o campo 8+num_extra
-                    historico_completo = ';'.join(historico_parts)
-                    processed_fields.append(historico_completo)
-                    
-                    # Resto: Fone, Credor, Atraso, Valor, Inclusão, CDEC, Fase
-                    # Incluir Fase também (último campo) para manter 16 campos
-                    start_resto = 8 + num_extra + 1
-                    processed_fields.extend(fields[start_resto:])  # Inclui todos até o fim (incluindo Fase)
-                    
-                    # Garantir exatamente 16 campos
-                    if len(processed_fields) != expected_columns:
-                        if len(processed_fields) > expected_columns:
-                            processed_fields = processed_fields[:expected_columns]
-                        else:
-                            processed_fields.extend([''] * (expected_columns - len(processed_fields)))
-                    
-                    rows.append(processed_fields)
-                
-                # Se tiver menos campos, preencher com vazios
-                elif len(fields) < expected_columns:
-                    fields.extend([''] * (expected_columns - len(fields)))
-                    rows.append(fields)
-        
-        # Criar DataFrame a partir das linhas processadas
-        column_names = ['Nome', 'Cód', 'CPF / CNPJ', 'Agente', 'Coluna_Vazia', 'Ação', 'Data', 'Hora', 
-                       'Histórico', 'Fone Discado', 'Credor', 'Atraso', 'Valor', 'Inclusão', 'CDEC', 'Fase']
-        
-        df = pd.DataFrame(rows, columns=column_names, dtype=str)
-        
-        if skipped_lines > 0:
-            print(f"  ⚠️  {skipped_lines} linhas vazias foram puladas")
-        
+        return read_raw_csv(csv_file)
     except Exception as e:
         # Se der erro na leitura manual, tentar com pandas como fallback
-        print(f"  ⚠️  Erro na leitura manual, tentando com pandas: {str(e)}")
-        try:
-            df = pd.read_csv(
-                csv_file, 
-                sep=';', 
-                encoding='utf-8', 
-                dtype=str,
-                engine='python',
-                on_bad_lines='skip',
-                warn_bad_lines=False
-            )
-        except TypeError:
-            df = pd.read_csv(
-                csv_file, 
-                sep=';', 
-                encoding='utf-8', 
-                dtype=str,
-                engine='python',
-                error_bad_lines=False,
-                warn_bad_lines=False
-            )
-    
-    # Renomear colunas
-    column_mapping = {
-        'Nome': 'nome',
-        'Cód': 'codigo',
-        'CPF / CNPJ': 'cpf_cnpj',
-        'Agente': 'agente',
-        'Ação': 'acao',
-        'Data': 'data',
-        'Hora': 'hora',
-        'Histórico': 'historico',
-        'Fone Discado': 'fone_discado',
-        'Credor': 'credor',
-        'Atraso': 'atraso',
-        'Valor': 'valor',
-        'Inclusão': 'inclusao',
-        'CDEC': 'cdec'
-    }
-    
-    df.rename(columns=column_mapping, inplace=True)
-    
-    # Garantir que todas as colunas necessárias existam
-    required_columns = list(column_mapping.values())
-    for col in required_columns:
-        if col not in df.columns:
-            df[col] = None
-    
-    # Converter valores
-    df['valor'] = df['valor'].apply(convert_monetary_value)
-    df['data'] = df['data'].apply(convert_date)
-    df['inclusao'] = df['inclusao'].apply(convert_date)
-    df['hora'] = df['hora'].apply(convert_time)
-    df['atraso'] = df['atraso'].apply(convert_int)
-    
-    # Substituir NaN por None para SQL
-    df = df.where(pd.notnull(df), None)
-    
-    return df
-
-
-def insert_data_batch(connection, df):
-    """Insere dados em lote no banco de dados"""
-    insert_sql = """
-    INSERT INTO vuon_resultados 
-    (nome, codigo, cpf_cnpj, agente, acao, data, hora, 
-     historico, fone_discado, credor, atraso, valor, inclusao, cdec)
-    VALUES 
-    (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    total_records = len(df)
-    inserted = 0
-    errors = 0
-    
-    with connection.cursor() as cursor:
-        for i in range(0, total_records, BATCH_SIZE):
-            batch = df.iloc[i:i + BATCH_SIZE]
-            
-            try:
-                batch_data = []
-                for _, row in batch.iterrows():
-                    batch_data.append((
-                        None if pd.isna(row['nome']) else row['nome'],
-                        None if pd.isna(row['codigo']) else row['codigo'],
-                        None if pd.isna(row['cpf_cnpj']) else row['cpf_cnpj'],
-                        None if pd.isna(row['agente']) else row['agente'],
-                        None if pd.isna(row['acao']) else row['acao'],
-                        None if pd.isna(row['data']) else row['data'],
-                        None if pd.isna(row['hora']) else row['hora'],
-                        None if pd.isna(row['historico']) else row['historico'],
-                        None if pd.isna(row['fone_discado']) else row['fone_discado'],
-                        None if pd.isna(row['credor']) else row['credor'],
-                        None if pd.isna(row['atraso']) else row['atraso'],
-                        None if pd.isna(row['valor']) else row['valor'],
-                        None if pd.isna(row['inclusao']) else row['inclusao'],
-                        None if pd.isna(row['cdec']) else row['cdec']
-                    ))
-                
-                cursor.executemany(insert_sql, batch_data)
-                connection.commit()
-                inserted += len(batch_data)
-                
-            except Exception as e:
-                errors += len(batch)
-                connection.rollback()
-                raise e
-    
-    return inserted, errors
-
+        log.warning(f"⚠️  Erro na leitura manual, tentando com pandas: {str(e)}")
+        return read_csv_fallback(csv_file)
 
-def process_folder(connection, folder_date):
-    """Processa uma pasta específica"""
-    folder_path = os.path.join(BASE_PATH, folder_date)
-    csv_file = find_csv_file(folder_path, folder_date)
-    
-    if not csv_file:
-        raise FileNotFoundError(f"Arquivo CSV não encontrado na pasta {folder_date}")
-    
-    print(f"  📄 Processando arquivo: {os.path.basename(csv_file)}")
-    
-    # Ler e processar CSV
-    df = read_and_process_csv(csv_file)
-    print(f"  📊 Total de registros no CSV: {len(df)}")
-    
-    # Inserir dados
-    inserted, errors = insert_data_batch(connection, df)
-    
-    if errors > 0:
-        raise Exception(f"Erros ao inserir {errors} registros")
-    
-    return inserted
 
-
-def process_all_folders(connection):
-    """Processa todas as pastas que ainda não foram processadas"""
-    folders = get_folders_to_process()
-    
-    if not folders:
-        print("  ℹ️  Nenhuma pasta encontrada para processar")
-        return
-    
-    print(f"  📁 Encontradas {len(folders)} pastas")
-    
-    processed = 0
-    skipped = 0
-    errors = 0
-    
-    for folder_date in folders:
-        try:
-            # Verificar se já foi processada
-            if check_already_processed(connection, folder_date):
-                print(f"  ⏭️  Pasta {folder_date} já processada - pulando")
-                skipped += 1
-                continue
-            
-            print(f"\n  🔄 Processando pasta: {folder_date}")
-            
-            # Marcar como processando
-            folder_path = os.path.join(BASE_PATH, folder_date)
-            csv_file = find_csv_file(folder_path, folder_date)
-            if csv_file:
-                mark_as_processing(connection, folder_date, os.path.basename(csv_file))
-            
-            # Processar pasta
-            registros_inseridos = process_folder(connection, folder_date)
-            
-            # Marcar como sucesso
-            mark_as_success(connection, folder_date, registros_inseridos)
-            print(f"  ✅ Pasta {folder_date} processada com sucesso! ({registros_inseridos} registros)")
-            processed += 1
-            
-        except Exception as e:
-            errors += 1
-            error_msg = str(e)
-            print(f"  ❌ Erro ao processar pasta {folder_date}: {error_msg}")
-            mark_as_error(connection, folder_date, error_msg)
-    
-    print(f"\n  📊 Resumo: {processed} processadas, {skipped} puladas, {errors} erros")
-
-
-def main_loop():
-    """Loop principal de execução contínua"""
-    tunnel = None
-    connection = None
-    
-    print("=" * 60)
-    print("🚀 Importador Automatizado VUON - Iniciando...")
-    print("=" * 60)
-    print(f"📂 Caminho base: {BASE_PATH}")
-    print(f"⏱️  Intervalo de verificação: {CHECK_INTERVAL} segundos ({CHECK_INTERVAL // 60} minutos)")
-    print(f"💾 Banco de dados: {DB_NAME}")
-    print("=" * 60)
-    
+def iter_vuon_chunks(csv_file, chunk_rows):
+    """Blocos de até chunk_rows linhas; se o primeiro bloco falhar, o arquivo é lido inteiro"""
+    chunks = iter_raw_chunks(csv_file, chunk_rows)
     try:
-        # Criar túnel SSH
-        print("\n🔐 Estabelecendo túnel SSH...")
-        tunnel = create_ssh_tunnel()
-        print(f"✅ Túnel SSH estabelecido (porta local: {tunnel.local_bind_port})")
-        
-        # Conectar ao banco
-        print("💾 Conectando ao MariaDB...")
-        connection = connect_to_db(tunnel)
-        print("✅ Conectado ao MariaDB")
-        
-        # Criar tabelas
-        print("📋 Criando/verificando tabelas...")
-        create_tables(connection)
-        print("✅ Tabelas verificadas")
-        
-        cycle = 0
-        
-        # Loop infinito
-        while True:
-            cycle += 1
-            print(f"\n{'=' * 60}")
-            print(f"🔄 Ciclo #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'=' * 60}")
-            
-            try:
-                process_all_folders(connection)
-            except Exception as e:
-                print(f"❌ Erro no ciclo #{cycle}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            
-            print(f"\n⏳ Aguardando {CHECK_INTERVAL} segundos até a próxima verificação...")
-            time.sleep(CHECK_INTERVAL)
-            
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Interrompido pelo usuário (Ctrl+C)")
+        first_chunk = next(chunks, None)
     except Exception as e:
-        print(f"\n❌ Erro fatal: {str(e)}")
-        import traceback
-        traceback.print_exc()
-    finally:
-        # Fechar conexões
-        if connection:
-            connection.close()
-            print("🔌 Conexão com MariaDB fechada")
-        if tunnel:
-            tunnel.stop()
-            print("🔌 Túnel SSH fechado")
-        print("\n👋 Encerrando...")
+        # Nada foi inserido ainda: usar a leitura completa (com o fallback do pandas)
+        log.warning(f"⚠️  Erro na leitura em blocos, lendo o arquivo inteiro: {str(e)}")
+        yield read_vuon_whole(csv_file)
+        return
 
+    if first_chunk is None:
+        return
 
-if __name__ == '__main__':
-    main_loop()
+    yield first_chunk
+    yield from chunks
+
+
+def read_vuon_csv(csv_file, chunk_rows=0):
+    """Leitor da fonte: DataFrame do arquivo inteiro (chunk_rows <= 0) ou gerador de blocos"""
+    if chunk_rows <= 0:
+        return read_vuon_whole(csv_file)
+    return iter_vuon_chunks(csv_file, chunk_rows)
+
+
+SPEC = SourceSpec(
+    name='vuon',
+    title='VUON',
+    base_path=r'K:\RPA VUON\planilhas_por_dia',
+    file_patterns=['vuon_{data}.csv'],
+    target_table='vuon_resultados',
+    control_table='vuon_importacoes',
+    column_map=COLUMN_MAP,
+    converters={
+        'valor': lambda values: convert_monetary_column(values, currency=False),
+        'data': convert_date_column,
+        'inclusao': convert_date_column,
+        'hora': convert_time_column,
+        'atraso': convert_int_column,
+    },
+    # Identidade natural de um registro de resultado (chave_hash, usada pelo UPSERT_MODE)
+    natural_key=['codigo', 'cpf_cnpj', 'data', 'hora', 'acao', 'agente'],
+    table_ddl=[CREATE_RESULTADOS_SQL, ALTER_RESULTADOS_SQL],
+    partition_column='data',
+    reader=read_vuon_csv,
+    fingerprints=True,
+    row_columns=RESULT_COLUMNS,
+    days_column='data',
+    # Blocos (bloco_summary / bloco_spins_diario) e DDA por agente só dos dias que mudaram
+    after_import=[
+        ('bloco_summary/bloco_spins_diario', refresh_after_import),
+        ('o DDA por agente (vuon_dda_agente_dia)', refresh_dda_snapshot),
+    ],
+    # Dias importados antes de virarem passado entram em bloco_spins_diario no dia seguinte
+    cycle_tasks=[('os dias pendentes de bloco_spins_diario', refresh_pending_spins)],
+)
+
+IMPORTER = Importer(SPEC)
+process_all_folders = IMPORTER.process_all_folders
+main_loop = IMPORTER.main_loop
 
 
+if __name__ == '__main__':
+    try:
+        main_loop()
+    finally:
+        close_pool()
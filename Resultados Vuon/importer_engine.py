@@ -0,0 +1,802 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor comum dos importadores do VUON
+Cada fonte é descrita por uma SourceSpec (pasta, padrão do arquivo, mapa de colunas, conversores,
+tabela de destino) nos import_*_automated.py; o Importer faz o resto, igual para todas:
+- tabela de controle (DDL, mark_as_*, estado em memória - processed_state.py)
+- descoberta das pastas YYYY-MM-DD e do arquivo de cada uma
+- leitura em blocos com pipeline (pipeline.py), conversão das colunas e inserção
+  (executemany ou LOAD DATA, upsert pela chave natural, staging, partições mensais)
+- métricas (metrics.py) e log (vuon_logging.py)
+- opcionalmente: reimportação de arquivos alterados aplicando só a diferença de linhas e
+  atualização de tabelas derivadas com os dias afetados (fonte VUON)
+- loop contínuo com o observador de pastas (main_loop, ou o agendador de main_automated.py)
+Uma fonte nova é só mais uma SourceSpec.
+"""
+
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from batch_feeder import BatchFeeder
+from bulk_load import BulkLoadUnavailable, MODE_LOAD_DATA, get_insert_mode, load_data_infile
+from db_pool import DB_NAME, get_pool
+from file_fingerprint import fingerprint_file, hash_file, row_hashes, same_stat, stat_file
+from folder_watcher import FolderWatcher
+from metrics import (add_bytes_read, observe_batch, stage, start_metrics_server, timed_iter,
+                     track_cycle, track_folder)
+from partitions import maintain_partitions
+from pipeline import PipelineStats, pipelined
+from processed_state import ProcessedFolders
+from staging import STRATEGY_STAGING, get_load_strategy, load_target, publish_staging, staging_table
+from upsert import (KEY_COLUMN, UPSERT_UPDATE, add_key_column, apply_upsert, get_upsert_mode,
+                    load_data_duplicates)
+from vuon_logging import DEBUG, get_logger, log_skipped
+
+# Carregar variáveis de ambiente do arquivo .env
+load_dotenv()
+
+log = get_logger('importador')
+
+# Configurações de processamento (comuns a todas as fontes)
+CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', 300))  # 5 minutos em segundos
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 1000))  # Inserir dados em lotes
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', 20000))  # Linhas por bloco de leitura (0 = arquivo inteiro)
+INSERT_MODE = get_insert_mode(os.getenv('INSERT_MODE'))  # 'executemany' (padrão) ou 'load_data'
+UPSERT_MODE = get_upsert_mode(os.getenv('UPSERT_MODE'))  # 'off' (padrão), 'update' ou 'ignore'
+LOAD_STRATEGY = get_load_strategy(os.getenv('LOAD_STRATEGY'))  # 'staging' (padrão) ou 'direct'
+
+# Validar variáveis obrigatórias
+required_vars = ['SSH_HOST', 'SSH_USER', 'SSH_PASSWORD', 'DB_NAME', 'DB_USER', 'DB_PASSWORD']
+missing_vars = [var for var in required_vars if not os.getenv(var)]
+if missing_vars:
+    log.error(f"❌ ERRO: Variáveis de ambiente faltando no arquivo .env: {', '.join(missing_vars)}")
+    log.error("Por favor, configure o arquivo .env corretamente.")
+    sys.exit(1)
+
+# Pastas importadas: uma por dia, no formato YYYY-MM-DD
+FOLDER_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Tamanho máximo da mensagem de erro gravada na tabela de controle
+ERROR_MESSAGE_MAX = 1000
+
+# Colunas acrescentadas às linhas das fontes com diferença de linhas (SourceSpec.row_columns)
+ROW_DIFF_COLUMNS = ['data_pasta', 'linha_hash']
+
+
+def read_csv_raw(csv_file, chunk_rows=0):
+    """Leitor padrão: CSV separado por ';' com todas as colunas como texto
+
+    Com chunk_rows > 0 devolve um leitor de blocos; senão, o DataFrame do arquivo inteiro.
+    """
+    return pd.read_csv(
+        csv_file,
+        sep=';',
+        encoding='utf-8',
+        dtype=str,
+        engine='python',
+        chunksize=chunk_rows if chunk_rows > 0 else None
+    )
+
+
+class SourceSpec:
+    """Descrição declarativa de uma fonte de importação
+
+    name: nome da fonte nos logs e nas métricas
+    title: nome exibido ao iniciar o importador
+    base_path: pasta com as subpastas YYYY-MM-DD
+    file_patterns: padrões do arquivo dentro da pasta, em ordem de preferência ({data} = YYYYMMDD);
+        o primeiro arquivo encontrado é o importado
+    target_table: tabela de destino
+    control_table: tabela de controle das importações (uma linha por pasta)
+    column_map: coluna do arquivo -> coluna da tabela, na ordem do INSERT (colunas ausentes
+        no arquivo ficam NULL)
+    converters: coluna da tabela -> função(Series) -> Series com os valores prontos para o banco
+    natural_key: colunas que identificam o registro (chave_hash, usada pelo UPSERT_MODE)
+    table_ddl: comandos que criam/atualizam a tabela de destino
+    partition_column: coluna das partições mensais (None = tabela sem partições criadas pelo importador)
+    reader: função(arquivo, chunk_rows) -> DataFrame do arquivo inteiro ou iterável de blocos
+    fingerprints: guarda tamanho/mtime/hash do arquivo importado e reimporta a pasta se ele mudar
+    row_columns: colunas do linha_hash; com elas, cada linha é gravada com data_pasta/linha_hash
+        e uma pasta já gravada recebe só a diferença (linhas novas e removidas)
+    days_column: coluna de data das linhas, para os dias afetados passados a after_import
+    after_import: [(descrição, função(conexão, dias))] executadas após cada pasta importada
+    cycle_tasks: [(descrição, função(conexão))] executadas a cada varredura completa
+    missing_file_error: pasta sem arquivo é marcada como erro (False = pulada até o arquivo chegar)
+    control_by_file: mark_as_success/mark_as_error filtram a tabela de controle também pelo
+        arquivo_processado (além da data_pasta)
+    """
+
+    def __init__(self, name, title, base_path, file_patterns, target_table, control_table,
+                 column_map, converters=None, natural_key=None, table_ddl=(), partition_column=None,
+                 reader=read_csv_raw, fingerprints=False, row_columns=None, days_column=None,
+                 after_import=(), cycle_tasks=(), missing_file_error=True, control_by_file=False):
+        self.name = name
+        self.title = title
+        self.base_path = base_path
+        self.file_patterns = list(file_patterns)
+        self.target_table = target_table
+        self.control_table = control_table
+        self.column_map = dict(column_map)
+        self.converters = dict(converters or {})
+        self.natural_key = list(natural_key or [])
+        self.table_ddl = list(table_ddl)
+        self.partition_column = partition_column
+        self.reader = reader
+        self.fingerprints = fingerprints
+        self.row_columns = list(row_columns) if row_columns else None
+        self.days_column = days_column
+        self.after_import = list(after_import)
+        self.cycle_tasks = list(cycle_tasks)
+        self.missing_file_error = missing_file_error
+        self.control_by_file = control_by_file
+
+    @property
+    def columns(self):
+        """Colunas da tabela preenchidas a partir do arquivo"""
+        return list(self.column_map.values())
+
+    @property
+    def insert_columns(self):
+        """Colunas gravadas pelo INSERT (e copiadas da staging para a tabela de destino)"""
+        columns = self.columns
+        if self.row_columns:
+            columns += ROW_DIFF_COLUMNS
+        return columns + [KEY_COLUMN]
+
+    @property
+    def watch_patterns(self):
+        """Padrões de arquivo para o observador de pastas"""
+        return [pattern.replace('{data}', '*') for pattern in self.file_patterns]
+
+
+class Importer:
+    """Importa as pastas de uma fonte descrita por uma SourceSpec"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.log = get_logger(spec.name)
+        # Pastas já importadas com sucesso (carregadas uma vez por ciclo e mantidas pelos mark_as_*)
+        self.processed = ProcessedFolders(spec.control_table, fingerprints=spec.fingerprints)
+
+    # Tabelas
+
+    def control_table_sql(self):
+        """CREATE TABLE da tabela de controle (com as colunas da impressão digital, se usadas)"""
+        fingerprint_columns = ""
+        if self.spec.fingerprints:
+            fingerprint_columns = """
+        tamanho_arquivo BIGINT COMMENT 'Tamanho do arquivo importado',
+        mtime_arquivo DOUBLE COMMENT 'Data de modificação do arquivo importado',
+        hash_arquivo CHAR(64) COMMENT 'SHA-256 do arquivo importado',"""
+        return f"""
+    CREATE TABLE IF NOT EXISTS {self.spec.control_table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        data_pasta DATE NOT NULL UNIQUE COMMENT 'Data da pasta (formato YYYY-MM-DD)',
+        arquivo_processado VARCHAR(255) NOT NULL COMMENT 'Nome do arquivo processado',
+        status ENUM('processando', 'sucesso', 'erro') NOT NULL DEFAULT 'processando',
+        registros_inseridos INT DEFAULT 0 COMMENT 'Quantidade de registros inseridos',
+        data_importacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'Data/hora da importação',
+        erro_mensagem TEXT COMMENT 'Mensagem de erro se houver',
+        tentativas INT DEFAULT 1 COMMENT 'Número de tentativas de importação',{fingerprint_columns}
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        INDEX idx_data_pasta (data_pasta),
+        INDEX idx_status (status),
+        INDEX idx_data_importacao (data_importacao)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    COMMENT='Controle de importações: {self.spec.title}';
+    """
+
+    def create_tables(self, connection):
+        """Cria as tabelas necessárias se não existirem"""
+        statements = list(self.spec.table_ddl) + [self.control_table_sql()]
+        if self.spec.fingerprints:
+            # Tabelas de controle criadas antes da detecção de alterações
+            statements.append(f"""
+    ALTER TABLE {self.spec.control_table}
+        ADD COLUMN IF NOT EXISTS tamanho_arquivo BIGINT,
+        ADD COLUMN IF NOT EXISTS mtime_arquivo DOUBLE,
+        ADD COLUMN IF NOT EXISTS hash_arquivo CHAR(64)
+    """)
+
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+            connection.commit()
+
+    def load_processed_folders(self, connection):
+        """Carrega em memória, com uma única consulta, as pastas já processadas com sucesso"""
+        return self.processed.refresh(connection)
+
+    def mark_as_processing(self, connection, data_pasta, arquivo):
+        """Marca uma importação como processando"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""INSERT INTO {self.spec.control_table} (data_pasta, arquivo_processado, status, tentativas)
+                   VALUES (%s, %s, 'processando', 1)
+                   ON DUPLICATE KEY UPDATE
+                   arquivo_processado = VALUES(arquivo_processado),
+                   status = 'processando',
+                   tentativas = tentativas + 1,
+                   updated_at = CURRENT_TIMESTAMP""",
+                (data_pasta, arquivo)
+            )
+            connection.commit()
+        self.processed.discard(data_pasta)
+
+    def control_filter(self, data_pasta, arquivo=None):
+        """WHERE da linha da pasta na tabela de controle (e do arquivo, se a fonte usa control_by_file)"""
+        if self.spec.control_by_file and arquivo:
+            return "data_pasta = %s AND arquivo_processado = %s", [data_pasta, arquivo]
+        return "data_pasta = %s", [data_pasta]
+
+    def mark_as_success(self, connection, data_pasta, registros_inseridos, fingerprint=None, arquivo=None):
+        """Marca uma importação como sucesso (com tamanho, mtime e hash do arquivo, se a fonte os guarda)"""
+        fingerprint_sql = ""
+        params = [registros_inseridos]
+        if self.spec.fingerprints:
+            fingerprint_sql = """
+                   tamanho_arquivo = %s,
+                   mtime_arquivo = %s,
+                   hash_arquivo = %s,"""
+            params.extend(fingerprint if fingerprint else (None, None, None))
+        where, where_params = self.control_filter(data_pasta, arquivo)
+        params.extend(where_params)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""UPDATE {self.spec.control_table}
+                   SET status = 'sucesso',
+                   registros_inseridos = %s,{fingerprint_sql}
+                   data_importacao = CURRENT_TIMESTAMP,
+                   erro_mensagem = NULL,
+                   updated_at = CURRENT_TIMESTAMP
+                   WHERE {where}""",
+                params
+            )
+            connection.commit()
+            if cursor.rowcount:
+                self.processed.add(data_pasta, fingerprint if self.spec.fingerprints else None)
+
+    def update_file_stat(self, connection, data_pasta, fingerprint):
+        """Atualiza tamanho/mtime de um arquivo regravado com o mesmo conteúdo (hash igual)"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""UPDATE {self.spec.control_table}
+                   SET tamanho_arquivo = %s,
+                       mtime_arquivo = %s
+                   WHERE data_pasta = %s""",
+                (fingerprint.tamanho, fingerprint.mtime, data_pasta)
+            )
+            connection.commit()
+        self.processed.add(data_pasta, fingerprint)
+
+    def mark_as_error(self, connection, data_pasta, erro_mensagem, arquivo=None):
+        """Marca uma importação como erro"""
+        where, where_params = self.control_filter(data_pasta, arquivo)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""UPDATE {self.spec.control_table}
+                   SET status = 'erro',
+                       erro_mensagem = %s,
+                       updated_at = CURRENT_TIMESTAMP
+                   WHERE {where}""",
+                [str(erro_mensagem)[:ERROR_MESSAGE_MAX]] + where_params
+            )
+            connection.commit()
+        self.processed.discard(data_pasta)
+
+    # Pastas e arquivos
+
+    def get_folders_to_process(self):
+        """Retorna lista de pastas no formato YYYY-MM-DD (mais antigas primeiro)"""
+        base_path = self.spec.base_path
+        if not os.path.exists(base_path):
+            self.log.warning(f"⚠️  Caminho não encontrado: {base_path}")
+            return []
+
+        folders = []
+        for item in os.listdir(base_path):
+            if FOLDER_PATTERN.match(item) and os.path.isdir(os.path.join(base_path, item)):
+                folders.append(item)
+
+        return sorted(folders)
+
+    def find_file(self, folder_date):
+        """Primeiro arquivo da pasta que atende aos padrões da fonte (ou None)"""
+        folder_path = os.path.join(self.spec.base_path, folder_date)
+        for pattern in self.spec.file_patterns:
+            name = pattern.replace('{data}', folder_date.replace('-', ''))
+            files = sorted(glob.glob(os.path.join(glob.escape(folder_path), name)))
+            if files:
+                return files[0]
+        return None
+
+    # Leitura e conversão
+
+    def convert(self, df):
+        """Renomeia e converte as colunas de um DataFrame lido do arquivo (arquivo inteiro ou bloco)"""
+        df.rename(columns=self.spec.column_map, inplace=True)
+
+        # Garantir que todas as colunas necessárias existam
+        for col in self.spec.columns:
+            if col not in df.columns:
+                df[col] = None
+
+        # Converter valores (coluna inteira de uma vez)
+        for col, converter in self.spec.converters.items():
+            df[col] = converter(df[col])
+
+        return df
+
+    def prepare(self, df, folder_date):
+        """Bloco convertido e, nas fontes com diferença de linhas, com data_pasta e linha_hash"""
+        with stage('convert'):
+            df = self.convert(df)
+            if self.spec.row_columns:
+                df['data_pasta'] = folder_date
+                df['linha_hash'] = row_hashes(df, self.spec.row_columns)
+        return df
+
+    def iter_chunks(self, path, folder_date, chunk_rows=None):
+        """Lê e prepara o arquivo em blocos de até chunk_rows linhas (CSV_CHUNK_ROWS por padrão)
+
+        Com chunk_rows <= 0 (ou um leitor que só lê o arquivo inteiro) há um único bloco.
+        """
+        if chunk_rows is None:
+            chunk_rows = CSV_CHUNK_ROWS
+
+        reader = None
+        try:
+            with stage('read'):
+                reader = self.spec.reader(path, chunk_rows)
+            if isinstance(reader, pd.DataFrame):
+                yield self.prepare(reader, folder_date)
+                return
+
+            for df in timed_iter(reader, 'read'):
+                yield self.prepare(df, folder_date)
+        except Exception as e:
+            self.log.exception(f"❌ Erro ao ler {os.path.basename(path)}: {str(e)}")
+            raise
+        finally:
+            close = getattr(reader, 'close', None)
+            if close is not None:
+                close()
+
+    def read_file(self, path, folder_date=None):
+        """Arquivo inteiro, lido e preparado"""
+        return next(self.iter_chunks(path, folder_date, 0))
+
+    # Gravação
+
+    def insert_batch(self, connection, df, table=None):
+        """Insere dados em lote no banco de dados (na tabela de destino ou na staging da pasta)"""
+        table = table or self.spec.target_table
+        columns = self.spec.insert_columns
+        insert_sql = f"""
+    INSERT INTO {table}
+    ({', '.join(columns)})
+    VALUES
+    ({', '.join(['%s'] * len(columns))})
+    """
+        insert_sql = apply_upsert(insert_sql, columns, UPSERT_MODE)
+        add_key_column(df, self.spec.natural_key, UPSERT_MODE)
+
+        if INSERT_MODE == MODE_LOAD_DATA:
+            try:
+                start = time.perf_counter()
+                if UPSERT_MODE == UPSERT_UPDATE and table == self.spec.target_table:
+                    inserted = self.load_data_upsert(connection, df, columns)
+                else:
+                    inserted = load_data_infile(connection, table, df, columns,
+                                                load_data_duplicates(UPSERT_MODE))
+                observe_batch(time.perf_counter() - start)
+                self.log.debug("⚡ LOAD DATA: %s registros carregados", inserted)
+                return inserted, 0
+            except BulkLoadUnavailable as e:
+                self.log.warning(f"⚠️  LOAD DATA LOCAL INFILE indisponível ({e}) - usando executemany")
+
+        # Colunas convertidas uma única vez (NaN/NaT -> None); cada lote é fatiado dessas colunas
+        feeder = BatchFeeder(df, columns, BATCH_SIZE)
+        inserted = 0
+        errors = 0
+
+        with connection.cursor() as cursor:
+            for batch_data in feeder:
+                try:
+                    start = time.perf_counter()
+                    cursor.executemany(insert_sql, batch_data)
+                    connection.commit()
+                    observe_batch(time.perf_counter() - start)
+                    inserted += len(batch_data)
+
+                except Exception as e:
+                    errors += len(batch_data)
+                    connection.rollback()
+                    raise e
+
+        if self.log.is_enabled(DEBUG):
+            self.log.debug(f"⚡ {feeder.report()}")
+
+        return inserted, errors
+
+    def load_data_upsert(self, connection, df, columns):
+        """LOAD DATA com UPSERT_MODE=update direto na tabela de destino (LOAD_STRATEGY=direct)
+
+        O REPLACE do LOAD DATA apagaria e reinseriria as linhas já gravadas (id e created_at
+        novos): o lote é carregado em uma staging própria e publicado com ON DUPLICATE KEY
+        UPDATE, como no executemany e na publicação da staging da pasta.
+        """
+        table = self.spec.target_table
+        # Uma staging por thread: o backfill grava várias pastas ao mesmo tempo
+        with staging_table(connection, table, f'load_{os.getpid()}_{threading.get_ident()}') as staging:
+            load_data_infile(connection, staging, df, columns, load_data_duplicates(UPSERT_MODE))
+            publish_staging(connection, staging, table, columns, UPSERT_MODE)
+            connection.commit()
+        return len(df)
+
+    def load_existing_row_hashes(self, connection, folder_date):
+        """Quantas vezes cada linha_hash já está gravado para a pasta (vazio para pastas novas)"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""SELECT linha_hash, COUNT(*) AS total
+                   FROM {self.spec.target_table}
+                   WHERE data_pasta = %s AND linha_hash IS NOT NULL
+                   GROUP BY linha_hash""",
+                (folder_date,)
+            )
+            return Counter({int(row['linha_hash']): row['total'] for row in cursor.fetchall()})
+
+    @staticmethod
+    def select_new_rows(df, existing):
+        """Filtra as linhas do bloco que ainda não estão no banco, consumindo as já existentes
+
+        existing é decrementado a cada linha encontrada; ao final do arquivo, o que sobrar
+        nele são as linhas que saíram da nova versão do arquivo.
+        """
+        keep = []
+        for row_hash in df['linha_hash'].tolist():
+            if existing[row_hash] > 0:
+                existing[row_hash] -= 1
+                keep.append(False)
+            else:
+                keep.append(True)
+        return df[keep].copy()
+
+    def delete_removed_rows(self, connection, folder_date, removed):
+        """Remove da pasta as linhas que não existem mais no arquivo (sem commit)
+
+        Retorna (quantidade removida, dias (days_column) das linhas removidas).
+        """
+        table = self.spec.target_table
+        params = [(folder_date, row_hash, count) for row_hash, count in removed.items() if count > 0]
+        deleted = 0
+        days = set()
+        with connection.cursor() as cursor:
+            if params and self.spec.days_column:
+                placeholders = ', '.join(['%s'] * len(params))
+                cursor.execute(
+                    f"""SELECT DISTINCT {self.spec.days_column} AS dia FROM {table}
+                        WHERE data_pasta = %s AND linha_hash IN ({placeholders})""",
+                    [folder_date] + [param[1] for param in params]
+                )
+                days = {row['dia'] for row in cursor.fetchall()}
+            for param in params:
+                deleted += cursor.execute(
+                    f"""DELETE FROM {table}
+                       WHERE data_pasta = %s AND linha_hash = %s
+                       LIMIT %s""",
+                    param
+                )
+        return deleted, days
+
+    def load_rows(self, connection, chunks, existing, table):
+        """Grava em table as linhas dos blocos que ainda não estão no banco
+
+        Retorna (total de registros no arquivo, registros inseridos, dias das linhas inseridas).
+        """
+        total_records = 0
+        inserted = 0
+        days = set()
+        for df in chunks:
+            total_records += len(df)
+            if existing:
+                df = self.select_new_rows(df, existing)
+                if df.empty:
+                    continue
+
+            if self.spec.days_column:
+                days.update(df[self.spec.days_column].dropna().unique())
+            with stage('insert'):
+                chunk_inserted, errors = self.insert_batch(connection, df, table)
+
+            if errors > 0:
+                raise Exception(f"Erros ao inserir {errors} registros")
+            inserted += chunk_inserted
+
+        return total_records, inserted, days
+
+    def process_folder(self, connection, folder_date, chunks=None, path=None):
+        """Processa uma pasta específica
+
+        Com LOAD_STRATEGY=staging, a pasta fica visível na tabela de destino de uma vez, em um
+        único commit. Nas fontes com row_columns, uma pasta que já tem linhas no banco (arquivo
+        entregue de novo ou importação anterior interrompida) recebe só a diferença: linhas novas
+        são inseridas e as que saíram do arquivo são removidas, no mesmo commit.
+
+        chunks: blocos já lidos e preparados (backfill_vuon.py); sem eles o arquivo da pasta é
+        lido aqui, em uma thread (pipeline.py), enquanto os blocos anteriores são gravados.
+
+        Retorna (registros, dias afetados): registros é o total do arquivo nas fontes com
+        row_columns e o total inserido nas demais.
+        """
+        spec = self.spec
+        stats = None
+        if chunks is None:
+            path = path or self.find_file(folder_date)
+            if not path:
+                raise FileNotFoundError(f"Arquivo ({', '.join(spec.file_patterns)}) não encontrado na pasta {folder_date}")
+
+            self.log.info(f"📄 Processando arquivo: {os.path.basename(path)}")
+            add_bytes_read(path)
+            # Sem staging, um erro de leitura no meio do arquivo deixaria a pasta gravada pela
+            # metade: arquivo inteiro (a diferença de linhas corrige isso na próxima tentativa)
+            chunk_rows = None
+            if LOAD_STRATEGY != STRATEGY_STAGING and not spec.row_columns:
+                chunk_rows = 0
+            stats = PipelineStats()
+            chunks = pipelined(self.iter_chunks(path, folder_date, chunk_rows), stats)
+
+        existing = None
+        if spec.row_columns:
+            existing = self.load_existing_row_hashes(connection, folder_date)
+            if existing:
+                self.log.info(f"🔍 {sum(existing.values()):,} registros desta pasta já no banco - aplicando só a diferença")
+
+        removed = 0
+        try:
+            with load_target(connection, spec.target_table, folder_date, LOAD_STRATEGY) as target:
+                total_records, inserted, days = self.load_rows(connection, chunks, existing, target)
+
+                with stage('insert'):
+                    if target != spec.target_table:
+                        publish_staging(connection, target, spec.target_table, spec.insert_columns, UPSERT_MODE)
+                        self.log.info(f"📦 {inserted:,} registros publicados da tabela de staging")
+                    if existing:
+                        removed, removed_days = self.delete_removed_rows(connection, folder_date, existing)
+                        days.update(removed_days)
+                    connection.commit()
+        finally:
+            if stats is not None:
+                chunks.close()  # encerra a thread de leitura se a gravação falhou no meio
+
+        self.log.info(f"📊 Total de registros no arquivo: {total_records}")
+        if stats is not None:
+            self.log.info(stats.report())
+
+        if existing:
+            self.log.info(f"🔁 Diferença aplicada: {inserted:,} inseridos, {removed:,} removidos, "
+                          f"{total_records - inserted:,} inalterados",
+                          pasta=folder_date, inseridos=inserted, removidos=removed)
+
+        return (total_records if spec.row_columns else inserted), days
+
+    def detect_file_change(self, connection, folder_date, path):
+        """Verifica se o arquivo de uma pasta já importada mudou desde a importação
+
+        Retorna a nova impressão digital se o conteúdo mudou, ou None. O hash só é calculado
+        quando tamanho ou mtime diferem do que foi gravado; pastas importadas antes da
+        detecção de alterações (sem hash gravado) não são verificadas.
+        """
+        stored = self.processed.fingerprint(folder_date)
+        if stored is None or not path:
+            return None
+
+        current = stat_file(path)
+        if same_stat(stored, current):
+            return None
+
+        current = current._replace(hash=hash_file(path))
+        if current.hash == stored.hash:
+            # Arquivo regravado com o mesmo conteúdo: só atualizar tamanho/mtime
+            self.update_file_stat(connection, folder_date, current)
+            return None
+        return current
+
+    def refresh_derived(self, connection, days):
+        """Atualiza as tabelas derivadas (after_import) com os dias afetados"""
+        for description, refresh in self.spec.after_import:
+            try:
+                refresh(connection, days)
+            except Exception as e:
+                connection.rollback()
+                self.log.warning(f"⚠️  Erro ao atualizar {description}: {str(e)}")
+
+    def process_all_folders(self, connection, folders=None, stop=None):
+        """Processa as pastas que ainda não foram processadas (todas, ou só as informadas pelo observador)
+
+        stop: threading.Event do encerramento (scheduler.py); a pasta em andamento termina e as
+        restantes ficam para a próxima execução.
+        """
+        spec = self.spec
+        log = self.log
+        with track_cycle(spec.name):
+            with stage('discover'):
+                if folders is None:
+                    folders = self.get_folders_to_process()
+
+                if not folders:
+                    log.info("ℹ️  Nenhuma pasta encontrada para processar")
+                    return
+
+                # Estado de todas as pastas em uma única consulta
+                processadas = self.load_processed_folders(connection)
+            log.info(f"📁 Encontradas {len(folders)} pastas ({processadas} já importadas com sucesso)")
+
+            processed = 0
+            skipped_folders = []
+            missing = 0
+            errors = 0
+
+            for folder_date in folders:
+                if stop is not None and stop.is_set():
+                    log.warning("🛑 Encerramento solicitado - pastas restantes ficam para a próxima execução")
+                    break
+
+                with track_folder(spec.name, folder_date) as folder_metrics:
+                    path = None
+                    try:
+                        # Verificar se já foi processada (e, se a fonte guarda a impressão digital,
+                        # se o arquivo mudou desde então); pastas já importadas das outras fontes
+                        # nem chegam a ser listadas no disco
+                        with stage('discover'):
+                            already_processed = folder_date in self.processed
+                            fingerprint = None
+                            if not already_processed or spec.fingerprints:
+                                path = self.find_file(folder_date)
+                            if already_processed and path:
+                                fingerprint = self.detect_file_change(connection, folder_date, path)
+
+                        if already_processed and fingerprint is None:
+                            log.debug("⏭️  Pasta %s já processada - pulando", folder_date)
+                            folder_metrics.skip()
+                            skipped_folders.append(folder_date)
+                            continue
+
+                        if not path and spec.missing_file_error:
+                            raise FileNotFoundError(f"Arquivo não encontrado na pasta {folder_date}")
+                        if not path:
+                            # Pasta criada e arquivo ainda não entregue: tentar no próximo ciclo
+                            log.debug("⏭️  Pasta %s sem arquivo - pulando", folder_date)
+                            folder_metrics.skip()
+                            missing += 1
+                            continue
+
+                        if already_processed:
+                            log.info(f"🔁 Arquivo da pasta {folder_date} foi alterado - reimportando a diferença")
+                        else:
+                            log.info(f"🔄 Processando pasta: {folder_date}", pasta=folder_date)
+
+                        # Marcar como processando
+                        if spec.fingerprints and fingerprint is None:
+                            with stage('discover'):
+                                fingerprint = fingerprint_file(path)
+                        with stage('mark'):
+                            self.mark_as_processing(connection, folder_date, os.path.basename(path))
+
+                        # Processar pasta
+                        registros_inseridos, affected_days = self.process_folder(connection, folder_date, path=path)
+                        folder_metrics.rows = registros_inseridos
+
+                        # Marcar como sucesso
+                        with stage('mark'):
+                            self.mark_as_success(connection, folder_date, registros_inseridos, fingerprint,
+                                                 arquivo=os.path.basename(path))
+                        log.info(f"✅ Pasta {folder_date} processada com sucesso! ({registros_inseridos} registros)",
+                                 pasta=folder_date, registros=registros_inseridos)
+                        processed += 1
+
+                        # Tabelas derivadas só dos dias que mudaram
+                        if spec.after_import:
+                            with stage('refresh'):
+                                self.refresh_derived(connection, affected_days)
+
+                    except Exception as e:
+                        errors += 1
+                        error_msg = str(e)
+                        folder_metrics.fail(error_msg)
+                        log.error(f"❌ Erro ao processar pasta {folder_date}: {error_msg}", pasta=folder_date)
+                        with stage('mark'):
+                            self.mark_as_error(connection, folder_date, error_msg,
+                                               arquivo=os.path.basename(path) if path else None)
+
+            log_skipped(log, skipped_folders)
+            log.info(f"📊 Resumo: {processed} processadas, {len(skipped_folders)} puladas, "
+                     f"{missing} sem arquivo, {errors} erros",
+                     processadas=processed, puladas=len(skipped_folders), sem_arquivo=missing, erros=errors)
+
+    def start_watcher(self):
+        """Observador de pastas: arquivos prontos são importados sem esperar o CHECK_INTERVAL"""
+        return FolderWatcher(self.spec.base_path, self.spec.watch_patterns).start()
+
+    def run_cycle(self, connection, folders=None, stop=None):
+        """Varredura completa (com a manutenção das partições e as cycle_tasks) ou só as pastas informadas"""
+        if folders is None and self.spec.partition_column:
+            maintain_partitions(connection, self.spec.target_table)
+        self.process_all_folders(connection, folders, stop)
+        if folders is None:
+            for description, task in self.spec.cycle_tasks:
+                try:
+                    task(connection)
+                except Exception as e:
+                    connection.rollback()
+                    self.log.warning(f"⚠️  Erro ao atualizar {description}: {str(e)}")
+
+    def main_loop(self):
+        """Loop principal de execução contínua (conexões emprestadas do pool compartilhado)"""
+        spec = self.spec
+        log = self.log
+        pool = get_pool()
+        watcher = None
+        start_metrics_server()
+
+        log.info(f"🚀 Importador Automatizado {spec.title} - Iniciando...")
+        log.info(f"📂 Caminho base: {spec.base_path}")
+        log.info(f"⏱️  Intervalo de verificação: {CHECK_INTERVAL} segundos ({CHECK_INTERVAL / 60:.1f} minutos)")
+        log.info(f"💾 Banco de dados: {DB_NAME}")
+
+        try:
+            # Criar tabelas
+            log.info("💾 Conectando ao MariaDB (túnel SSH compartilhado)...")
+            with pool.connection() as connection:
+                log.info("📋 Criando/verificando tabelas...")
+                self.create_tables(connection)
+                log.info("✅ Tabelas verificadas")
+
+            watcher = self.start_watcher()
+            cycle = 0
+
+            # Loop infinito
+            while True:
+                cycle += 1
+                log.info(f"🔄 Ciclo #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+                try:
+                    with pool.connection() as connection:
+                        self.run_cycle(connection)
+                except Exception as e:
+                    log.exception(f"❌ Erro no ciclo #{cycle}: {str(e)}")
+
+                # Até a próxima varredura completa, processar as pastas avisadas pelo observador
+                log.info(f"⏳ Próxima varredura completa em {CHECK_INTERVAL} segundos (aguardando arquivos novos)...")
+                next_scan = time.monotonic() + CHECK_INTERVAL
+                while True:
+                    ready = watcher.wait_for_ready(next_scan - time.monotonic())
+                    if not ready:
+                        break
+                    log.info(f"📥 Arquivo(s) pronto(s) em: {', '.join(ready)}")
+                    try:
+                        with pool.connection() as connection:
+                            self.run_cycle(connection, ready)
+                    except Exception as e:
+                        log.exception(f"❌ Erro ao processar pastas avisadas: {str(e)}")
+
+        except KeyboardInterrupt:
+            log.warning("⚠️  Interrompido pelo usuário (Ctrl+C)")
+        except Exception as e:
+            log.exception(f"❌ Erro fatal: {str(e)}")
+        finally:
+            if watcher:
+                watcher.stop()
+            log.info("👋 Encerrando...")
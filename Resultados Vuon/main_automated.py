@@ -2,130 +2,81 @@
 # -*- coding: utf-8 -*-
 """
 Script principal para executar todas as automações do VUON
-Executa as 3 automações em paralelo usando threads:
+Executa as 4 importações no mesmo processo, pelo agendador (scheduler.py):
 - Importação de resultados VUON
 - Importação de bordero de pagamento
 - Importação de novações
+- Importação de recebimentos por cobrador
+Cada fonte tem intervalo e prioridade próprios (CHECK_INTERVAL_<FONTE> e PRIORITY_<FONTE>, ex.:
+CHECK_INTERVAL_BORDERO=900); as fontes de HEAVY_SOURCES dividem SCHEDULER_MAX_HEAVY vagas.
 """
 
-import sys
-import threading
-import time
+import os
 from datetime import datetime
 
-# Importar as funções main_loop de cada automação
-from import_vuon_automated import main_loop as vuon_main_loop
-from import_bordero_automated import main_loop as bordero_main_loop
-from import_novacoes_automated import main_loop as novacoes_main_loop
+from import_vuon_automated import IMPORTER as vuon_importer
+from import_bordero_automated import IMPORTER as bordero_importer
+from import_novacoes_automated import IMPORTER as novacoes_importer
+from import_recebimentos_por_cobrador_automated import IMPORTER as recebimentos_importer
+from importer_engine import CHECK_INTERVAL, CSV_CHUNK_ROWS
+from db_pool import DB_POOL_MAX_SIZE, close_pool
+from excel_readers import EXCEL_READER
+from metrics import start_metrics_server
+from scheduler import SCHEDULER_MAX_HEAVY, Scheduler, SourceJob
+from vuon_logging import get_logger
 
+log = get_logger('main')
 
-def run_vuon_automation():
-    """Executa a automação de resultados VUON"""
-    try:
-        print("\n" + "=" * 60)
-        print("🚀 Iniciando automação: Resultados VUON")
-        print("=" * 60)
-        vuon_main_loop()
-    except Exception as e:
-        print(f"\n❌ ERRO na automação Resultados VUON: {str(e)}")
-        import traceback
-        traceback.print_exc()
+# Fontes e prioridade padrão (menor número = atendida primeiro quando as vagas estão ocupadas)
+SOURCES = [
+    (vuon_importer, 1),
+    (recebimentos_importer, 2),
+    (bordero_importer, 3),
+    (novacoes_importer, 4),
+]
 
+# Fontes pesadas: CSV diário grande do VUON (com blocos/quartis) e planilha Excel dos recebimentos
+HEAVY_SOURCES = {name.strip() for name in os.getenv('HEAVY_SOURCES', 'vuon,recebimentos').split(',') if name.strip()}
 
-def run_bordero_automation():
-    """Executa a automação de bordero de pagamento"""
-    try:
-        print("\n" + "=" * 60)
-        print("🚀 Iniciando automação: Bordero de Pagamento")
-        print("=" * 60)
-        bordero_main_loop()
-    except Exception as e:
-        print(f"\n❌ ERRO na automação Bordero de Pagamento: {str(e)}")
-        import traceback
-        traceback.print_exc()
 
-
-def run_novacoes_automation():
-    """Executa a automação de novações"""
-    try:
-        print("\n" + "=" * 60)
-        print("🚀 Iniciando automação: Novações")
-        print("=" * 60)
-        novacoes_main_loop()
-    except Exception as e:
-        print(f"\n❌ ERRO na automação Novações: {str(e)}")
-        import traceback
-        traceback.print_exc()
+def source_jobs():
+    """Fontes com intervalo/prioridade do .env (CHECK_INTERVAL_VUON, PRIORITY_VUON...)"""
+    jobs = []
+    for importer, priority in SOURCES:
+        name = importer.spec.name
+        jobs.append(SourceJob(
+            importer,
+            interval=int(os.getenv(f'CHECK_INTERVAL_{name.upper()}', CHECK_INTERVAL)),
+            priority=int(os.getenv(f'PRIORITY_{name.upper()}', priority)),
+            heavy=name in HEAVY_SOURCES,
+        ))
+    return jobs
 
 
 def main():
-    """Função principal que inicia todas as automações em threads separadas"""
-    print("=" * 80)
-    print("🚀 SISTEMA DE AUTOMAÇÃO VUON - INICIANDO TODAS AS AUTOMAÇÕES")
-    print("=" * 80)
-    print(f"⏰ Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("\n📋 Automações que serão executadas:")
-    print("   1. Resultados VUON (K:\\RPA VUON\\planilhas_por_dia\\)")
-    print("   2. Bordero de Pagamento (K:\\RPA VUON\\pagamentos\\)")
-    print("   3. Novações (K:\\RPA VUON\\Novações\\)")
-    print("\n💡 Cada automação roda em uma thread separada e é independente")
-    print("💡 Use Ctrl+C para encerrar todas as automações")
-    print("=" * 80)
-    
-    # Criar threads para cada automação
-    thread_vuon = threading.Thread(target=run_vuon_automation, name="VUON-Resultados", daemon=False)
-    thread_bordero = threading.Thread(target=run_bordero_automation, name="VUON-Bordero", daemon=False)
-    thread_novacoes = threading.Thread(target=run_novacoes_automation, name="VUON-Novacoes", daemon=False)
-    
+    """Função principal que inicia todas as automações pelo agendador"""
+    log.info("🚀 SISTEMA DE AUTOMAÇÃO VUON - INICIANDO TODAS AS AUTOMAÇÕES")
+    log.info(f"⏰ Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    log.info("📋 Automações que serão executadas:")
+    for number, (importer, _) in enumerate(SOURCES, 1):
+        log.info(f"{number}. {importer.spec.title} ({importer.spec.base_path})")
+    log.info(f"💾 Leitura do CSV VUON em blocos de {CSV_CHUNK_ROWS:,} linhas (CSV_CHUNK_ROWS; 0 = arquivo inteiro)")
+    log.info(f"📑 Leitor de Excel: {EXCEL_READER} (EXCEL_READER: auto, com, xlrd, openpyxl)")
+    log.info(f"🔐 Túnel SSH e pool de conexões compartilhados (até {DB_POOL_MAX_SIZE} conexões - DB_POOL_MAX_SIZE)")
+    log.info(f"🏋️  Até {SCHEDULER_MAX_HEAVY} importação(ões) pesada(s) ao mesmo tempo "
+             f"(SCHEDULER_MAX_HEAVY; HEAVY_SOURCES: {', '.join(sorted(HEAVY_SOURCES)) or 'nenhuma'})")
+    log.info("💡 Use Ctrl+C para encerrar todas as automações")
+
+    start_metrics_server()
     try:
-        # Iniciar todas as threads
-        print("\n🔄 Iniciando threads...")
-        thread_vuon.start()
-        time.sleep(2)  # Pequeno delay para evitar conflitos na inicialização
-        
-        thread_bordero.start()
-        time.sleep(2)
-        
-        thread_novacoes.start()
-        time.sleep(2)
-        
-        print("\n✅ Todas as automações foram iniciadas!")
-        print("📊 Status das threads:")
-        print(f"   - Resultados VUON: {'✅ Rodando' if thread_vuon.is_alive() else '❌ Parada'}")
-        print(f"   - Bordero Pagamento: {'✅ Rodando' if thread_bordero.is_alive() else '❌ Parada'}")
-        print(f"   - Novações: {'✅ Rodando' if thread_novacoes.is_alive() else '❌ Parada'}")
-        print("\n⏳ Aguardando execução das automações...")
-        print("   (Pressione Ctrl+C para encerrar todas)\n")
-        
-        # Aguardar todas as threads (bloqueia até que todas terminem)
-        thread_vuon.join()
-        thread_bordero.join()
-        thread_novacoes.join()
-        
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Interrompido pelo usuário (Ctrl+C)")
-        print("🛑 Encerrando todas as automações...")
-        
-        # Aguardar um pouco para as threads finalizarem
-        time.sleep(2)
-        
-        print("\n📊 Status final das threads:")
-        print(f"   - Resultados VUON: {'⏳ Finalizando...' if thread_vuon.is_alive() else '✅ Encerrada'}")
-        print(f"   - Bordero Pagamento: {'⏳ Finalizando...' if thread_bordero.is_alive() else '✅ Encerrada'}")
-        print(f"   - Novações: {'⏳ Finalizando...' if thread_novacoes.is_alive() else '✅ Encerrada'}")
-        
+        Scheduler(source_jobs()).run()
     except Exception as e:
-        print(f"\n❌ Erro fatal no sistema principal: {str(e)}")
-        import traceback
-        traceback.print_exc()
-    
+        log.exception(f"❌ Erro fatal no sistema principal: {str(e)}")
     finally:
-        print("\n" + "=" * 80)
-        print("👋 Sistema de automação encerrado")
-        print(f"⏰ Fim: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 80)
+        close_pool()
+        log.info("👋 Sistema de automação encerrado")
+        log.info(f"⏰ Fim: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Métricas dos importadores do VUON
+- Por pasta: tempo de cada etapa (discover, read, convert, insert, mark), registros, bytes lidos,
+  registros/s, latência dos commits de cada lote e reconexões do túnel SSH durante a pasta
+- Por ciclo: tempo da descoberta das pastas e totais de pastas processadas, puladas e com erro
+Os importadores abrem track_cycle() / track_folder() e marcam as etapas com stage(); as funções
+de baixo nível (leitura, insert_*_batch) encontram a pasta corrente sem receber parâmetros
+(por thread; o pipeline.py repassa a pasta à thread de leitura).
+Saídas:
+- endpoint HTTP local no formato do Prometheus (METRICS_PORT; 0 desliga): http://127.0.0.1:9108/metrics
+- log JSON (uma linha por pasta e por ciclo) com rotação por tamanho (METRICS_LOG; vazio desliga)
+Leitura e gravação rodam em paralelo (pipeline.py): a soma das etapas pode passar da duração da pasta.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+from db_pool import tunnel_reconnects
+from vuon_logging import get_logger
+
+log = get_logger('metricas')
+
+# Endpoint do Prometheus (um por processo; 0 = desligado)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 9108))
+
+# Log JSON com rotação (vazio = desligado)
+METRICS_LOG = os.getenv('METRICS_LOG', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     'logs', 'import_metrics.jsonl'))
+METRICS_LOG_MAX_BYTES = int(os.getenv('METRICS_LOG_MAX_BYTES', 10 * 1024 * 1024))
+METRICS_LOG_BACKUPS = int(os.getenv('METRICS_LOG_BACKUPS', 5))
+
+# Etapas de cada pasta, na ordem em que acontecem
+STAGES = ['discover', 'read', 'convert', 'insert', 'mark']
+
+# Limites (segundos) do histograma de latência de commit por lote
+BATCH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STATUS_SUCCESS = 'sucesso'
+STATUS_ERROR = 'erro'
+STATUS_SKIPPED = 'pulada'
+
+_local = threading.local()
+
+
+class FolderMetrics:
+    """Medições de uma pasta (etapas podem ser somadas pela thread de leitura e pela de gravação)"""
+
+    def __init__(self, source, folder):
+        self.source = source
+        self.folder = folder
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.rows = 0
+        self.bytes_read = 0
+        self.batches = 0
+        self.batch_seconds = 0.0
+        self.batch_max = 0.0
+        self.reconnects_start = tunnel_reconnects()
+        self.reconnects = 0
+        self.status = STATUS_SUCCESS
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def observe_batch(self, seconds):
+        with self._lock:
+            self.batches += 1
+            self.batch_seconds += seconds
+            self.batch_max = max(self.batch_max, seconds)
+
+    def skip(self):
+        self.status = STATUS_SKIPPED
+
+    def fail(self, error):
+        self.status = STATUS_ERROR
+        self.error = str(error)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.start
+        self.reconnects = tunnel_reconnects() - self.reconnects_start
+
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_record(self):
+        return {
+            'tipo': 'pasta',
+            'fonte': self.source,
+            'pasta': self.folder,
+            'status': self.status,
+            'inicio': self.started_at.isoformat(timespec='seconds'),
+            'duracao_s': round(self.seconds, 3),
+            'etapas': {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            'registros': self.rows,
+            'bytes': self.bytes_read,
+            'registros_por_s': round(self.rows_per_second()),
+            'lotes': self.batches,
+            'commit_medio_s': round(self.batch_seconds / self.batches, 4) if self.batches else None,
+            'commit_max_s': round(self.batch_max, 4) if self.batches else None,
+            'reconexoes_tunel': self.reconnects,
+            'erro': self.error,
+        }
+
+
+class CycleMetrics:
+    """Medições de um ciclo (varredura completa ou pastas avisadas pelo observador)"""
+
+    def __init__(self, source):
+        self.source = source
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        self.stages = {'discover': 0.0}
+        self.counts = dict.fromkeys((STATUS_SUCCESS, STATUS_SKIPPED, STATUS_ERROR), 0)
+        self.rows = 0
+        self.bytes_read = 0
+
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def folder_done(self, folder_metrics):
+        self.counts[folder_metrics.status] += 1
+        self.rows += folder_metrics.rows
+        self.bytes_read += folder_metrics.bytes_read
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.start
+
+    def to_record(self):
+        return {
+            'tipo': 'ciclo',
+            'fonte': self.source,
+            'inicio': self.started_at.isoformat(timespec='seconds'),
+            'duracao_s': round(self.seconds, 3),
+            'descoberta_s': round(self.stages['discover'], 3),
+            'processadas': self.counts[STATUS_SUCCESS],
+            'puladas': self.counts[STATUS_SKIPPED],
+            'erros': self.counts[STATUS_ERROR],
+            'registros': self.rows,
+            'bytes': self.bytes_read,
+        }
+
+
+class Registry:
+    """Acumulados do processo, expostos no endpoint do Prometheus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.folders = {}
+        self.rows = {}
+        self.bytes_read = {}
+        self.stage_seconds = {}
+        self.last_stage_seconds = {}
+        self.last_rows_per_second = {}
+        self.batch_buckets = {}
+        self.batch_sum = {}
+        self.batch_count = {}
+        self.cycles = {}
+        self.last_cycle_seconds = {}
+        self.last_cycle_timestamp = {}
+
+    def record_folder(self, folder_metrics):
+        source = folder_metrics.source
+        with self._lock:
+            key = (source, folder_metrics.status)
+            self.folders[key] = self.folders.get(key, 0) + 1
+            if folder_metrics.status == STATUS_SKIPPED:
+                return
+            self.rows[source] = self.rows.get(source, 0) + folder_metrics.rows
+            self.bytes_read[source] = self.bytes_read.get(source, 0) + folder_metrics.bytes_read
+            for name, seconds in folder_metrics.stages.items():
+                self.stage_seconds[(source, name)] = self.stage_seconds.get((source, name), 0.0) + seconds
+                self.last_stage_seconds[(source, name)] = seconds
+            if folder_metrics.status == STATUS_SUCCESS:
+                self.last_rows_per_second[source] = folder_metrics.rows_per_second()
+
+    def observe_batch(self, source, seconds):
+        with self._lock:
+            buckets = self.batch_buckets.setdefault(source, [0] * len(BATCH_BUCKETS))
+            for i, limit in enumerate(BATCH_BUCKETS):
+                if seconds <= limit:
+                    buckets[i] += 1
+            self.batch_sum[source] = self.batch_sum.get(source, 0.0) + seconds
+            self.batch_count[source] = self.batch_count.get(source, 0) + 1
+
+    def record_cycle(self, cycle_metrics):
+        source = cycle_metrics.source
+        with self._lock:
+            self.cycles[source] = self.cycles.get(source, 0) + 1
+            self.last_cycle_seconds[source] = cycle_metrics.seconds
+            self.last_cycle_timestamp[source] = time.time()
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        with self._lock:
+            family('vuon_import_folders_total', 'counter', 'Pastas tratadas por fonte e status',
+                   [((('source', s), ('status', st)), n) for (s, st), n in sorted(self.folders.items())])
+            family('vuon_import_rows_total', 'counter', 'Registros lidos dos arquivos importados',
+                   [((('source', s),), n) for s, n in sorted(self.rows.items())])
+            family('vuon_import_bytes_read_total', 'counter', 'Bytes dos arquivos importados',
+                   [((('source', s),), n) for s, n in sorted(self.bytes_read.items())])
+            family('vuon_import_stage_seconds_total', 'counter', 'Tempo acumulado por etapa',
+                   [((('source', s), ('stage', st)), round(v, 6))
+                    for (s, st), v in sorted(self.stage_seconds.items())])
+            family('vuon_import_last_folder_stage_seconds', 'gauge', 'Tempo de cada etapa na última pasta',
+                   [((('source', s), ('stage', st)), round(v, 6))
+                    for (s, st), v in sorted(self.last_stage_seconds.items())])
+            family('vuon_import_last_folder_rows_per_second', 'gauge', 'Registros/s da última pasta importada',
+                   [((('source', s),), round(v, 1)) for s, v in sorted(self.last_rows_per_second.items())])
+
+            lines.append("# HELP vuon_import_batch_commit_seconds Latência de cada lote (insert + commit)")
+            lines.append("# TYPE vuon_import_batch_commit_seconds histogram")
+            for source in sorted(self.batch_count):
+                for limit, count in zip(BATCH_BUCKETS, self.batch_buckets[source]):
+                    lines.append(f'vuon_import_batch_commit_seconds_bucket{{source="{source}",le="{limit}"}} {count}')
+                lines.append(f'vuon_import_batch_commit_seconds_bucket{{source="{source}",le="+Inf"}} '
+                             f'{self.batch_count[source]}')
+                lines.append(f'vuon_import_batch_commit_seconds_sum{{source="{source}"}} '
+                             f'{round(self.batch_sum[source], 6)}')
+                lines.append(f'vuon_import_batch_commit_seconds_count{{source="{source}"}} '
+                             f'{self.batch_count[source]}')
+
+            family('vuon_import_cycles_total', 'counter', 'Ciclos executados',
+                   [((('source', s),), n) for s, n in sorted(self.cycles.items())])
+            family('vuon_import_last_cycle_seconds', 'gauge', 'Duração do último ciclo',
+                   [((('source', s),), round(v, 3)) for s, v in sorted(self.last_cycle_seconds.items())])
+            family('vuon_import_last_cycle_timestamp_seconds', 'gauge', 'Fim do último ciclo (epoch)',
+                   [((('source', s),), round(v)) for s, v in sorted(self.last_cycle_timestamp.items())])
+
+        family('vuon_import_tunnel_reconnects_total', 'counter', 'Reconexões do túnel SSH',
+               [((), tunnel_reconnects())])
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+_log_lock = threading.Lock()
+_json_log = None
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def _get_json_log():
+    """Logger do arquivo JSON (criado na primeira pasta; None se METRICS_LOG estiver vazio)"""
+    global _json_log
+    if not METRICS_LOG:
+        return None
+    with _log_lock:
+        if _json_log is None:
+            os.makedirs(os.path.dirname(os.path.abspath(METRICS_LOG)), exist_ok=True)
+            handler = RotatingFileHandler(METRICS_LOG, maxBytes=METRICS_LOG_MAX_BYTES,
+                                          backupCount=METRICS_LOG_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger = logging.getLogger('vuon.metrics')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _json_log = logger
+        return _json_log
+
+
+def write_record(record):
+    """Grava uma linha no log JSON (falhas de disco não interrompem a importação)"""
+    try:
+        logger = _get_json_log()
+        if logger is not None:
+            logger.info(json.dumps(record, ensure_ascii=False, default=str))
+    except Exception as e:
+        log.warning(f"⚠️  Não foi possível gravar o log de métricas: {e}")
+
+
+def current_folder():
+    """Pasta sendo medida nesta thread (ou None)"""
+    return getattr(_local, 'folder', None)
+
+
+def bind_folder(folder_metrics):
+    """Passa a medir nesta thread a pasta de outra (thread de leitura do pipeline)"""
+    _local.folder = folder_metrics
+
+
+@contextmanager
+def track_cycle(source):
+    """Mede um ciclo de process_all_folders; as pastas medidas dentro dele entram nos totais"""
+    cycle_metrics = CycleMetrics(source)
+    previous = getattr(_local, 'cycle', None)
+    _local.cycle = cycle_metrics
+    try:
+        yield cycle_metrics
+    finally:
+        _local.cycle = previous
+        cycle_metrics.finish()
+        REGISTRY.record_cycle(cycle_metrics)
+        # Ciclos sem nenhuma pasta nova não vão para o log (seriam centenas por dia)
+        if cycle_metrics.counts[STATUS_SUCCESS] or cycle_metrics.counts[STATUS_ERROR]:
+            write_record(cycle_metrics.to_record())
+
+
+@contextmanager
+def track_folder(source, folder):
+    """Mede uma pasta; erros que escapam do bloco marcam a pasta como erro e são relançados"""
+    folder_metrics = FolderMetrics(source, folder)
+    previous = current_folder()
+    _local.folder = folder_metrics
+    try:
+        yield folder_metrics
+    except BaseException as e:
+        folder_metrics.fail(e)
+        raise
+    finally:
+        _local.folder = previous
+        folder_metrics.finish()
+        REGISTRY.record_folder(folder_metrics)
+        cycle_metrics = getattr(_local, 'cycle', None)
+        if cycle_metrics is not None:
+            cycle_metrics.folder_done(folder_metrics)
+        if folder_metrics.status != STATUS_SKIPPED:
+            write_record(folder_metrics.to_record())
+
+
+@contextmanager
+def stage(name):
+    """Soma a duração do bloco na etapa name da pasta corrente (ou do ciclo, fora de uma pasta)"""
+    target = current_folder() or getattr(_local, 'cycle', None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if target is not None:
+            target.add_stage(name, time.perf_counter() - start)
+
+
+def timed_iter(items, name):
+    """Itera items somando na etapa name o tempo de cada next() (ex.: leitura de um leitor em blocos)"""
+    iterator = iter(items)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def observe_batch(seconds):
+    """Registra a latência de um lote (insert + commit) da pasta corrente"""
+    folder_metrics = current_folder()
+    if folder_metrics is not None:
+        folder_metrics.observe_batch(seconds)
+        REGISTRY.observe_batch(folder_metrics.source, seconds)
+
+
+def add_bytes_read(path):
+    """Soma o tamanho do arquivo aos bytes lidos da pasta corrente"""
+    folder_metrics = current_folder()
+    if folder_metrics is not None:
+        try:
+            folder_metrics.bytes_read += os.path.getsize(path)
+        except OSError:
+            pass
+
+
+def skip_folder():
+    """Marca a pasta corrente como pulada (já importada)"""
+    folder_metrics = current_folder()
+    if folder_metrics is not None:
+        folder_metrics.skip()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=None):
+    """Sobe o endpoint /metrics em uma thread (uma vez por processo; os importadores compartilham)"""
+    global _server
+    port = METRICS_PORT if port is None else port
+    if port <= 0:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((METRICS_HOST, port), _MetricsHandler)
+            except OSError as e:
+                log.warning(f"⚠️  Endpoint de métricas indisponível em {METRICS_HOST}:{port} ({e})")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+            log.info(f"📈 Métricas em http://{METRICS_HOST}:{port}/metrics")
+        return _server
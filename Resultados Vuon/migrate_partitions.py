@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migra vuon_resultados, vuon_bordero_pagamento e vuon_novacoes para o particionamento mensal
+(ver partitions.py) sem tirar as tabelas do ar para leitura
+
+Para cada tabela ainda sem partições:
+1. cria uma cópia vazia (<tabela>_part) já particionada, sem PRIMARY KEY e com uk_chave_hash
+   incluindo a coluna de data
+2. copia as linhas em blocos de id (commit por bloco; os dashboards continuam lendo a tabela original)
+3. troca as tabelas com um único RENAME TABLE (atômico) e copia as linhas que chegaram durante a troca
+4. mantém a original como <tabela>_sem_particao, para conferência e para o benchmark
+   (python -m benchmarks.partition_queries); apague-a depois com DROP TABLE
+
+Pause os importadores durante a migração: linhas inseridas são recuperadas pelo id, mas
+alterações e remoções feitas na original durante a cópia não seriam levadas para a nova tabela.
+
+Uso:
+    python migrate_partitions.py                      # as três tabelas
+    python migrate_partitions.py vuon_resultados      # só uma
+"""
+
+import argparse
+import os
+import time
+from datetime import date
+
+from db_pool import close_pool, get_pool
+from partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    ensure_future_partitions,
+    list_partitions,
+    parse_month,
+    partition_clause,
+)
+
+# Intervalo de ids copiado por INSERT ... SELECT
+MIGRATION_CHUNK_ROWS = int(os.getenv('MIGRATION_CHUNK_ROWS', 50000))
+
+# Folga no AUTO_INCREMENT da nova tabela: ids novos não colidem com linhas copiadas depois da troca
+MIGRATION_ID_GAP = int(os.getenv('MIGRATION_ID_GAP', 100000))
+
+# Meses de histórico com partição própria (datas anteriores, inclusive datas inválidas como 1900, vão para p_antigo)
+MIGRATION_MAX_MONTHS = int(os.getenv('MIGRATION_MAX_MONTHS', 120))
+
+
+def table_exists(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """SELECT COUNT(*) AS total FROM information_schema.TABLES
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s""",
+            (table,)
+        )
+        return cursor.fetchone()['total'] > 0
+
+
+def index_names(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s""",
+            (table,)
+        )
+        return {row['INDEX_NAME'] for row in cursor.fetchall()}
+
+
+def copy_rows(connection, source, target, after_id, until_id, chunk_rows):
+    """Copia as linhas com after_id < id <= until_id em blocos; retorna a quantidade copiada"""
+    copied = 0
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        while after_id < until_id:
+            upper = min(after_id + chunk_rows, until_id)
+            copied += cursor.execute(
+                f"INSERT INTO {target} SELECT * FROM {source} WHERE id > %s AND id <= %s",
+                (after_id, upper)
+            )
+            connection.commit()
+            after_id = upper
+            elapsed = time.perf_counter() - start
+            print(f"    ↪ {copied:,} registros copiados (id até {upper:,}, {copied / max(elapsed, 0.001):,.0f} registros/s)")
+    return copied
+
+
+def max_id(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table}")
+        return int(cursor.fetchone()['max_id'])
+
+
+def migrate_table(connection, table, column, chunk_rows):
+    """Migra uma tabela para o particionamento mensal (nada a fazer se já for particionada)"""
+    print(f"\n🗂️  {table} (partição por {column})")
+
+    if list_partitions(connection, table):
+        created = ensure_future_partitions(connection, table)
+        print(f"  ✅ Já particionada ({created or 0} partição(ões) futura(s) criada(s))")
+        return
+
+    shadow = f'{table}_part'
+    old = f'{table}_sem_particao'
+    if table_exists(connection, old):
+        raise Exception(f"{old} já existe (migração anterior?) - confira e apague antes de migrar de novo")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({column}) AS primeira, COALESCE(MIN(id), 0) AS min_id FROM {table}")
+        row = cursor.fetchone()
+    first_month = None
+    if row['primeira']:
+        oldest = add_months(date.today().year, date.today().month, -MIGRATION_MAX_MONTHS)
+        first = max(parse_month(row['primeira']), oldest)
+        first_month = f'{first[0]:04d}-{first[1]:02d}'
+    after_id = int(row['min_id']) - 1 if row['min_id'] else 0
+
+    # 1. Cópia vazia, particionada
+    indexes = index_names(connection, table)
+    changes = []
+    if 'PRIMARY' in indexes:
+        changes.append("DROP PRIMARY KEY")
+    if 'idx_id' not in indexes:
+        changes.append("ADD INDEX idx_id (id)")
+    if 'uk_chave_hash' in indexes:
+        changes += ["DROP INDEX uk_chave_hash", f"ADD UNIQUE INDEX uk_chave_hash (chave_hash, {column})"]
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+        cursor.execute(f"CREATE TABLE {shadow} LIKE {table}")
+        if changes:
+            cursor.execute(f"ALTER TABLE {shadow} {', '.join(changes)}")
+        cursor.execute(f"ALTER TABLE {shadow} {partition_clause(column, first_month)}")
+    print(f"  📋 {shadow} criada (partições a partir de {first_month or 'PARTITION_FIRST_MONTH'})")
+
+    # 2. Cópia em blocos, enquanto a original continua disponível para leitura
+    copied = 0
+    while True:
+        until_id = max_id(connection, table)
+        if until_id <= after_id:
+            break
+        copied += copy_rows(connection, table, shadow, after_id, until_id, chunk_rows)
+        after_id = until_id
+
+    # 3. Troca atômica; ids novos começam depois da folga
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {shadow} AUTO_INCREMENT = {after_id + MIGRATION_ID_GAP}")
+        cursor.execute(f"RENAME TABLE {table} TO {old}, {shadow} TO {table}")
+    print(f"  🔁 Tabelas trocadas: {table} particionada, original mantida como {old}")
+
+    late = copy_rows(connection, old, table, after_id, max_id(connection, old), chunk_rows)
+    if late:
+        print(f"  ↪ {late:,} registros inseridos durante a troca também copiados")
+
+    print(f"  ✅ {copied + late:,} registros migrados - confira e depois execute: DROP TABLE {old}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migra as tabelas do VUON para partições mensais')
+    parser.add_argument('tables', nargs='*', default=list(PARTITIONED_TABLES),
+                        help=f"Tabelas a migrar (padrão: {', '.join(PARTITIONED_TABLES)})")
+    parser.add_argument('--chunk-rows', type=int, default=MIGRATION_CHUNK_ROWS,
+                        help='Intervalo de ids copiado por comando')
+    args = parser.parse_args()
+
+    unknown = [table for table in args.tables if table not in PARTITIONED_TABLES]
+    if unknown:
+        parser.error(f"tabela(s) sem particionamento definido: {', '.join(unknown)}")
+
+    print("⚠️  Pause os importadores antes de continuar (os dashboards podem seguir lendo normalmente)")
+    try:
+        with get_pool().connection() as connection:
+            for table in args.tables:
+                migrate_table(connection, table, PARTITIONED_TABLES[table], args.chunk_rows)
+    finally:
+        close_pool()
+
+
+if __name__ == '__main__':
+    main()
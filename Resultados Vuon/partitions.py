@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Particionamento mensal (RANGE COLUMNS) das tabelas grandes do VUON
+- vuon_resultados por data, vuon_bordero_pagamento por data_pagamento, vuon_novacoes por data_emissao
+- Uma partição por mês (pYYYYMM), mais p_antigo (antes de PARTITION_FIRST_MONTH, e NULL) e
+  p_futuro (MAXVALUE). As consultas dos dashboards, que filtram por faixa de data, leem só
+  as partições dos meses pedidos.
+- Os importadores criam os meses seguintes com antecedência (PARTITIONS_AHEAD), separando-os
+  de p_futuro enquanto ela ainda está vazia (operação instantânea).
+Toda chave única de uma tabela particionada precisa conter a coluna de partição, por isso
+essas tabelas não têm PRIMARY KEY: id tem um índice próprio (idx_id) e uk_chave_hash inclui a data.
+Tabelas já existentes, sem partições, são migradas pelo migrate_partitions.py.
+"""
+
+import os
+import re
+from datetime import date
+
+from vuon_logging import get_logger
+
+log = get_logger('particoes')
+
+# Meses criados à frente do mês atual
+PARTITIONS_AHEAD = int(os.getenv('PARTITIONS_AHEAD', 3))
+
+# Primeiro mês com partição própria em tabelas novas (YYYY-MM); padrão: janeiro do ano anterior
+PARTITION_FIRST_MONTH = os.getenv('PARTITION_FIRST_MONTH', f'{date.today().year - 1}-01')
+
+# Tabela -> coluna de partição
+PARTITIONED_TABLES = {
+    'vuon_resultados': 'data',
+    'vuon_bordero_pagamento': 'data_pagamento',
+    'vuon_novacoes': 'data_emissao',
+}
+
+MONTH_PARTITION = re.compile(r'^p(\d{4})(\d{2})$')
+
+# Tabelas sem partições já avisadas (o aviso sai uma vez por processo, não a cada ciclo)
+_warned_unpartitioned = set()
+
+
+def parse_month(value):
+    """'YYYY-MM' (ou data) -> (ano, mês)"""
+    if isinstance(value, date):
+        return value.year, value.month
+    year, month = str(value)[:7].split('-')
+    return int(year), int(month)
+
+
+def next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def add_months(year, month, count):
+    index = year * 12 + (month - 1) + count
+    return index // 12, index % 12 + 1
+
+
+def month_range(first, last):
+    """Meses (ano, mês) de first até last, inclusive"""
+    months = []
+    current = first
+    while current <= last:
+        months.append(current)
+        current = next_month(*current)
+    return months
+
+
+def month_partition_sql(year, month):
+    """Definição da partição de um mês (limite superior = dia 1 do mês seguinte)"""
+    upper = next_month(year, month)
+    return f"PARTITION p{year:04d}{month:02d} VALUES LESS THAN ('{upper[0]:04d}-{upper[1]:02d}-01')"
+
+
+def partition_clause(column, first_month=None, last_month=None):
+    """Cláusula PARTITION BY para CREATE/ALTER TABLE
+
+    Cria p_antigo (antes de first_month), uma partição por mês até last_month (padrão: mês
+    atual + PARTITIONS_AHEAD) e p_futuro.
+    """
+    first = parse_month(first_month or PARTITION_FIRST_MONTH)
+    last = parse_month(last_month) if last_month else add_months(date.today().year, date.today().month, PARTITIONS_AHEAD)
+    last = max(first, last)
+
+    partitions = [f"PARTITION p_antigo VALUES LESS THAN ('{first[0]:04d}-{first[1]:02d}-01')"]
+    partitions += [month_partition_sql(*month) for month in month_range(first, last)]
+    partitions.append("PARTITION p_futuro VALUES LESS THAN (MAXVALUE)")
+    return f"PARTITION BY RANGE COLUMNS({column}) (\n        " + ",\n        ".join(partitions) + "\n    )"
+
+
+def list_partitions(connection, table):
+    """Nomes das partições da tabela, em ordem (lista vazia se não for particionada)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """SELECT PARTITION_NAME
+               FROM information_schema.PARTITIONS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+               ORDER BY PARTITION_ORDINAL_POSITION""",
+            (table,)
+        )
+        return [row['PARTITION_NAME'] for row in cursor.fetchall()]
+
+
+def ensure_future_partitions(connection, table, ahead=None):
+    """Garante partições até o mês atual + ahead; retorna quantas foram criadas
+
+    Tabelas sem partições são ignoradas (retorna None); a migração é feita à parte.
+    """
+    ahead = PARTITIONS_AHEAD if ahead is None else ahead
+    partitions = list_partitions(connection, table)
+    if not partitions:
+        return None
+
+    months = sorted(
+        (int(match.group(1)), int(match.group(2)))
+        for match in (MONTH_PARTITION.match(name) for name in partitions) if match
+    )
+    if not months or 'p_futuro' not in partitions:
+        return 0
+
+    target = add_months(date.today().year, date.today().month, ahead)
+    missing = month_range(next_month(*months[-1]), target)
+    if not missing:
+        return 0
+
+    new_partitions = [month_partition_sql(*month) for month in missing]
+    new_partitions.append("PARTITION p_futuro VALUES LESS THAN (MAXVALUE)")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {table} REORGANIZE PARTITION p_futuro INTO (\n        "
+            + ",\n        ".join(new_partitions) + "\n    )"
+        )
+    return len(missing)
+
+
+def maintain_partitions(connection, table):
+    """Cria as partições dos próximos meses (chamada a cada ciclo do importador)"""
+    try:
+        created = ensure_future_partitions(connection, table)
+    except Exception as e:
+        log.warning(f"⚠️  Não foi possível criar partições futuras de {table}: {e}")
+        return
+
+    if created is None:
+        if table not in _warned_unpartitioned:
+            _warned_unpartitioned.add(table)
+            log.warning(f"⚠️  {table} ainda não é particionada - execute migrate_partitions.py")
+    elif created:
+        log.info(f"🗂️  {created} partição(ões) mensal(is) criada(s) em {table}")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline leitura/conversão -> gravação para os importadores do VUON
+Os blocos do arquivo são lidos e convertidos em uma thread produtora e entregues à gravação
+por uma fila limitada (PIPELINE_QUEUE_CHUNKS): enquanto o bloco N está a caminho do banco
+(esperando o túnel, sem segurar o GIL), o bloco N+1 já está sendo convertido.
+A fila limitada mantém a memória em poucos blocos; com PIPELINE_QUEUE_CHUNKS=0 tudo roda em
+sequência, na thread de quem chama (comportamento antigo), mas com a mesma medição de tempos.
+"""
+
+import os
+import queue
+import threading
+import time
+
+from metrics import bind_folder, current_folder
+
+# Blocos convertidos esperando a gravação (0 = sem pipeline)
+PIPELINE_QUEUE_CHUNKS = int(os.getenv('PIPELINE_QUEUE_CHUNKS', 2))
+
+# Fim da produção
+_DONE = object()
+
+
+class _Failure:
+    """Erro da thread produtora, relançado para quem consome"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class PipelineStats:
+    """Tempos de cada lado do pipeline
+
+    read_seconds/write_seconds: trabalho de leitura+conversão e de gravação.
+    write_wait_seconds: gravação parada esperando um bloco (leitura é o gargalo).
+    read_wait_seconds: leitura parada com a fila cheia (gravação é o gargalo).
+    """
+
+    def __init__(self):
+        self.chunks = 0
+        self.read_seconds = 0.0
+        self.write_seconds = 0.0
+        self.read_wait_seconds = 0.0
+        self.write_wait_seconds = 0.0
+
+    def bottleneck(self):
+        if self.chunks == 0:
+            return None
+        # O lado mais lento define o ritmo; o outro passa esse tempo esperando na fila
+        if self.write_seconds >= self.read_seconds:
+            return 'gravação'
+        return 'leitura/conversão'
+
+    def report(self):
+        text = (f"⏱️  {self.chunks} bloco(s): leitura/conversão {self.read_seconds:.1f}s, "
+                f"gravação {self.write_seconds:.1f}s | leitura esperando {self.read_wait_seconds:.1f}s, "
+                f"gravação esperando {self.write_wait_seconds:.1f}s")
+        bottleneck = self.bottleneck()
+        return f"{text} -> gargalo: {bottleneck}" if bottleneck else text
+
+
+def _close(iterator):
+    close = getattr(iterator, 'close', None)
+    if close is not None:
+        close()
+
+
+def _sequential(items, stats):
+    iterator = iter(items)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            stats.read_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            yield item
+            stats.write_seconds += time.perf_counter() - start
+            stats.chunks += 1
+    finally:
+        _close(iterator)
+
+
+def pipelined(items, stats=None, maxsize=None):
+    """Itera items (gerador de blocos) produzindo-os em uma thread, com fila de até maxsize blocos
+
+    O tempo que o consumidor passa com cada bloco (entre um next e outro) conta como gravação.
+    Erros da leitura são relançados no consumidor; se o consumidor parar antes do fim (erro na
+    gravação), a thread produtora é encerrada.
+    """
+    stats = stats if stats is not None else PipelineStats()
+    maxsize = PIPELINE_QUEUE_CHUNKS if maxsize is None else maxsize
+    if maxsize <= 0:
+        yield from _sequential(items, stats)
+        return
+
+    chunks = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    # Etapas de leitura/conversão medidas na thread produtora contam para a pasta de quem consome
+    folder_metrics = current_folder()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        bind_folder(folder_metrics)
+        iterator = iter(items)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.read_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                if not put(item):
+                    return
+                stats.read_wait_seconds += time.perf_counter() - start
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        finally:
+            _close(iterator)
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name='pipeline-leitura', daemon=True)
+    producer.start()
+    try:
+        while True:
+            start = time.perf_counter()
+            item = chunks.get()
+            stats.write_wait_seconds += time.perf_counter() - start
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+
+            start = time.perf_counter()
+            yield item
+            stats.write_seconds += time.perf_counter() - start
+            stats.chunks += 1
+    finally:
+        stop.set()
+        producer.join()
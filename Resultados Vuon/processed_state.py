@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estado das importações em memória para os importadores do VUON
+Carrega de uma vez (uma consulta por ciclo) as pastas já importadas com sucesso da tabela de
+controle, em vez de um SELECT por pasta, e é mantido em dia pelos mark_as_*
+Opcionalmente guarda também a impressão digital (tamanho, mtime, hash) do arquivo importado
+"""
+
+import threading
+
+from file_fingerprint import FileFingerprint
+
+
+class ProcessedFolders:
+    """Conjunto das pastas (YYYY-MM-DD) com status 'sucesso' na tabela de controle"""
+
+    def __init__(self, table, fingerprints=False):
+        self.table = table
+        self.fingerprints = fingerprints
+        self._folders = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, connection):
+        """Recarrega o conjunto com uma única consulta; retorna a quantidade de pastas"""
+        columns = 'data_pasta'
+        if self.fingerprints:
+            columns += ', tamanho_arquivo, mtime_arquivo, hash_arquivo'
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {columns} FROM {self.table} WHERE status = 'sucesso'")
+            folders = {}
+            for row in cursor.fetchall():
+                fingerprint = None
+                if self.fingerprints and row['hash_arquivo']:
+                    fingerprint = FileFingerprint(row['tamanho_arquivo'], row['mtime_arquivo'], row['hash_arquivo'])
+                folders[str(row['data_pasta'])] = fingerprint
+
+        with self._lock:
+            self._folders = folders
+        return len(folders)
+
+    def __contains__(self, data_pasta):
+        with self._lock:
+            return str(data_pasta) in self._folders
+
+    def __len__(self):
+        with self._lock:
+            return len(self._folders)
+
+    def fingerprint(self, data_pasta):
+        """Impressão digital do arquivo importado (None se a pasta não tiver uma gravada)"""
+        with self._lock:
+            return self._folders.get(str(data_pasta))
+
+    def add(self, data_pasta, fingerprint=None):
+        """Pasta marcada como sucesso"""
+        with self._lock:
+            self._folders[str(data_pasta)] = fingerprint
+
+    def discard(self, data_pasta):
+        """Pasta voltou para processando/erro"""
+        with self._lock:
+            self._folders.pop(str(data_pasta), None)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot de DDA por agente para a página Quartis (ver QUARTIS_SETUP.md)
+vuon_dda_agente_dia: DDA por dia e agente, com a mesma métrica do backend/models/quartisModel.js
+(CPF único por agente e dia, acao = 'DDA', agente diferente de '0'/vazio, CPF preenchido).
+Como cada (agente, CPF, dia) conta uma vez, somar os dias dá exatamente o total de qualquer
+período, com ou sem filtro de agentes fixos; o quartisModel.js lê essas poucas linhas e faz a
+divisão em quartis (que precisa da lista de agentes de cada quartil) sobre elas.
+O importador do VUON atualiza os dias que cada importação tocou. Para preencher o histórico:
+    python quartis_snapshot.py 2025-01-01 [2025-03-31]
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+
+from bloco_refresh import month_bounds, normalize_days
+from db_pool import close_pool, get_pool
+from vuon_logging import get_logger
+
+log = get_logger('quartis')
+
+CREATE_DDA_AGENTE_DIA_SQL = """
+CREATE TABLE IF NOT EXISTS vuon_dda_agente_dia (
+    data DATE NOT NULL,
+    agente VARCHAR(50) NOT NULL,
+    total_dda INT NOT NULL DEFAULT 0,
+    valor_total DECIMAL(15,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (data, agente),
+    INDEX idx_agente_data (agente, data)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Mesma métrica do quartisModel.js, agrupada por dia e agente
+INSERT_DDA_AGENTE_DIA_SQL = """
+INSERT INTO vuon_dda_agente_dia (data, agente, total_dda, valor_total)
+SELECT
+    t.dia,
+    t.agente,
+    COUNT(*) as total_dda,
+    COALESCE(SUM(t.valor_total), 0) as valor_total
+FROM (
+    SELECT
+        agente,
+        cpf_cnpj,
+        data as dia,
+        SUM(valor) as valor_total
+    FROM vuon_resultados
+    WHERE data IN ({days})
+        AND acao = 'DDA'
+        AND agente != '0'
+        AND agente IS NOT NULL
+        AND agente != ''
+        AND cpf_cnpj IS NOT NULL
+        AND cpf_cnpj <> ''
+    GROUP BY agente, cpf_cnpj, data
+) as t
+GROUP BY t.dia, t.agente
+"""
+
+
+def refresh_dda_agente_dia(connection, days):
+    """Recalcula vuon_dda_agente_dia para os dias informados (sem commit)"""
+    days = sorted(days)
+    placeholders = ', '.join(['%s'] * len(days))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM vuon_dda_agente_dia WHERE data IN ({placeholders})", days)
+        return cursor.execute(INSERT_DDA_AGENTE_DIA_SQL.format(days=placeholders), days)
+
+
+def refresh_dda_snapshot(connection, days):
+    """Atualiza vuon_dda_agente_dia para os dias que mudaram (um único commit)"""
+    days = normalize_days(days)
+    if not days:
+        return
+
+    start = datetime.now()
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_DDA_AGENTE_DIA_SQL)
+
+    try:
+        agent_days = refresh_dda_agente_dia(connection, days)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    elapsed = (datetime.now() - start).total_seconds()
+    log.info(f"📊 DDA por agente atualizado: {agent_days:,} agente(s)/dia, {len(days)} dia(s) em {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Preenche o snapshot de DDA por agente (página Quartis)')
+    parser.add_argument('inicio', type=date.fromisoformat, help='Primeiro dia (YYYY-MM-DD)')
+    parser.add_argument('fim', type=date.fromisoformat, nargs='?', default=date.today(),
+                        help='Último dia (YYYY-MM-DD, padrão: hoje)')
+    args = parser.parse_args()
+
+    if args.fim < args.inicio:
+        parser.error('fim anterior ao início')
+
+    try:
+        with get_pool().connection() as connection:
+            # Um mês por transação
+            current = args.inicio
+            while current <= args.fim:
+                _, next_first = month_bounds(current.year, current.month)
+                last = min(args.fim, next_first - timedelta(days=1))
+                print(f"📅 {current.strftime('%m/%Y')}")
+                refresh_dda_snapshot(connection, [current + timedelta(days=i) for i in range((last - current).days + 1)])
+                current = next_first
+    finally:
+        close_pool()
+
+
+if __name__ == '__main__':
+    main()
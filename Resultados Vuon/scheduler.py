@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agendador dos importadores do VUON (usado por main_automated.py)
+- Uma thread por fonte: varredura completa a cada intervalo da fonte e, entre uma varredura e
+  outra, as pastas avisadas pelo observador (folder_watcher.py)
+- Importações pesadas limitadas a SCHEDULER_MAX_HEAVY ao mesmo tempo; quem espera uma vaga é
+  atendido pela prioridade da fonte (menor número primeiro, empate por ordem de chegada)
+- Fonte que cai (erro fora das pastas: banco fora do ar, caminho inacessível...) é reiniciada
+  depois de RESTART_BACKOFF_BASE segundos, dobrando a cada queda seguida até RESTART_BACKOFF_MAX
+- Ctrl+C / SIGTERM (Ctrl+Break no Windows): cada fonte termina a pasta em andamento e para;
+  um segundo sinal encerra sem esperar
+"""
+
+import heapq
+import itertools
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+from db_pool import get_pool
+from vuon_logging import get_logger
+
+log = get_logger('agendador')
+
+SCHEDULER_MAX_HEAVY = int(os.getenv('SCHEDULER_MAX_HEAVY', 1))  # Importações pesadas ao mesmo tempo
+RESTART_BACKOFF_BASE = float(os.getenv('RESTART_BACKOFF_BASE', 10))  # Espera antes do 1º reinício (s)
+RESTART_BACKOFF_MAX = float(os.getenv('RESTART_BACKOFF_MAX', 600))  # Espera máxima antes de reiniciar (s)
+WORKER_STABLE_SECONDS = float(os.getenv('WORKER_STABLE_SECONDS', 1800))  # Rodando esse tempo, a espera volta ao início
+SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', 120))  # Espera pelas pastas em andamento ao encerrar (s)
+
+# Intervalo máximo entre verificações do pedido de encerramento (s); esperas mais longas são
+# feitas em fatias, já que no Windows o Ctrl+C não interrompe Event.wait/Thread.join
+STOP_POLL_SECONDS = 1.0
+
+
+def restart_delay(crashes):
+    """Espera antes de reiniciar uma fonte após crashes quedas seguidas"""
+    return min(RESTART_BACKOFF_BASE * 2 ** (crashes - 1), RESTART_BACKOFF_MAX)
+
+
+class PrioritySlots:
+    """Vagas limitadas, entregues pela prioridade de quem espera (menor número primeiro)"""
+
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self._condition = threading.Condition()
+        self._in_use = 0
+        self._waiting = []  # heap de (prioridade, ordem de chegada)
+        self._arrivals = itertools.count()
+
+    def acquire(self, priority, stop):
+        """Espera uma vaga; devolve False se o encerramento foi pedido antes de conseguir"""
+        ticket = (priority, next(self._arrivals))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while self._in_use >= self.limit or self._waiting[0] != ticket:
+                    if stop.is_set():
+                        return False
+                    self._condition.wait(STOP_POLL_SECONDS)
+                self._in_use += 1
+                return True
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify_all()
+
+
+class SourceJob:
+    """Fonte agendada: importador (importer_engine.Importer), intervalo da varredura completa,
+    prioridade (menor número primeiro) e se a importação é pesada (ocupa uma vaga de SCHEDULER_MAX_HEAVY)"""
+
+    def __init__(self, importer, interval, priority, heavy=False):
+        self.importer = importer
+        self.name = importer.spec.name
+        self.interval = interval
+        self.priority = priority
+        self.heavy = heavy
+
+
+class Worker:
+    """Thread de uma fonte; quando cai, o Scheduler cria outra"""
+
+    def __init__(self, job, slots, stop):
+        self.job = job
+        self.slots = slots
+        self.stop = stop
+        self.thread = None
+        self.error = None
+        self.started_at = None
+        self.crashes = 0  # quedas seguidas (espera antes de reiniciar)
+        self.restart_at = None
+
+    def start(self):
+        self.error = None
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name=f'importador-{self.job.name}', daemon=True)
+        self.thread.start()
+
+    def is_alive(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self):
+        try:
+            self.run()
+        except Exception as e:
+            self.error = e
+            self.job.importer.log.exception(f"❌ Importador parou: {str(e)}")
+
+    def _import(self, folders=None):
+        """Um ciclo da fonte (varredura completa ou pastas avisadas), na vaga de importação pesada"""
+        job = self.job
+        if job.heavy and not self.slots.acquire(job.priority, self.stop):
+            return
+        try:
+            with get_pool().connection() as connection:
+                job.importer.run_cycle(connection, folders, self.stop)
+        finally:
+            if job.heavy:
+                self.slots.release()
+
+    def run(self):
+        """Tabelas, observador e ciclos até o encerramento (erros fora das pastas derrubam a thread)"""
+        job = self.job
+        importer = job.importer
+        with get_pool().connection() as connection:
+            importer.create_tables(connection)
+
+        watcher = importer.start_watcher()
+        cycle = 0
+        try:
+            while not self.stop.is_set():
+                cycle += 1
+                importer.log.info(f"🔄 Ciclo #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                self._import()
+
+                # Até a próxima varredura completa, processar as pastas avisadas pelo observador
+                if not self.stop.is_set():
+                    importer.log.info(f"⏳ Próxima varredura completa em {job.interval} segundos (aguardando arquivos novos)...")
+                next_scan = time.monotonic() + job.interval
+                while not self.stop.is_set():
+                    remaining = next_scan - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ready = watcher.wait_for_ready(min(remaining, STOP_POLL_SECONDS))
+                    if ready:
+                        importer.log.info(f"📥 Arquivo(s) pronto(s) em: {', '.join(ready)}")
+                        self._import(ready)
+        finally:
+            watcher.stop()
+
+
+class Scheduler:
+    """Executa as fontes, reinicia as que caem e encerra todas ao receber Ctrl+C/SIGTERM"""
+
+    def __init__(self, jobs, max_heavy=SCHEDULER_MAX_HEAVY):
+        self.stop = threading.Event()
+        self.slots = PrioritySlots(max_heavy)
+        self.workers = [Worker(job, self.slots, self.stop) for job in sorted(jobs, key=lambda job: job.priority)]
+        self._signals = 0
+
+    def _on_signal(self, signum, frame):
+        self._signals += 1
+        if self._signals > 1:
+            raise KeyboardInterrupt
+        log.warning(f"⚠️  {signal.Signals(signum).name} recebido - terminando as pastas em andamento "
+                    f"(repita para encerrar sem esperar)")
+        self.stop.set()
+
+    def install_signal_handlers(self):
+        """Ctrl+C, SIGTERM e Ctrl+Break (Windows) pedem o encerramento (só na thread principal)"""
+        for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                signal.signal(signum, self._on_signal)
+
+    def _supervise(self):
+        """Reinicia as fontes paradas, esperando restart_delay() a cada queda seguida"""
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.is_alive():
+                continue
+
+            if worker.restart_at is None:
+                if now - worker.started_at >= WORKER_STABLE_SECONDS:
+                    worker.crashes = 0
+                worker.crashes += 1
+                delay = restart_delay(worker.crashes)
+                worker.restart_at = now + delay
+                log.warning(f"🔁 {worker.job.name} parou ({worker.error or 'sem erro'}) - reiniciando em "
+                            f"{delay:.0f}s (queda #{worker.crashes})",
+                            fonte=worker.job.name, quedas=worker.crashes)
+            elif now >= worker.restart_at:
+                worker.restart_at = None
+                log.info(f"🔄 Reiniciando {worker.job.name}", fonte=worker.job.name)
+                worker.start()
+
+    def _wait_workers(self):
+        """Espera até SHUTDOWN_TIMEOUT pelas fontes ainda importando"""
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        for worker in self.workers:
+            while worker.is_alive() and time.monotonic() < deadline:
+                worker.thread.join(STOP_POLL_SECONDS)
+
+    def report(self):
+        log.info("📊 Status final das fontes:")
+        for worker in self.workers:
+            status = "⏳ Ainda importando (pasta fica como 'processando')" if worker.is_alive() else "✅ Encerrada"
+            log.info(f"- {worker.job.name}: {status}")
+
+    def run(self):
+        """Inicia as fontes e supervisiona até o encerramento"""
+        self.install_signal_handlers()
+        for worker in self.workers:
+            job = worker.job
+            log.info(f"🚀 {job.name}: varredura a cada {job.interval}s, prioridade {job.priority}"
+                     f"{', pesada' if job.heavy else ''}",
+                     fonte=job.name, intervalo=job.interval, prioridade=job.priority, pesada=job.heavy)
+            worker.start()
+
+        try:
+            while not self.stop.wait(STOP_POLL_SECONDS):
+                self._supervise()
+
+            log.info("🛑 Encerrando as fontes...")
+            self._wait_workers()
+        except KeyboardInterrupt:
+            self.stop.set()
+            log.warning("⚠️  Encerramento forçado")
+        self.report()
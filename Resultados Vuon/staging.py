@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carga atômica por pasta para os importadores do VUON
+Com LOAD_STRATEGY='staging' (padrão) os lotes de uma pasta são gravados em uma tabela de
+staging (cópia da estrutura da tabela final) e publicados em um único INSERT ... SELECT,
+confirmado com um só commit: os dashboards nunca enxergam um dia carregado pela metade.
+Se a carga falhar, a tabela de staging é descartada e nada chega à tabela final.
+Com LOAD_STRATEGY='direct' os lotes vão direto para a tabela final (comportamento antigo).
+"""
+
+import re
+from contextlib import contextmanager
+
+from upsert import apply_upsert
+from vuon_logging import get_logger
+
+log = get_logger('staging')
+
+# Estratégias aceitas em LOAD_STRATEGY
+STRATEGY_STAGING = 'staging'
+STRATEGY_DIRECT = 'direct'
+
+
+def get_load_strategy(value):
+    """Normaliza o valor de LOAD_STRATEGY, voltando para staging se for desconhecido"""
+    strategy = (value or STRATEGY_STAGING).strip().lower()
+    if strategy not in (STRATEGY_STAGING, STRATEGY_DIRECT):
+        log.warning(f"⚠️  LOAD_STRATEGY '{value}' desconhecido - usando {STRATEGY_STAGING}")
+        return STRATEGY_STAGING
+    return strategy
+
+
+def staging_name(table, suffix):
+    """Nome da tabela de staging de uma pasta (ex.: vuon_resultados_stg_20250102)"""
+    return f"{table}_stg_{re.sub(r'[^0-9A-Za-z_]', '', str(suffix))}"
+
+
+def drop_staging(connection, staging):
+    """Remove a tabela de staging (ignora se ela não existir)"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+
+
+@contextmanager
+def staging_table(connection, table, suffix):
+    """Cria uma tabela de staging vazia com a estrutura de table e a remove ao sair do bloco
+
+    Uma staging esquecida por uma execução interrompida é recriada do zero. O DDL faz
+    commit implícito no MariaDB, por isso criação e remoção ficam fora da publicação.
+    """
+    staging = staging_name(table, suffix)
+    drop_staging(connection, staging)
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {staging} LIKE {table}")
+    try:
+        yield staging
+    finally:
+        try:
+            connection.rollback()
+            drop_staging(connection, staging)
+        except Exception as e:
+            log.warning(f"⚠️  Não foi possível remover a tabela de staging {staging}: {e}")
+
+
+def publish_staging(connection, staging, table, columns, upsert_mode):
+    """Copia a staging para a tabela final em um único INSERT ... SELECT (sem commit)
+
+    Retorna as linhas afetadas. O commit fica com quem chama, para que outras alterações
+    da mesma pasta (ex.: remoção de linhas) fiquem visíveis junto com as novas.
+    """
+    column_list = ', '.join(columns)
+    insert_sql = apply_upsert(
+        f"INSERT INTO {table} ({column_list})\n    SELECT {column_list} FROM {staging}",
+        columns, upsert_mode
+    )
+    with connection.cursor() as cursor:
+        return cursor.execute(insert_sql)
+
+
+@contextmanager
+def load_target(connection, table, suffix, strategy):
+    """Tabela que recebe os lotes da pasta: a staging (LOAD_STRATEGY=staging) ou a própria table
+
+    Em caso de erro a transação aberta é desfeita antes de sair do bloco, nos dois modos.
+    """
+    try:
+        if strategy == STRATEGY_STAGING:
+            with staging_table(connection, table, suffix) as staging:
+                yield staging
+        else:
+            yield table
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração dos testes (a partir da pasta 'Resultados Vuon': python -m pytest tests)
+
+Os importadores validam as variáveis SSH/DB ao serem importados; aqui elas recebem valores de
+teste (nenhum teste abre conexão - as funções testadas não dependem do banco).
+"""
+
+import os
+import sys
+
+IMPORTERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if IMPORTERS_DIR not in sys.path:
+    sys.path.insert(0, IMPORTERS_DIR)
+
+for var in ('SSH_HOST', 'SSH_USER', 'SSH_PASSWORD', 'DB_NAME', 'DB_USER', 'DB_PASSWORD'):
+    os.environ.setdefault(var, 'teste')
+
+# Sem endpoint /metrics nem arquivo de métricas durante os testes
+os.environ.setdefault('METRICS_PORT', '0')
+os.environ.setdefault('METRICS_LOG', '')
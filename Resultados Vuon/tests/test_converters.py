@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Conversores vetorizados (converters.py) contra os conversores célula a célula originais"""
+
+import random
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from converters import convert_date_column, convert_datetime_column
+
+DATETIME_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+
+def scalar_datetime(value):
+    """convert_datetime original (import_novacoes_automated.py)"""
+    if pd.isna(value) or value == '' or value == '-':
+        return None
+    try:
+        return datetime.strptime(str(value), DATETIME_FORMAT)
+    except (ValueError, AttributeError):
+        return None
+
+
+def scalar_date(value):
+    """convert_date original"""
+    if pd.isna(value) or value == '' or value == '-':
+        return None
+    try:
+        return datetime.strptime(str(value), '%d/%m/%Y').date()
+    except (ValueError, AttributeError):
+        return None
+
+
+def test_datetime_rejects_leap_seconds():
+    values = pd.Series(['02/06/2025 13:58:60', '02/06/2025 13:58:61', '31/12/2025 23:59:60',
+                        '02/06/2025 13:58:59', '02/06/2025 10:60:00', '-', '', None])
+    result = convert_datetime_column(values)
+
+    assert result.tolist() == [None, None, None, datetime(2025, 6, 2, 13, 58, 59), None, None, None, None]
+
+
+def test_datetime_matches_strptime():
+    rng = random.Random(7)
+    values = []
+    for _ in range(5000):
+        values.append(f'{rng.randint(0, 32):02d}/{rng.randint(0, 13):02d}/{rng.randint(1999, 2030)} '
+                      f'{rng.randint(0, 24):02d}:{rng.randint(0, 60):02d}:{rng.randint(0, 62):0{rng.choice([1, 2])}d}')
+    values += ['2/6/2025 1:2:3', '02/06/2025  10:09:02', ' 02/06/2025 10:09:02', '02/06/2025 10:09', '-', '', None]
+    series = pd.Series(values, dtype=object)
+
+    result = convert_datetime_column(series)
+
+    assert result.tolist() == [scalar_datetime(value) for value in values]
+    assert all(isinstance(value, datetime) or value is None for value in result)
+
+
+def test_datetime_without_future_warning():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        result = convert_datetime_column(pd.Series(['02/06/2025 10:09:02', '-']))
+
+    assert result.tolist() == [datetime(2025, 6, 2, 10, 9, 2), None]
+    assert type(result[0]) is datetime
+
+
+def test_date_matches_strptime():
+    values = ['29/02/2024', '29/02/2025', '1/5/2025', '31/04/2025', '01/05/25', ' 01/05/2025', '-', '', np.nan]
+    result = convert_date_column(pd.Series(values, dtype=object))
+
+    assert result.tolist() == [scalar_date(value) for value in values]
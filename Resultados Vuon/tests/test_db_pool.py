@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Pool de conexões (db_pool.ConnectionPool) com conexões falsas, sem túnel nem banco"""
+
+from db_pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if self.closed:
+            raise ConnectionError('conexão fechada')
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def fake_pool(max_size=2):
+    pool = ConnectionPool(tunnel=None, max_size=max_size, timeout=1)
+    pool._connect = FakeConnection
+    return pool
+
+
+def test_released_connection_is_reused():
+    pool = fake_pool()
+    connection = pool.acquire()
+    pool.release(connection)
+
+    assert pool.acquire() is connection
+    assert connection.rollbacks == 1
+    assert pool._size == 1
+
+
+def test_close_closes_idle_connections():
+    pool = fake_pool()
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+
+    assert first.closed and second.closed
+    assert pool._idle == []
+    assert pool._size == 0
+
+
+def test_connection_returned_after_close_is_closed():
+    # Fonte ainda importando quando close_pool() roda no encerramento
+    pool = fake_pool()
+    idle, borrowed = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+
+    assert not borrowed.closed
+    with pool.connection():
+        pass  # nova conexão emprestada depois do close também não volta ao pool
+    pool.release(borrowed)
+
+    assert borrowed.closed
+    assert pool._idle == []
+    assert pool._size == 0
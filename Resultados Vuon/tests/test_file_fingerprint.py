@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Impressão digital de arquivos e hashes de linhas (file_fingerprint.py)"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+from file_fingerprint import (
+    FileFingerprint,
+    fingerprint_file,
+    hash_file,
+    row_hashes,
+    same_stat,
+    stat_file,
+)
+
+
+def test_hash_file_matches_sha256_for_any_block_size(tmp_path):
+    content = os.urandom(10_000)
+    path = tmp_path / 'arquivo.csv'
+    path.write_bytes(content)
+    expected = hashlib.sha256(content).hexdigest()
+
+    for chunk_bytes in (1, 7, 4096, 1024 * 1024):
+        assert hash_file(path, chunk_bytes) == expected
+
+
+def test_fingerprint_file(tmp_path):
+    path = tmp_path / 'arquivo.csv'
+    path.write_bytes(b'a;b\n1;2\n')
+
+    stat = stat_file(path)
+    assert stat == FileFingerprint(8, os.stat(path).st_mtime, None)
+    assert fingerprint_file(path) == stat._replace(hash=hashlib.sha256(b'a;b\n1;2\n').hexdigest())
+
+
+def test_same_stat():
+    current = FileFingerprint(100, 1717200000.1234, None)
+
+    assert same_stat(FileFingerprint(100, 1717200000.1234, 'abc'), current)
+    # Banco devolve Decimal/texto e mtime arredondado pelo compartilhamento
+    assert same_stat(FileFingerprint('100', '1717200000.1238', 'abc'), current)
+    assert not same_stat(FileFingerprint(100, 1717200000.126, 'abc'), current)
+    assert not same_stat(FileFingerprint(101, 1717200000.1234, 'abc'), current)
+    assert not same_stat(FileFingerprint(None, None, 'abc'), current)
+    assert not same_stat(None, current)
+
+
+def test_row_hashes_depend_only_on_values():
+    df = pd.DataFrame({'a': [1, 2, 1], 'b': ['x', 'y', 'x'], 'extra': [0, 1, 2]}, index=[10, 20, 30])
+    hashes = row_hashes(df, ['a', 'b'])
+
+    assert hashes.dtype == 'uint64'
+    assert list(hashes.index) == [10, 20, 30]
+    # Linhas iguais nas colunas informadas têm o mesmo hash, em qualquer posição/índice
+    assert hashes[10] == hashes[30] != hashes[20]
+    moved = df.iloc[::-1].reset_index(drop=True)
+    assert sorted(row_hashes(moved, ['a', 'b'])) == sorted(hashes)
+
+
+def test_row_hashes_empty():
+    df = pd.DataFrame({'a': [], 'b': []})
+    hashes = row_hashes(df, ['a', 'b'])
+
+    assert hashes.empty
+    assert hashes.dtype == 'uint64'
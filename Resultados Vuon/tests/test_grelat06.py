@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""segment_agent_blocks (grelat06.py) contra a varredura aninhada original do importador"""
+
+import random
+
+import pytest
+
+from grelat06 import classify_totalization_rows, extract_agent_info, segment_agent_blocks
+
+HEADER = ['Nome', 'CPF / CNPJ', 'Credor', 'Valor Recebido']
+
+
+def nested_scan_blocks(rows):
+    """Varredura original (uma nova busca para frente por agente), com as mesmas posições derivadas"""
+    row_count = len(rows)
+    blocks = []
+    for row in range(1, row_count + 1):
+        first_cell = rows[row - 1][0] if rows[row - 1] else None
+        if not first_cell:
+            continue
+        agent_id, agent_name = extract_agent_info(first_cell)
+        if not (agent_id and agent_name):
+            continue
+
+        next_agent_row = row_count + 1
+        for next_row in range(row + 1, row_count + 1):
+            next_cell = rows[next_row - 1][0] if rows[next_row - 1] else None
+            if next_cell:
+                next_id, _ = extract_agent_info(next_cell)
+                if next_id:
+                    next_agent_row = next_row
+                    break
+
+        blocks.append({
+            'row': row,
+            'id': agent_id,
+            'name': agent_name,
+            'header_row': row + 1 if row + 1 <= row_count else None,
+            'data_start': row + 2,
+            'data_end': next_agent_row - 1,
+            'next_row': next_agent_row,
+        })
+    return blocks
+
+
+def synthetic_sheet(agents, seed):
+    """Planilha grelat06 com blocos vazios, linhas de totalização, IDs sem nome e último agente sem dados"""
+    rng = random.Random(seed)
+    blank = [None] * (len(HEADER) - 1)
+    rows = [['Relatório GRELAT06'] + blank, [None] * len(HEADER)]
+    for agent in range(1, agents + 1):
+        kind = rng.random()
+        rows.append([f'Agente {agent} - COBRADOR {agent}'] + blank)
+        if kind < 0.05:
+            continue  # agente sem cabeçalho nem dados: o próximo agente vem logo em seguida
+        rows.append(list(HEADER))
+        if kind < 0.15:
+            continue  # bloco vazio (só cabeçalho)
+        for line in range(rng.randint(1, 8)):
+            rows.append([f'CLIENTE {agent}-{line}', '123.456.789-00', 'VUONC', rng.randint(1, 99999) / 100])
+            if rng.random() < 0.1:
+                rows.append([None] * len(HEADER))  # linha em branco no meio do bloco
+        rows.append(['- Soma'] + blank)
+        rows.append(['- Contagem'] + blank)
+        if kind > 0.97:
+            rows.append([f'Agente {agent}00'] + blank)  # ID sem nome: fecha o bloco sem abrir outro
+            rows.append(['LINHA SOLTA'] + blank)
+    rows.append(['Total Geral - Soma'] + blank)
+    # Último agente sem dados nem cabeçalho, na última linha da planilha
+    rows.append([f'Agente {agents + 1} - ULTIMO'] + blank)
+    return rows
+
+
+@pytest.mark.parametrize('agents, seed', [(2000, 1), (5000, 2), (10000, 3)])
+def test_blocks_match_nested_scan(agents, seed):
+    rows = synthetic_sheet(agents, seed)
+    blocks = segment_agent_blocks(rows)
+
+    assert len(blocks) == agents + 1
+    assert blocks == nested_scan_blocks(rows)
+
+
+def test_trailing_agent_without_data():
+    rows = synthetic_sheet(10, 4)
+    last = segment_agent_blocks(rows)[-1]
+
+    assert last['name'] == 'ULTIMO'
+    assert last['header_row'] is None
+    assert last['data_start'] > last['data_end']
+    assert last['next_row'] == len(rows) + 1
+
+
+def test_empty_blocks_have_empty_data_range():
+    rows = [
+        ['Agente 1 - A', None],
+        ['Agente 2 - B', None],
+        HEADER[:2],
+        ['Agente 3 - C', None],
+        HEADER[:2],
+        ['CLIENTE', '1'],
+    ]
+    blocks = segment_agent_blocks(rows)
+
+    assert [(b['row'], b['header_row'], b['data_start'], b['data_end']) for b in blocks] == [
+        (1, 2, 3, 1),
+        (2, 3, 4, 3),
+        (4, 5, 6, 6),
+    ]
+    assert blocks == nested_scan_blocks(rows)
+
+
+def test_sheet_without_agents():
+    assert segment_agent_blocks([]) == []
+    assert segment_agent_blocks([['Total Geral - Soma'], [None]]) == []
+
+
+def test_totalization_rows_are_classified():
+    values = ['- Soma', '- Contagem', 'Total Geral - Soma', 'Total Agente', 'CLIENTE', None, '', 'Totalizador']
+    mask, counts = classify_totalization_rows(values)
+
+    assert mask.tolist() == [True, True, True, True, False, False, False, False]
+    assert sum(counts.values()) == 4
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Pipeline leitura/conversão -> gravação (pipeline.py): ordem, erros e encerramento"""
+
+import threading
+
+import pytest
+
+from pipeline import PipelineStats, pipelined
+
+
+class ReaderError(Exception):
+    pass
+
+
+class Reader:
+    """Gerador de blocos que registra o fechamento e pode falhar no bloco fail_at"""
+
+    def __init__(self, count, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.produced = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            for chunk in range(self.count):
+                if chunk == self.fail_at:
+                    raise ReaderError(f'bloco {chunk} inválido')
+                self.produced += 1
+                yield chunk
+        finally:
+            self.closed.set()
+
+
+@pytest.mark.parametrize('maxsize', [0, 1, 2])
+def test_yields_all_chunks_in_order(maxsize):
+    reader = Reader(20)
+    stats = PipelineStats()
+
+    assert list(pipelined(iter(reader), stats, maxsize)) == list(range(20))
+    assert stats.chunks == 20
+    assert stats.bottleneck() is not None
+    assert reader.closed.is_set()
+
+
+@pytest.mark.parametrize('maxsize', [0, 2])
+def test_reader_error_reaches_consumer_after_previous_chunks(maxsize):
+    reader = Reader(10, fail_at=3)
+    received = []
+
+    with pytest.raises(ReaderError, match='bloco 3'):
+        for chunk in pipelined(iter(reader), maxsize=maxsize):
+            received.append(chunk)
+
+    assert received == [0, 1, 2]
+    assert reader.closed.is_set()
+
+
+@pytest.mark.parametrize('maxsize', [0, 2])
+def test_writer_error_stops_reader(maxsize):
+    reader = Reader(1000)
+    chunks = pipelined(iter(reader), maxsize=maxsize)
+
+    with pytest.raises(RuntimeError):
+        for chunk in chunks:
+            if chunk == 1:
+                raise RuntimeError('falha na gravação')
+    chunks.close()
+
+    assert reader.closed.wait(5)
+    # Produtora parou com a fila cheia, sem ler o arquivo até o fim
+    assert reader.produced < 1000
+    assert not any(thread.name == 'pipeline-leitura' for thread in threading.enumerate())
+
+
+def test_empty_source():
+    stats = PipelineStats()
+
+    assert list(pipelined(iter([]), stats, 2)) == []
+    assert stats.chunks == 0
+    assert stats.bottleneck() is None
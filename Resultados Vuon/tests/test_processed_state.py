@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Estado das pastas importadas (processed_state.py) com uma conexão falsa"""
+
+from datetime import date
+
+from file_fingerprint import FileFingerprint
+from processed_state import ProcessedFolders
+
+
+class FakeCursor:
+    def __init__(self, rows, queries):
+        self.rows = rows
+        self.queries = queries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.queries.append(' '.join(sql.split()))
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Devolve as linhas informadas para qualquer SELECT e guarda as consultas"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self.rows, self.queries)
+
+
+def test_refresh_loads_success_folders_in_one_query():
+    connection = FakeConnection([{'data_pasta': date(2025, 6, 1)}, {'data_pasta': '2025-06-02'}])
+    folders = ProcessedFolders('vuon_importacoes')
+
+    assert folders.refresh(connection) == 2
+    assert connection.queries == ["SELECT data_pasta FROM vuon_importacoes WHERE status = 'sucesso'"]
+    # date e texto caem na mesma chave YYYY-MM-DD
+    assert date(2025, 6, 1) in folders
+    assert '2025-06-02' in folders
+    assert '2025-06-03' not in folders
+    assert folders.fingerprint('2025-06-01') is None
+
+
+def test_refresh_replaces_previous_state():
+    folders = ProcessedFolders('vuon_importacoes')
+    folders.add('2025-05-31')
+    folders.refresh(FakeConnection([{'data_pasta': '2025-06-01'}]))
+
+    assert '2025-05-31' not in folders
+    assert len(folders) == 1
+
+
+def test_refresh_with_fingerprints():
+    rows = [
+        {'data_pasta': '2025-06-01', 'tamanho_arquivo': 10, 'mtime_arquivo': 1.5, 'hash_arquivo': 'abc'},
+        {'data_pasta': '2025-06-02', 'tamanho_arquivo': None, 'mtime_arquivo': None, 'hash_arquivo': None},
+    ]
+    connection = FakeConnection(rows)
+    folders = ProcessedFolders('vuon_importacoes', fingerprints=True)
+    folders.refresh(connection)
+
+    assert 'tamanho_arquivo, mtime_arquivo, hash_arquivo' in connection.queries[0]
+    assert folders.fingerprint('2025-06-01') == FileFingerprint(10, 1.5, 'abc')
+    # Pasta importada antes das impressões digitais: sucesso, mas sem impressão
+    assert '2025-06-02' in folders
+    assert folders.fingerprint('2025-06-02') is None
+
+
+def test_add_and_discard():
+    folders = ProcessedFolders('vuon_importacoes')
+    fingerprint = FileFingerprint(10, 1.5, 'abc')
+    folders.add(date(2025, 6, 1), fingerprint)
+
+    assert '2025-06-01' in folders
+    assert folders.fingerprint('2025-06-01') == fingerprint
+
+    folders.discard('2025-06-01')
+    folders.discard('2025-06-09')  # pasta desconhecida: nada acontece
+    assert '2025-06-01' not in folders
+    assert len(folders) == 0
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Diferença de linhas de uma nova entrega do arquivo (importer_engine.Importer.select_new_rows)"""
+
+import random
+from collections import Counter
+
+import pandas as pd
+
+from importer_engine import Importer
+
+
+def chunk(hashes, start=0):
+    return pd.DataFrame({'linha_hash': hashes, 'valor': range(start, start + len(hashes))},
+                        index=range(start, start + len(hashes)))
+
+
+def test_only_rows_missing_from_database_are_kept():
+    existing = Counter({1: 1, 2: 1})
+    new = Importer.select_new_rows(chunk([1, 3, 2, 4]), existing)
+
+    assert new['linha_hash'].tolist() == [3, 4]
+    assert new['valor'].tolist() == [1, 3]
+    assert +existing == Counter()
+
+
+def test_duplicate_rows_are_counted_as_a_multiset():
+    # Linhas idênticas no arquivo (mesmo hash) são registros distintos: 2 no banco, 3 no arquivo
+    existing = Counter({7: 2})
+    new = Importer.select_new_rows(chunk([7, 7, 7]), existing)
+
+    assert new['linha_hash'].tolist() == [7]
+    assert existing[7] == 0
+
+
+def test_leftover_counter_holds_removed_rows_across_chunks():
+    existing = Counter({1: 1, 2: 2, 5: 1})
+    first = Importer.select_new_rows(chunk([2, 6]), existing)
+    second = Importer.select_new_rows(chunk([1, 6], start=2), existing)
+
+    assert first['linha_hash'].tolist() == [6]
+    assert second['linha_hash'].tolist() == [6]
+    # Sobram as linhas que saíram do arquivo: uma cópia do hash 2 e o hash 5
+    assert +existing == Counter({2: 1, 5: 1})
+
+
+def test_result_is_a_copy_with_original_index():
+    df = chunk([1, 2, 3], start=10)
+    new = Importer.select_new_rows(df, Counter({2: 1}))
+
+    assert list(new.index) == [10, 12]
+    new['valor'] = -1
+    assert df['valor'].tolist() == [10, 11, 12]
+
+
+def test_empty_chunk():
+    existing = Counter({1: 1})
+    new = Importer.select_new_rows(chunk([]), existing)
+
+    assert new.empty
+    assert existing == Counter({1: 1})
+
+
+def test_matches_multiset_difference():
+    rng = random.Random(24)
+    old = [rng.randrange(50) for _ in range(2000)]
+    file_rows = [rng.randrange(50) for _ in range(2000)]
+    existing = Counter(old)
+
+    kept = []
+    for start in range(0, len(file_rows), 300):
+        block = chunk(file_rows[start:start + 300], start)
+        kept.extend(Importer.select_new_rows(block, existing)['linha_hash'].tolist())
+
+    assert Counter(kept) == Counter(file_rows) - Counter(old)
+    assert +existing == Counter(old) - Counter(file_rows)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Vagas por prioridade e espera entre reinícios do agendador (scheduler.py)"""
+
+import threading
+import time
+
+import pytest
+
+import scheduler
+from scheduler import PrioritySlots, restart_delay
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condição não atingida')
+        time.sleep(0.005)
+
+
+def waiting(slots):
+    with slots._condition:
+        return len(slots._waiting)
+
+
+def start_waiter(slots, priority, stop, order, name):
+    """Thread que pega uma vaga, registra o nome e devolve a vaga"""
+    def run():
+        if slots.acquire(priority, stop):
+            order.append(name)
+            slots.release()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(scheduler, 'STOP_POLL_SECONDS', 0.01)
+
+
+def test_waiters_served_by_priority_then_arrival():
+    slots = PrioritySlots(1)
+    stop = threading.Event()
+    assert slots.acquire(5, stop)
+
+    order = []
+    threads = []
+    for priority, name in [(3, 'bordero'), (1, 'vuon'), (3, 'novacoes'), (2, 'recebimentos')]:
+        threads.append(start_waiter(slots, priority, stop, order, name))
+        wait_until(lambda: waiting(slots) == len(threads))
+
+    slots.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ['vuon', 'recebimentos', 'bordero', 'novacoes']
+
+
+def test_limit_is_enforced():
+    slots = PrioritySlots(2)
+    stop = threading.Event()
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def run(priority):
+        assert slots.acquire(priority, stop)
+        with lock:
+            active.append(priority)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(priority)
+        slots.release()
+
+    threads = [threading.Thread(target=run, args=(i % 3,), daemon=True) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(peak) == 12
+    assert max(peak) == 2
+    assert slots._in_use == 0
+
+
+def test_stop_releases_waiters_without_a_slot():
+    slots = PrioritySlots(1)
+    stop = threading.Event()
+    assert slots.acquire(1, stop)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(slots.acquire(1, stop)), daemon=True)
+    thread.start()
+    wait_until(lambda: waiting(slots) == 1)
+
+    stop.set()
+    thread.join(5)
+
+    assert results == [False]
+    assert waiting(slots) == 0
+    assert slots._in_use == 1
+
+
+def test_stop_before_acquire_with_free_slot():
+    # Com vaga livre a fonte entra mesmo com o encerramento pedido (termina a pasta atual)
+    slots = PrioritySlots(1)
+    stop = threading.Event()
+    stop.set()
+
+    assert slots.acquire(1, stop)
+
+
+def test_limit_below_one_keeps_one_slot():
+    assert PrioritySlots(0).limit == 1
+
+
+def test_restart_delay_doubles_up_to_max(monkeypatch):
+    monkeypatch.setattr(scheduler, 'RESTART_BACKOFF_BASE', 10)
+    monkeypatch.setattr(scheduler, 'RESTART_BACKOFF_MAX', 600)
+
+    assert [restart_delay(crashes) for crashes in range(1, 9)] == [10, 20, 40, 80, 160, 320, 600, 600]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Leitura do CSV do VUON (vuon_csv_reader.py): motores C e Python contra a leitura original"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from vuon_csv_reader import RAW_COLUMNS, iter_raw_chunks, read_raw_csv
+
+HEADER = 'Nome;Cód;CPF/CNPJ;Agente;;Ação;Data;Hora;Histórico;Fone;Credor;Atraso;Valor;Inclusão;CDEC;Fase\n'
+
+
+def baseline_read(csv_file):
+    """Leitura linha a linha original (read_and_process_csv de import_vuon_automated.py)"""
+    expected_columns = 16
+    rows = []
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            fields = line.split(';')
+            if len(fields) == expected_columns:
+                rows.append(fields)
+            elif len(fields) > expected_columns:
+                num_extra = len(fields) - expected_columns
+                processed = fields[:8] + [';'.join(fields[8:8 + num_extra + 1])] + fields[8 + num_extra + 1:]
+                rows.append(processed)
+            else:
+                rows.append(fields + [''] * (expected_columns - len(fields)))
+    return pd.DataFrame(rows, columns=RAW_COLUMNS, dtype=str)
+
+
+def row(historico='Contato', name='Maria Silva'):
+    return ';'.join([name, '123', '111.222.333-44', '10 - Agente', '', 'LIGACAO', '02/06/2025', '13:58:10',
+                     historico, '11999999999', 'VUON', '30', '100,00', '01/05/2025', 'X', 'F1'])
+
+
+CASES = {
+    'regulares': [row(), row(name='João')],
+    'linhas_vazias': [row(), '', '   ', '\t', row()],
+    'poucos_campos': [row(), 'a', 'a;b;c', ';;;', row()],
+    'historico_com_ponto_e_virgula': [row('a;b'), row('a;b;c;d'), row()],
+    'muitos_campos_vazios': [';' * 16, ';' * 17, ';' * 30, row()],
+    'espacos_nas_pontas': ['  ' + row() + '  ', ' ' + row(), row() + '　'],
+    'buffer_overflow_do_parser_c': ['a', '', ';' * 17],
+    'crlf': [row() + '\r', '\r', row() + '\r'],
+}
+
+
+def write_csv(path, lines, trailing_newline=True):
+    path.write_text(HEADER + '\n'.join(lines) + ('\n' if trailing_newline else ''), encoding='utf-8')
+    return path
+
+
+def read_chunks(path, chunk_rows, engine):
+    chunks = list(iter_raw_chunks(path, chunk_rows, engine))
+    if not chunks:
+        return pd.DataFrame([], columns=RAW_COLUMNS, dtype=str)
+    return pd.concat(chunks, ignore_index=True)
+
+
+@pytest.mark.parametrize('case', sorted(CASES))
+@pytest.mark.parametrize('engine', ['c', 'python'])
+def test_engines_match_baseline(tmp_path, case, engine):
+    path = write_csv(tmp_path / 'vuon_20250602.csv', CASES[case])
+    expected = baseline_read(path)
+
+    pd.testing.assert_frame_equal(read_raw_csv(path, engine), expected)
+    for chunk_rows in (1, 2, 3, 1000):
+        pd.testing.assert_frame_equal(read_chunks(path, chunk_rows, engine), expected)
+
+
+def test_parser_error_in_later_chunk_falls_back(tmp_path):
+    # Bloco problemático depois do primeiro: não pode derrubar a pasta inteira
+    lines = [row()] * 6 + CASES['buffer_overflow_do_parser_c'] + [row()] * 3
+    path = write_csv(tmp_path / 'vuon_20250602.csv', lines)
+
+    pd.testing.assert_frame_equal(read_chunks(path, 3, 'c'), baseline_read(path))
+
+
+def test_random_lines_match_baseline(tmp_path):
+    rng = random.Random(5)
+    pieces = ['', ' ', ';', ';;', 'a', 'b;c', row(), row('x;y'), ' ', 'ç']
+    for case in range(200):
+        lines = [''.join(rng.choice(pieces) for _ in range(rng.randrange(4))) for _ in range(rng.randrange(1, 12))]
+        path = write_csv(tmp_path / f'vuon_{case}.csv', lines, trailing_newline=rng.random() < 0.8)
+        expected = baseline_read(path)
+        for engine in ('c', 'python'):
+            pd.testing.assert_frame_equal(read_chunks(path, rng.choice([1, 3, None]), engine), expected)
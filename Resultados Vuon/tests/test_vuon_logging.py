@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Supressão de avisos repetidos (vuon_logging.RateLimitFilter)"""
+
+import logging
+
+import vuon_logging
+from vuon_logging import RateLimitFilter
+
+
+class Clock:
+    """Substitui time.monotonic no módulo de logging"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def record(message, level=logging.WARNING, name='vuon.teste'):
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+
+def install_clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(vuon_logging.time, 'monotonic', clock)
+    return clock
+
+
+def test_repeated_warnings_are_counted_and_reported(monkeypatch):
+    clock = install_clock(monkeypatch)
+    rate_limit = RateLimitFilter(60)
+
+    first = record('banco fora do ar')
+    assert rate_limit.filter(first)
+    assert not hasattr(first, 'suppressed')
+
+    for _ in range(5):
+        clock.now += 10
+        assert not rate_limit.filter(record('banco fora do ar'))
+
+    # Janela contada a partir da mensagem emitida, não da última suprimida
+    clock.now = 1000.0 + 60
+    again = record('banco fora do ar')
+    assert rate_limit.filter(again)
+    assert again.suppressed == 5
+
+    # A contagem recomeça depois de reportada
+    clock.now += 60
+    third = record('banco fora do ar')
+    assert rate_limit.filter(third)
+    assert not hasattr(third, 'suppressed')
+
+
+def test_distinct_messages_levels_and_sources_are_not_suppressed(monkeypatch):
+    install_clock(monkeypatch)
+    rate_limit = RateLimitFilter(60)
+
+    assert rate_limit.filter(record('pasta 2025-06-01 sem arquivo'))
+    assert rate_limit.filter(record('pasta 2025-06-02 sem arquivo'))
+    assert rate_limit.filter(record('pasta 2025-06-01 sem arquivo', level=logging.ERROR))
+    assert rate_limit.filter(record('pasta 2025-06-01 sem arquivo', name='vuon.bordero'))
+    assert not rate_limit.filter(record('pasta 2025-06-01 sem arquivo'))
+
+
+def test_info_and_disabled_filter_pass_everything(monkeypatch):
+    install_clock(monkeypatch)
+
+    rate_limit = RateLimitFilter(60)
+    assert all(rate_limit.filter(record('ciclo', level=logging.INFO)) for _ in range(3))
+
+    disabled = RateLimitFilter(0)
+    assert all(disabled.filter(record('banco fora do ar')) for _ in range(3))
+
+
+def test_suppressed_count_in_text_output(monkeypatch):
+    clock = install_clock(monkeypatch)
+    rate_limit = RateLimitFilter(60)
+    rate_limit.filter(record('banco fora do ar'))
+    rate_limit.filter(record('banco fora do ar'))
+    rate_limit.filter(record('banco fora do ar'))
+    clock.now += 60
+    again = record('banco fora do ar')
+    rate_limit.filter(again)
+
+    assert '(+2 repetida(s) suprimida(s))' in vuon_logging.TextFormatter().format(again)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carga idempotente (upsert) pela identidade natural das linhas para os importadores do VUON
+Cada tabela tem a coluna chave_hash (MD5 das colunas que identificam o registro, com índice
+UNIQUE). Com UPSERT_MODE ativo, a carga usa INSERT ... ON DUPLICATE KEY UPDATE ('update') ou
+INSERT IGNORE ('ignore'): uma nova tentativa ou uma nova entrega do arquivo não duplica as
+linhas já gravadas. Com 'off' (padrão) chave_hash fica NULL e a carga é um INSERT simples.
+"""
+
+import hashlib
+
+import pandas as pd
+
+from batch_feeder import column_to_db_values
+from vuon_logging import get_logger
+
+log = get_logger('upsert')
+
+# Modos aceitos em UPSERT_MODE
+UPSERT_OFF = 'off'
+UPSERT_UPDATE = 'update'
+UPSERT_IGNORE = 'ignore'
+
+# Coluna com o hash da chave natural (CHAR(32) ASCII, UNIQUE; NULL não conflita)
+KEY_COLUMN = 'chave_hash'
+
+# Separador entre os valores da chave (não aparece nos dados) e marcador de NULL
+KEY_SEPARATOR = '\x1f'
+KEY_NULL = '\\N'
+
+
+def get_upsert_mode(value):
+    """Normaliza o valor de UPSERT_MODE, voltando para 'off' se for desconhecido"""
+    mode = (value or UPSERT_OFF).strip().lower()
+    if mode not in (UPSERT_OFF, UPSERT_UPDATE, UPSERT_IGNORE):
+        log.warning(f"⚠️  UPSERT_MODE '{value}' desconhecido - usando {UPSERT_OFF}")
+        return UPSERT_OFF
+    return mode
+
+
+def natural_key_hash(values):
+    """Hash (MD5 hex) da chave natural de um registro, a partir dos valores já prontos para o banco"""
+    text = KEY_SEPARATOR.join(KEY_NULL if value is None else str(value) for value in values)
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def natural_key_hashes(df, key_columns):
+    """Hash da chave natural de cada linha do DataFrame (mesmo resultado que natural_key_hash)"""
+    if df.empty:
+        return pd.Series([], dtype=object, index=df.index)
+
+    parts = []
+    for col in key_columns:
+        values = pd.Series(column_to_db_values(df[col]), index=df.index)
+        nulls = values.isna()
+        text = values.map(str)
+        text[nulls] = KEY_NULL
+        parts.append(text)
+
+    keys = parts[0].str.cat(parts[1:], sep=KEY_SEPARATOR) if len(parts) > 1 else parts[0]
+    return pd.Series(
+        [hashlib.md5(key.encode('utf-8')).hexdigest() for key in keys.tolist()],
+        index=df.index, dtype=object
+    )
+
+
+def add_key_column(df, key_columns, mode):
+    """Preenche df['chave_hash'] (None com UPSERT_MODE=off, para manter o INSERT simples)"""
+    if mode == UPSERT_OFF:
+        df[KEY_COLUMN] = None
+    else:
+        df[KEY_COLUMN] = natural_key_hashes(df, key_columns)
+    return df
+
+
+def apply_upsert(insert_sql, columns, mode):
+    """Adapta um INSERT ... VALUES (...) ao modo de upsert
+
+    'update' acrescenta ON DUPLICATE KEY UPDATE para as colunas que não são a chave;
+    'ignore' troca INSERT por INSERT IGNORE. O executemany do pymysql continua montando
+    INSERTs multi-linha nos dois casos.
+    """
+    if mode == UPSERT_IGNORE:
+        return insert_sql.replace('INSERT INTO', 'INSERT IGNORE INTO', 1)
+    if mode == UPSERT_UPDATE:
+        updates = ', '.join(f'{col} = VALUES({col})' for col in columns if col != KEY_COLUMN)
+        return f"{insert_sql.rstrip()}\n    ON DUPLICATE KEY UPDATE {updates}\n    "
+    return insert_sql
+
+
+def load_data_duplicates(mode):
+    """Tratamento de chave duplicada no LOAD DATA para o modo de upsert (None = padrão)
+
+    'update' vira REPLACE, que apaga e reinsere a linha (id e created_at novos): só é usado
+    em tabelas de staging, publicadas depois com ON DUPLICATE KEY UPDATE (publish_staging).
+    """
+    if mode == UPSERT_IGNORE:
+        return 'IGNORE'
+    if mode == UPSERT_UPDATE:
+        return 'REPLACE'
+    return None
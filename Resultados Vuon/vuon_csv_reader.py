@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leitura do CSV diário do VUON (vuon_YYYYMMDD.csv) em blocos
+Corrige as linhas com ';' extra no Histórico e entrega DataFrames de tamanho fixo,
+de modo que o pico de memória depende do tamanho do bloco e não do tamanho do arquivo
+
+Dois motores de leitura, com resultado idêntico:
+- 'c': cada bloco é lido pelo parser C do pandas; só as linhas fora do padrão
+  (quantidade de campos diferente de 16, espaços nas pontas, linhas vazias) são refeitas em Python;
+  blocos que o parser C recusa (NUL, '\r' isolado, ParserError) são lidos inteiros em Python
+- 'python': divisão manual linha a linha (comportamento original)
+"""
+
+import csv
+import io
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+# Nome;Cód;CPF/CNPJ;Agente;;Ação;Data;Hora;Histórico;Fone;Credor;Atraso;Valor;Inclusão;CDEC;Fase
+EXPECTED_COLUMNS = 16
+
+RAW_COLUMNS = ['Nome', 'Cód', 'CPF / CNPJ', 'Agente', 'Coluna_Vazia', 'Ação', 'Data', 'Hora',
+               'Histórico', 'Fone Discado', 'Credor', 'Atraso', 'Valor', 'Inclusão', 'CDEC', 'Fase']
+
+# Posição do Histórico, único campo que pode conter ';'
+HISTORICO_INDEX = 8
+
+# Motor de leitura: 'c' (padrão) ou 'python'
+CSV_PARSER = os.getenv('CSV_PARSER', 'c').strip().lower()
+
+# Bytes UTF-8 que podem iniciar/terminar um caractere removido por str.strip();
+# linhas com esses bytes nas pontas são refeitas em Python para manter o strip() exato
+ASCII_SPACES = frozenset(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')
+LEADING_SUSPECT_BYTES = ASCII_SPACES | frozenset((0xC2, 0xE1, 0xE2, 0xE3))
+TRAILING_SUSPECT_BYTES = ASCII_SPACES | frozenset((0x85, 0x9F, 0xA0, 0xA8, 0xA9, 0xAF)) | frozenset(range(0x80, 0x8B))
+
+
+def repair_fields(fields):
+    """Ajusta uma linha já dividida por ';' para exatamente 16 campos
+
+    Linhas com mais campos tiveram o Histórico (índice 8) dividido: os campos extras
+    são juntados de volta com ';'. Linhas com menos campos são completadas com vazios.
+    """
+    if len(fields) == EXPECTED_COLUMNS:
+        return fields
+
+    if len(fields) > EXPECTED_COLUMNS:
+        num_extra = len(fields) - EXPECTED_COLUMNS
+        end_historico = HISTORICO_INDEX + num_extra + 1
+        return (fields[:HISTORICO_INDEX]
+                + [';'.join(fields[HISTORICO_INDEX:end_historico])]
+                + fields[end_historico:])
+
+    return fields + [''] * (EXPECTED_COLUMNS - len(fields))
+
+
+def _repair_lines(lines):
+    """Aplica strip/split/reparo a linhas de texto, descartando as vazias"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        yield repair_fields(line.split(';'))
+
+
+def iter_repaired_rows(csv_file):
+    """Gera as linhas de dados do CSV (sem cabeçalho e sem linhas vazias) já com 16 campos"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        f.readline()  # Cabeçalho
+        yield from _repair_lines(f)
+
+
+def _line_layout(block):
+    """Calcula, para cada linha do bloco (bytes), a quantidade de ';' e se precisa do strip() do Python
+
+    Tudo é feito com numpy sobre o bloco: posições de '\n' delimitam as linhas e as
+    posições de ';' são contadas por faixa. Uma linha "suspeita" está vazia ou tem nas
+    pontas um byte que pode pertencer a um caractere de espaço.
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == 0x0A)
+
+    ends = newlines
+    if not block.endswith(b'\n'):
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], newlines[:len(ends) - 1] + 1))
+
+    # Descontar o '\r' de '\r\n'
+    has_cr = ends > starts
+    has_cr[has_cr] = data[ends[has_cr] - 1] == 0x0D
+    ends = ends - has_cr
+
+    semicolons = np.flatnonzero(data == 0x3B)
+    counts = np.searchsorted(semicolons, ends) - np.searchsorted(semicolons, starts)
+
+    empty = ends <= starts
+    first = np.where(empty, 0x20, data[np.minimum(starts, len(data) - 1)])
+    last = np.where(empty, 0x20, data[np.maximum(ends - 1, 0)])
+    suspect = (empty
+               | np.isin(first, list(LEADING_SUSPECT_BYTES))
+               | np.isin(last, list(TRAILING_SUSPECT_BYTES)))
+    return counts, suspect
+
+
+def _parse_block_python(block):
+    """Converte um bloco (bytes) pelo motor Python, linha a linha"""
+    rows = list(_repair_lines(io.StringIO(block.decode('utf-8'), newline=None)))
+    return pd.DataFrame(rows, columns=RAW_COLUMNS, dtype=str)
+
+
+def _parse_block(lines):
+    """Converte um bloco de linhas (bytes) em DataFrame de 16 colunas usando o parser C
+
+    O parser C lê o bloco com largura suficiente para a maior linha; a quantidade de
+    campos de cada linha vem da contagem de ';'. Linhas com 16 campos são usadas como
+    saíram do parser; as demais passam pela mesma regra de reparo do motor Python.
+    """
+    block = b''.join(lines)
+
+    # '\r' isolado quebra linha no modo texto do Python mas não no alinhamento por '\n';
+    # NUL também é tratado de forma diferente pelo parser C. Nesses casos o bloco vai inteiro para o Python.
+    if b'\x00' in block or block.count(b'\r') != block.count(b'\r\n'):
+        return _parse_block_python(block)
+
+    counts, suspect = _line_layout(block)
+    width = int(counts.max()) + 1
+
+    try:
+        parsed = pd.read_csv(
+            io.BytesIO(block),
+            sep=';',
+            header=None,
+            names=range(max(width, EXPECTED_COLUMNS)),
+            dtype=str,
+            na_filter=False,
+            quoting=csv.QUOTE_NONE,
+            skip_blank_lines=False,
+            encoding='utf-8',
+            engine='c'
+        )
+    except pd.errors.ParserError:
+        # Parser C recusa algumas combinações de linhas curtas/vazias/longas ("Buffer overflow caught")
+        return _parse_block_python(block)
+
+    irregular = np.flatnonzero(suspect | (counts != EXPECTED_COLUMNS - 1))
+    if len(irregular) == 0:
+        df = parsed.iloc[:, :EXPECTED_COLUMNS]
+        df.columns = RAW_COLUMNS
+        return df
+
+    values = parsed.to_numpy(dtype=object)
+    result = values[:, :EXPECTED_COLUMNS].copy()
+    keep = np.ones(len(result), dtype=bool)
+    for i in irregular:
+        if suspect[i]:
+            text = lines[i].decode('utf-8').strip()
+            if not text:
+                keep[i] = False
+                continue
+            result[i] = repair_fields(text.split(';'))
+        else:
+            result[i] = repair_fields(list(values[i, :counts[i] + 1]))
+
+    return pd.DataFrame(result[keep], columns=RAW_COLUMNS, dtype=str)
+
+
+def _iter_c_chunks(csv_file, chunk_rows):
+    """Gera blocos lidos pelo parser C (chunk_rows=None lê o arquivo inteiro em um bloco)"""
+    with open(csv_file, 'rb') as f:
+        header = f.readline()
+        if b'\r' in header.rstrip(b'\r\n'):
+            # Cabeçalho com '\r' isolado: o modo texto enxerga outra divisão de linhas
+            yield from _iter_python_chunks(csv_file, chunk_rows)
+            return
+
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            df = _parse_block(lines)
+            if len(df):
+                yield df
+
+
+def _iter_python_chunks(csv_file, chunk_rows):
+    """Gera blocos lidos linha a linha em Python (chunk_rows=None lê o arquivo inteiro)"""
+    rows = []
+    for fields in iter_repaired_rows(csv_file):
+        rows.append(fields)
+        if chunk_rows and len(rows) >= chunk_rows:
+            yield pd.DataFrame(rows, columns=RAW_COLUMNS, dtype=str)
+            rows = []
+
+    if rows:
+        yield pd.DataFrame(rows, columns=RAW_COLUMNS, dtype=str)
+
+
+def iter_raw_chunks(csv_file, chunk_rows, engine=None):
+    """Gera DataFrames (dtype=str, colunas originais do CSV) com até chunk_rows linhas cada"""
+    if (engine or CSV_PARSER) == 'c':
+        return _iter_c_chunks(csv_file, chunk_rows)
+    return _iter_python_chunks(csv_file, chunk_rows)
+
+
+def read_raw_csv(csv_file, engine=None):
+    """Lê o arquivo inteiro em um único DataFrame (dtype=str, colunas originais do CSV)"""
+    chunks = list(iter_raw_chunks(csv_file, None, engine))
+    if not chunks:
+        return pd.DataFrame([], columns=RAW_COLUMNS, dtype=str)
+    return chunks[0]
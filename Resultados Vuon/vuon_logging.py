@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log estruturado do main_automated.py e dos importadores do VUON (no lugar dos print)
+- Níveis (LOG_LEVEL): com DEBUG desligado, log.debug("...%s", valor) só verifica o nível;
+  a mensagem nem é montada. Use argumentos %s (não f-string) nas linhas dos laços
+- Formato (LOG_FORMAT): 'text' (console, com hora, nível e fonte) ou 'json' (uma linha por evento,
+  com os campos extras: log.info("...", pasta=..., registros=...))
+- Mensagens de aviso/erro idênticas repetidas dentro de LOG_RATE_LIMIT_SECONDS são suprimidas;
+  a próxima que passar informa quantas foram omitidas
+- log_skipped(): uma linha de resumo para as pastas já importadas, em vez de uma por pasta
+- LOG_FILE (opcional): cópia em arquivo com rotação por tamanho, no mesmo formato
+A configuração é feita uma vez por processo, na primeira chamada a get_logger().
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from logging import DEBUG, ERROR, INFO, WARNING  # noqa: F401 (reexportados para log.is_enabled)
+from logging.handlers import RotatingFileHandler
+
+from dotenv import load_dotenv
+
+# Carregar variáveis de ambiente do arquivo .env
+load_dotenv()
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').strip().upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').strip().lower()  # 'text' ou 'json'
+LOG_FORMATS = ('text', 'json')
+LOG_FILE = os.getenv('LOG_FILE', '')
+LOG_FILE_MAX_BYTES = int(os.getenv('LOG_FILE_MAX_BYTES', 10 * 1024 * 1024))
+LOG_FILE_BACKUPS = int(os.getenv('LOG_FILE_BACKUPS', 5))
+LOG_RATE_LIMIT_SECONDS = float(os.getenv('LOG_RATE_LIMIT_SECONDS', 60))  # 0 = sem limite
+
+# Logger raiz dos importadores: 'vuon.<fonte>'
+ROOT_LOGGER = 'vuon'
+
+# Mensagens distintas lembradas pelo limitador antes de descartar as antigas
+RATE_LIMIT_MAX_KEYS = 10000
+
+_setup_lock = threading.Lock()
+_configured = False
+
+
+def _source(record):
+    """Fonte do evento: 'vuon.bordero' -> 'bordero'"""
+    return record.name.split('.', 1)[1] if '.' in record.name else record.name
+
+
+def _message(record):
+    message = record.getMessage()
+    suppressed = getattr(record, 'suppressed', 0)
+    if suppressed:
+        message += f" (+{suppressed} repetida(s) suprimida(s))"
+    return message
+
+
+class TextFormatter(logging.Formatter):
+    """'HH:MM:SS NÍVEL [fonte] mensagem', com o traceback quando houver"""
+
+    def format(self, record):
+        text = (f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} "
+                f"{record.levelname:<7} [{_source(record)}] {_message(record)}")
+        if record.exc_info:
+            text += '\n' + self.formatException(record.exc_info)
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha, com os campos extras do evento"""
+
+    def format(self, record):
+        event = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'fonte': _source(record),
+            'thread': record.threadName,
+            'msg': _message(record),
+        }
+        event.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            event['erro'] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Suprime avisos/erros idênticos (mesma fonte, nível e texto) dentro da janela"""
+
+    def __init__(self, seconds, min_level=logging.WARNING):
+        super().__init__()
+        self.seconds = seconds
+        self.min_level = min_level
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.seconds <= 0 or record.levelno < self.min_level:
+            return True
+
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.seconds:
+                entry[1] += 1
+                return False
+
+            if entry is not None and entry[1]:
+                record.suppressed = entry[1]
+            if len(self._seen) >= RATE_LIMIT_MAX_KEYS:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.seconds}
+            self._seen[key] = [now, 0]
+        return True
+
+
+def _formatter():
+    if LOG_FORMAT == 'json':
+        return JsonFormatter()
+    return TextFormatter()
+
+
+def setup_logging():
+    """Configura o logger 'vuon' (uma vez por processo)"""
+    global _configured
+    with _setup_lock:
+        if _configured:
+            return
+        logger = logging.getLogger(ROOT_LOGGER)
+        level = getattr(logging, LOG_LEVEL, None)
+        unknown_level = not isinstance(level, int)
+        if unknown_level:
+            level = logging.INFO
+        logger.setLevel(level)
+        logger.propagate = False
+
+        rate_limit = RateLimitFilter(LOG_RATE_LIMIT_SECONDS)
+        handlers = [logging.StreamHandler(sys.stdout)]
+        if LOG_FILE:
+            os.makedirs(os.path.dirname(os.path.abspath(LOG_FILE)), exist_ok=True)
+            handlers.append(RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES,
+                                                backupCount=LOG_FILE_BACKUPS, encoding='utf-8'))
+        for handler in handlers:
+            handler.setFormatter(_formatter())
+            handler.addFilter(rate_limit)
+            logger.addHandler(handler)
+
+        _configured = True
+
+    if unknown_level:
+        logger.warning("LOG_LEVEL '%s' desconhecido - usando INFO", LOG_LEVEL)
+    if LOG_FORMAT not in LOG_FORMATS:
+        logger.warning("LOG_FORMAT '%s' desconhecido - usando text", LOG_FORMAT)
+
+
+class StructuredLogger:
+    """Logger com campos extras por palavra-chave: log.info("Pasta %s importada", pasta, registros=n)
+
+    O nível é verificado antes de qualquer outra coisa, então chamadas de um nível desligado
+    custam uma comparação.
+    """
+
+    __slots__ = ('_logger',)
+
+    def __init__(self, logger):
+        self._logger = logger
+
+    def is_enabled(self, level):
+        return self._logger.isEnabledFor(level)
+
+    def _log(self, level, msg, args, fields, exc_info=False):
+        self._logger.log(level, msg, *args, exc_info=exc_info,
+                         extra={'fields': fields} if fields else None, stacklevel=3)
+
+    def debug(self, msg, *args, **fields):
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, fields)
+
+    def info(self, msg, *args, **fields):
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, fields)
+
+    def warning(self, msg, *args, **fields):
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, fields)
+
+    def error(self, msg, *args, **fields):
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, fields)
+
+    def exception(self, msg, *args, **fields):
+        """Erro com o traceback da exceção sendo tratada"""
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, fields, exc_info=True)
+
+
+def get_logger(source):
+    """Logger de uma fonte ('vuon', 'bordero', 'main', ...), configurando o log na primeira chamada"""
+    setup_logging()
+    return StructuredLogger(logging.getLogger(f'{ROOT_LOGGER}.{source}'))
+
+
+def log_skipped(log, folders):
+    """Resume em uma linha as pastas já importadas que foram puladas (uma a uma só com LOG_LEVEL=DEBUG)"""
+    if not folders:
+        return
+    if len(folders) == 1:
+        log.info("⏭️  Pasta %s já processada - pulando", folders[0], puladas=1)
+        return
+    ordered = sorted(folders)
+    log.info("⏭️  %d pastas já processadas - puladas (%s a %s)", len(ordered), ordered[0], ordered[-1],
+             puladas=len(ordered))
@@ -3,6 +3,13 @@ const AgentesModel = require('./agentesModel');
 
 const TABELA_ORIGINAL = 'vuon_resultados';
 const TABELA_HOJE = 'vuon_resultados_hoje_dda';
+// DDA por dia e agente mantido pelo importador (Resultados Vuon/quartis_snapshot.py)
+const TABELA_SNAPSHOT = 'vuon_dda_agente_dia';
+const USAR_SNAPSHOT = process.env.QUARTIS_SNAPSHOT === 'true';
+
+/** Filtro de agentes para as queries do snapshot (mesma ordem de parâmetros: agentes antes das datas) */
+const filtroAgentesSnapshot = (qtdAgentes) =>
+    qtdAgentes > 0 ? `AND agente IN (${Array(qtdAgentes).fill('?').join(',')})` : '';
 
 /** Retorna true se startDate e endDate são ambos o dia atual (YYYY-MM-DD) */
 const isDiaAtual = (startDate, endDate) => {
@@ -138,6 +145,23 @@ class QuartisModel {
             `;
             queryParams = params;
         }
+
+        if (USAR_SNAPSHOT && !usarTabelaHoje) {
+            // Mesma métrica, já agregada por dia e agente: soma poucas linhas por agente
+            console.log(`📊 Quartis - Usando ${TABELA_SNAPSHOT} (snapshot do importador)`);
+            query = `
+                SELECT
+                    agente,
+                    CAST(SUM(total_dda) AS UNSIGNED) as total_dda,
+                    COALESCE(SUM(valor_total), 0) as valor_total
+                FROM ${TABELA_SNAPSHOT}
+                WHERE 1=1
+                    ${filtroAgentesSnapshot(queryParams.length - params.length)}
+                    ${dateFilter ? 'AND data >= ? AND data <= ?' : ''}
+                GROUP BY agente
+                ORDER BY total_dda DESC
+            `;
+        }
         
         console.log(`📊 Quartis - Executando query com ${queryParams.length} parâmetros`);
         if (dateFilter) {
@@ -499,6 +523,17 @@ class QuartisModel {
             queryParams = params;
         }
 
+        if (USAR_SNAPSHOT && !usarTabelaHoje) {
+            query = `
+                SELECT data, agente, total_dda
+                FROM ${TABELA_SNAPSHOT}
+                WHERE 1=1
+                    ${filtroAgentesSnapshot(queryParams.length - params.length)}
+                    AND data >= ? AND data <= ?
+                ORDER BY data, total_dda DESC
+            `;
+        }
+
         const [rows] = await db.execute(query, queryParams);
         const listaAgentesFiltro = agentes && Array.isArray(agentes) && agentes.length > 0
             ? agentes.map(String).filter(Boolean)
@@ -166,19 +166,28 @@ const server = app.listen(PORT, async () => {
     const UPDATE_INTERVAL_HOURS = parseInt(process.env.UPDATE_INTERVAL_HOURS) || 1;
     const UPDATE_INTERVAL_MS = UPDATE_INTERVAL_HOURS * 60 * 60 * 1000;
     
+    // Com BLOCO_REFRESH_BY_IMPORTER=true o importador do VUON atualiza bloco_summary e
+    // bloco_spins_diario só para os dias importados; a recarga periódica completa fica desligada
+    const BLOCO_REFRESH_BY_IMPORTER = process.env.BLOCO_REFRESH_BY_IMPORTER === 'true';
+    
     console.log(`🔄 Verificação automática de meses faltantes configurada: a cada ${UPDATE_INTERVAL_HOURS} hora(s)\n`);
+    if (BLOCO_REFRESH_BY_IMPORTER) {
+        console.log('   bloco_summary/bloco_spins_diario atualizados pelo importador (BLOCO_REFRESH_BY_IMPORTER=true)\n');
+    }
     
     const periodicUpdate = setInterval(() => {
         const now = new Date().toLocaleString('pt-BR');
         console.log(`\n⏰ [${now}] Verificação periódica de meses faltantes iniciada...`);
-        updateMissingMonths(true).catch(err => {
-            console.error('⚠️  Erro na verificação periódica de bloco_summary:', err.message);
-        });
-
-        // Spins diários (até ontem)
-        updateBlocoSpinsDaily(true).catch(err => {
-            console.error('⚠️  Erro na verificação periódica de bloco_spins_diario:', err.message);
-        });
+        if (!BLOCO_REFRESH_BY_IMPORTER) {
+            updateMissingMonths(true).catch(err => {
+                console.error('⚠️  Erro na verificação periódica de bloco_summary:', err.message);
+            });
+
+            // Spins diários (até ontem)
+            updateBlocoSpinsDaily(true).catch(err => {
+                console.error('⚠️  Erro na verificação periódica de bloco_spins_diario:', err.message);
+            });
+        }
 
         // Sincronizar agentes (modo silencioso)
         syncAgentesFromResultados(true).catch(err => {